@@ -19,11 +19,22 @@ Runtime
 BFS iterates over every vertex and edge in the graph exactly once,
 so the time complexity is O(V + E) where V = number of vertices and E = number of edges.
 """
+from array import array
 from collections import deque
+import importlib.util, pathlib
+
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+NO_VERTEX = _csr_mod.NO_VERTEX
+
 
 def breadth_first_search(graph, start):
     # Input:
-    # - graph: a simple graph in adjacency list format
+    # - graph: a simple graph in adjacency list format, or a CSRGraph
     # - start: starting vertex
     #
     # Output:
@@ -31,6 +42,9 @@ def breadth_first_search(graph, start):
     #   Unreachable vertices have distance inf.
     # - prev: parent of each vertex in the BFS tree
     #   Unreachable vertices and the starting vertex have parent nil.
+    if is_csr_graph(graph):
+        return _breadth_first_search_csr(graph, start)
+
     dist, prev = {}, {}
     queue = deque()
     visited = set()
@@ -49,6 +63,29 @@ def breadth_first_search(graph, start):
     return dist, prev
 
 
+def _breadth_first_search_csr(graph, start):
+    # Same traversal on integer vertex ids; dist[v] == -1 marks unvisited.
+    offsets, targets = graph.offsets, graph.targets
+    dist = array('q', [-1]) * graph.n
+    prev = array('q', [NO_VERTEX]) * graph.n
+    s = graph.index[start]
+    dist[s] = 0
+    order = [s]
+    queue = deque([s])
+    while queue:
+        v = queue.popleft()
+        for e in range(offsets[v], offsets[v + 1]):
+            neighbor = targets[e]
+            if dist[neighbor] < 0:
+                dist[neighbor] = dist[v] + 1
+                prev[neighbor] = v
+                order.append(neighbor)
+                queue.append(neighbor)
+    labels = graph.labels
+    return ({labels[v]: dist[v] for v in order},
+            {labels[v]: graph.label(prev[v]) for v in order})
+
+
 # ---------------------------------------------------------------------------
 # Test cases
 # ---------------------------------------------------------------------------
@@ -82,8 +119,16 @@ def test_disconnected_graph():
     assert 2 not in dist and 3 not in dist
 
 
+def test_csr_graph_matches_dict():
+    # The CSR path must return the same labelled dist/prev as the dict path.
+    graph = {"A": ["B", "C"], "B": ["D"], "C": ["D"], "D": [], "E": ["A"]}
+    csr = CSRGraph.from_adjacency(graph)
+    assert breadth_first_search(csr, "A") == breadth_first_search(graph, "A")
+
+
 if __name__ == "__main__":
     test_simple_path()
     test_shortest_path_with_shortcut()
     test_disconnected_graph()
+    test_csr_graph_matches_dict()
     print("All tests passed.")
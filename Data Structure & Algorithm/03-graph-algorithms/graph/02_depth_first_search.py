@@ -15,6 +15,12 @@ depth_first_search(graph):
 - For each vertex v in graph:
     - If v has not been visited: increment component counter, call explore(v)
 
+The implementation below runs explore() without recursion: an explicit stack
+holds the vertices whose explore() call is still open, together with how far
+each has got through its neighbor list. Pushing a vertex is the recursive call
+(record pre), and popping it once its neighbors are exhausted is the return
+(record post), so the timestamps are exactly those of the recursive version.
+
 
 Correctness
 =====================
@@ -29,26 +35,54 @@ Runtime
 =====================
 DFS iterates over every vertex and edge in the graph exactly once,
 so the time complexity is O(V + E) where V = number of vertices and E = number of edges.
+Since the stack lives on the heap rather than the call stack, the depth of the
+DFS tree is bounded only by memory (a 10M-vertex path is fine), and when the
+vertices are the integers 0..n-1 all per-vertex state is kept in flat int arrays.
 """
+import importlib.util, pathlib
+from array import array
+from collections.abc import Mapping
 
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+NO_VERTEX = _csr_mod.NO_VERTEX
 
 def depth_first_search(graph, start=None):
     # Input:
-    # - graph: a simple graph in adjacency list format
+    # - graph: a simple graph in adjacency list format, or a CSRGraph
     # - start: optional starting vertex
     #   If not provided, DFS runs over all vertices in adjacency list order,
     #   visiting each unvisited vertex as a new component root.
     #
     # Internal:
-    # - visited: set of vertices already reached by explore()
-    # - clock: mutable counter (list of one int) shared across all explore() calls
-    # - component: mutable counter (list of one int) incremented per component root
+    # - stack: vertices whose explore() is still open, innermost last
+    # - clock: counter shared across all explore() calls
+    # - component: counter incremented per component root
     #
     # Output:
     # - ccnum: connected component number for each vertex (1-indexed)
     # - prev: parent of each vertex in the DFS forest; root vertices map to None
     # - pre: pre-visit clock value for each vertex
     # - post: post-visit clock value for each vertex
+    #   When the vertices are exactly the integers 0..n-1 these are read-only
+    #   mappings over int arrays; otherwise they are dicts.
+    if is_csr_graph(graph):
+        return _depth_first_search_csr(graph, start)
+
+    if start is None:
+        vertices = list(graph)
+    elif isinstance(start, list):
+        vertices = start
+    else:
+        vertices = [start]
+    n = len(graph)
+    if all(type(v) is int and 0 <= v < n for v in graph):
+        return _depth_first_search_ints(graph, vertices, n)
+
     visited = set()
     ccnum = {}
     prev = {}
@@ -56,32 +90,160 @@ def depth_first_search(graph, start=None):
     clock = 1
     component = 0
 
-    def explore(v):
-        nonlocal clock, component
-        visited.add(v)
-        pre[v] = clock
+    for root in vertices:
+        if root in visited:
+            continue
+        component += 1
+        prev[root] = None
+        visited.add(root)
+        pre[root] = clock
         clock += 1
-        ccnum[v] = component
-        for neighbor in graph[v]:
-            if neighbor not in visited:
-                prev[neighbor] = v
-                explore(neighbor)
-        post[v] = clock
+        ccnum[root] = component
+        stack = [(root, iter(graph[root]))]
+        while stack:
+            v, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if neighbor not in visited:
+                    prev[neighbor] = v
+                    visited.add(neighbor)
+                    pre[neighbor] = clock
+                    clock += 1
+                    ccnum[neighbor] = component
+                    stack.append((neighbor, iter(graph[neighbor])))
+                    break
+            else:
+                stack.pop()
+                post[v] = clock
+                clock += 1
+
+    return ccnum, prev, pre, post
+
+
+def _depth_first_search_ints(graph, vertices, n):
+    # Same traversal for vertices 0..n-1, with every per-vertex value in an
+    # int array; pre[v] == 0 marks unvisited and next_index[v] is how far
+    # explore(v) has got through graph[v].
+    ccnum = array('q', bytes(8 * n))
+    prev = array('q', [NO_VERTEX]) * n
+    pre = array('q', bytes(8 * n))
+    post = array('q', bytes(8 * n))
+    next_index = array('q', bytes(8 * n))
+    stack = array('q')
+    clock = 1
+    component = 0
+
+    for root in vertices:
+        if pre[root]:
+            continue
+        component += 1
+        pre[root] = clock
         clock += 1
+        ccnum[root] = component
+        stack.append(root)
+        while stack:
+            v = stack[-1]
+            neighbors = graph[v]
+            i = next_index[v]
+            while i < len(neighbors) and pre[neighbors[i]]:
+                i += 1
+            if i < len(neighbors):
+                neighbor = neighbors[i]
+                next_index[v] = i + 1
+                prev[neighbor] = v
+                pre[neighbor] = clock
+                clock += 1
+                ccnum[neighbor] = component
+                stack.append(neighbor)
+            else:
+                stack.pop()
+                post[v] = clock
+                clock += 1
+
+    return (_VertexArray(ccnum, pre), _VertexArray(prev, pre),
+            _VertexArray(pre, pre), _VertexArray(post, pre))
+
+
+class _VertexArray(Mapping):
+    """Read-only {vertex: value} view of an int array, limited to visited vertices.
+
+    Compares equal to the dict the labelled traversal would have returned;
+    NO_VERTEX entries read as None.
+    """
+
+    def __init__(self, values, visited):
+        self._values = values
+        self._visited = visited
+
+    def __getitem__(self, v):
+        if type(v) is not int or not 0 <= v < len(self._values) or not self._visited[v]:
+            raise KeyError(v)
+        value = self._values[v]
+        return None if value == NO_VERTEX else value
+
+    def __iter__(self):
+        return (v for v, seen in enumerate(self._visited) if seen)
+
+    def __len__(self):
+        return sum(1 for seen in self._visited if seen)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _depth_first_search_csr(graph, start):
+    # Same traversal on integer vertex ids; pre[v] == 0 marks unvisited and
+    # next_edge[v] is the next edge explore(v) will look at.
+    offsets, targets = graph.offsets, graph.targets
+    n = graph.n
+    ccnum = array('q', bytes(8 * n))
+    prev = array('q', [NO_VERTEX]) * n
+    pre = array('q', bytes(8 * n))
+    post = array('q', bytes(8 * n))
+    next_edge = array('q', offsets)
+    stack = array('q')
+    order = []
+    clock = 1
+    component = 0
 
     if start is None:
-        vertices = list(graph)
+        vertices = range(n)
     elif isinstance(start, list):
-        vertices = start
+        vertices = [graph.index[v] for v in start]
     else:
-        vertices = [start]
-    for v in vertices:
-        if v not in visited:
-            component += 1
-            prev[v] = None
-            explore(v)
+        vertices = [graph.index[start]]
+    for root in vertices:
+        if pre[root]:
+            continue
+        component += 1
+        pre[root] = clock
+        clock += 1
+        ccnum[root] = component
+        order.append(root)
+        stack.append(root)
+        while stack:
+            v = stack[-1]
+            e, end = next_edge[v], offsets[v + 1]
+            while e < end and pre[targets[e]]:
+                e += 1
+            if e < end:
+                neighbor = targets[e]
+                next_edge[v] = e + 1
+                prev[neighbor] = v
+                pre[neighbor] = clock
+                clock += 1
+                ccnum[neighbor] = component
+                order.append(neighbor)
+                stack.append(neighbor)
+            else:
+                stack.pop()
+                post[v] = clock
+                clock += 1
 
-    return ccnum, prev, pre, post
+    labels = graph.labels
+    return ({labels[v]: ccnum[v] for v in order},
+            {labels[v]: graph.label(prev[v]) for v in order},
+            {labels[v]: pre[v] for v in order},
+            {labels[v]: post[v] for v in order})
 
 
 # ---------------------------------------------------------------------------
@@ -129,8 +291,46 @@ def test_cycle_does_not_revisit():
     assert pre[0] < pre[2] and post[2] < post[0]   # 2 nested inside 0
 
 
+def test_csr_graph_matches_dict():
+    # The CSR path must return the same labelled timestamps as the dict path.
+    graph = {"A": ["B", "C"], "B": ["D"], "C": ["D"], "D": [], "E": ["A"]}
+    csr = CSRGraph.from_adjacency(graph)
+    assert depth_first_search(csr) == depth_first_search(graph)
+    assert depth_first_search(csr, ["E", "A"]) == depth_first_search(graph, ["E", "A"])
+
+
+def test_int_vertices_match_labels():
+    # Vertices 0..n-1 take the int-array path; relabelling them as strings
+    # forces the dict path, and both must agree.
+    graph = {0: [2, 1], 1: [3], 2: [3], 3: [], 4: [0], 5: []}
+    relabelled = {str(v): [str(u) for u in nbrs] for v, nbrs in graph.items()}
+    for start in [None, 4, [5, 1]]:
+        as_str = start if start is None else (
+            [str(v) for v in start] if isinstance(start, list) else str(start))
+        ccnum, prev, pre, post = depth_first_search(graph, start)
+        prev = {v: None if u is None else str(u) for v, u in prev.items()}
+        result = [{str(v): x for v, x in d.items()} for d in (ccnum, prev, pre, post)]
+        assert result == list(depth_first_search(relabelled, as_str))
+
+
+def test_deep_chain():
+    # A path far deeper than the interpreter's recursion limit.
+    n = 200_000
+    graph = {v: [v + 1] for v in range(n - 1)}
+    graph[n - 1] = []
+    ccnum, prev, pre, post = depth_first_search(graph)
+    assert pre[n - 1] == n and post[n - 1] == n + 1 and post[0] == 2 * n
+    assert prev[0] is None and prev[n - 1] == n - 2
+    labelled = {str(v): [str(u) for u in nbrs] for v, nbrs in graph.items()}
+    assert depth_first_search(labelled)[3]["0"] == 2 * n
+    assert depth_first_search(CSRGraph.from_adjacency(labelled))[3]["0"] == 2 * n
+
+
 if __name__ == "__main__":
     test_simple_path()
     test_disconnected_graph()
     test_cycle_does_not_revisit()
+    test_csr_graph_matches_dict()
+    test_int_vertices_match_labels()
+    test_deep_chain()
     print("All tests passed.")
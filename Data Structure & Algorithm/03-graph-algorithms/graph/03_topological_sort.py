@@ -1,42 +1,166 @@
 """
 Algorithm
 =====================
+Post-order (method="post"):
 - Run depth-first search on the graph and record the post-visit order
 - Reverse the post-visit order to obtain the topological sort order
 
+Kahn's algorithm (method="kahn"):
+- Count the in-degree of every vertex and queue the vertices with in-degree 0
+- Repeatedly dequeue a vertex, emit it, and decrement the in-degree of its
+  neighbors, queueing any that drop to 0
+- If fewer than V vertices were emitted, the rest lie on or behind a cycle
+
+DFS finishing order (method="dfs", the default):
+- Run an explicit-stack DFS over the predecessors of each vertex (the edges
+  reversed) and emit every vertex as soon as it finishes
+- A vertex finishes only after all its predecessors have, so the finishing
+  order is already topological and needs no reversal or sort
+- Reaching a vertex that is still open means a cycle
+
 Correctness
 =====================
 In a directed acyclic graph, if there is an edge from u to v, then the post-visit number of u
 is guaranteed to be greater than the post-visit number of v.
 Therefore, reversing the post-visit order is guaranteed to yield a valid topological ordering.
+Kahn's algorithm only emits a vertex once all of its predecessors have been
+emitted, and on a DAG some vertex always has in-degree 0 among the ones left,
+so every vertex is emitted. The DFS mode is the post-order argument applied to
+the reversed graph: there the post-visit order of u is greater than that of v
+for every original edge (v, u), so the finishing order is topological.
 
 Runtime
 =====================
 DFS iterates over every vertex and edge in the graph exactly once,
 so the time complexity is O(V + E) where V = number of vertices and E = number of edges.
+The post-order method then sorts the post-visit numbers, O(V log V); the
+Kahn and DFS modes avoid the sort and stream vertices out as they are decided,
+keeping only int arrays of per-vertex state.
 """
 
 import importlib.util, pathlib
+from array import array
+from collections import deque
 
 _mod_path = pathlib.Path(__file__).parent / "02_depth_first_search.py"
 _spec = importlib.util.spec_from_file_location("depth_first_search", _mod_path)
 _mod = importlib.util.module_from_spec(_spec)
 _spec.loader.exec_module(_mod)
 depth_first_search = _mod.depth_first_search
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+NO_VERTEX = _mod.NO_VERTEX
+
+
+class CycleError(ValueError):
+    """Raised when a topological order is requested for a graph with a cycle."""
+
+    def __init__(self, cycle):
+        # cycle: vertices [v0, v1, ..., vk] with edges v0 -> v1 -> ... -> vk -> v0
+        super().__init__(f"graph has a cycle: {cycle}")
+        self.cycle = cycle
 
 
-def topological_sort(graph):
+def topological_sort(graph, method="dfs"):
     # Input:
-    # - graph: a simple, directed, acyclic graph in adjacency list format
+    # - graph: a simple, directed, acyclic graph in adjacency list format,
+    #   or a CSRGraph
+    # - method: "dfs" (finishing order), "kahn" (in-degree queue), or
+    #   "post" (sort of the depth_first_search() post-visit numbers)
     #
     # Output:
     # - order: vertices in topological order from source to sink
     #   This output is indexed numerically rather than by vertex.
-    # - all outputs from the run of depth_first_search() are also available
-    #   to you: ccnum, prev, pre, and post.
-    _, _, _, post = depth_first_search(graph)
-    order = sorted(post.keys(), key=lambda k: post[k], reverse=True)
-    return order
+    #   The "dfs" and "kahn" methods raise CycleError if the graph has a cycle;
+    #   "post" assumes the graph is acyclic.
+    if method == "post":
+        _, _, _, post = depth_first_search(graph)
+        return sorted(post.keys(), key=lambda k: post[k], reverse=True)
+    return list(iter_topological_order(graph, method))
+
+
+def iter_topological_order(graph, method="dfs"):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a CSRGraph
+    # - method: "dfs" or "kahn"
+    #
+    # Output:
+    # - an iterator yielding the vertices in topological order, one at a time
+    #   If the graph has a cycle, CycleError is raised once every vertex
+    #   that can be ordered has been yielded ("kahn") or as soon as the DFS
+    #   closes the cycle ("dfs").
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph)
+    if method == "dfs":
+        return _dfs_order(csr)
+    if method == "kahn":
+        return _kahn_order(csr)
+    raise ValueError(f"unknown method: {method!r}")
+
+
+def _kahn_order(graph):
+    offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+    n = graph.n
+    indegree = array('q', bytes(8 * n))
+    for v in targets:
+        indegree[v] += 1
+    queue = deque(v for v in range(n) if not indegree[v])
+    emitted = 0
+    while queue:
+        u = queue.popleft()
+        yield labels[u]
+        emitted += 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            indegree[v] -= 1
+            if not indegree[v]:
+                queue.append(v)
+    if emitted < n:
+        # Every vertex left over still has a left-over predecessor, so
+        # walking predecessors from any of them must run into a cycle.
+        predecessors = graph.reverse()
+        v = next(v for v in range(n) if indegree[v])
+        position = {}
+        path = []
+        while v not in position:
+            position[v] = len(path)
+            path.append(v)
+            v = next(p for p in predecessors.neighbors(v) if indegree[p])
+        raise CycleError([labels[v] for v in reversed(path[position[v]:])])
+
+
+def _dfs_order(graph):
+    # DFS over predecessors; state[v] is 0 (new), 1 (open) or 2 (finished),
+    # and next_edge[v] is the next predecessor edge explore(v) will look at.
+    predecessors = graph.reverse()
+    offsets, sources, labels = predecessors.offsets, predecessors.targets, graph.labels
+    n = graph.n
+    state = bytearray(n)
+    next_edge = array('q', offsets)
+    stack = array('q')
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack.append(root)
+        while stack:
+            v = stack[-1]
+            e, end = next_edge[v], offsets[v + 1]
+            while e < end and state[sources[e]] == 2:
+                e += 1
+            next_edge[v] = e + 1
+            if e < end:
+                u = sources[e]
+                if state[u] == 1:
+                    # u -> ... -> v along the stack is a chain of reversed
+                    # edges, so in the original graph v -> ... -> u -> v.
+                    chain = stack[stack.index(u):]
+                    raise CycleError([labels[w] for w in reversed(chain)])
+                state[u] = 1
+                stack.append(u)
+            else:
+                stack.pop()
+                state[v] = 2
+                yield labels[v]
 
 
 def is_valid_topological_order(graph, order):
@@ -92,3 +216,39 @@ if __name__ == "__main__":
     assert order3.index("A") < order3.index("B"), \
         f"Test 3 chain order failed: {order3}"
     print("Test 3 passed:", order3)
+
+    # Test 4: The diamond from Test 2 in CSR form yields the same order.
+    order4 = topological_sort(CSRGraph.from_adjacency(graph2))
+    assert order4 == order2, f"Test 4 failed: {order4}"
+    print("Test 4 passed:", order4)
+
+    # Test 5: Kahn and DFS modes give valid orders and stream them lazily.
+    graph5 = {"A": ["C"], "B": ["C", "D"], "C": ["E"], "D": ["E"], "E": [], "F": []}
+    for method in ["dfs", "kahn"]:
+        order5 = topological_sort(graph5, method=method)
+        assert sorted(order5) == sorted(graph5), f"Test 5 failed ({method}): {order5}"
+        assert is_valid_topological_order(graph5, order5), f"Test 5 failed ({method}): {order5}"
+    assert next(iter_topological_order(graph5, "kahn")) == "A", "Test 5 failed: Kahn order"
+    print("Test 5 passed:", topological_sort(graph5, method="kahn"))
+
+    # Test 6: A cycle is reported instead of producing an invalid order.
+    graph6 = {"A": ["B"], "B": ["C"], "C": ["D", "B"], "D": [], "E": ["A"]}
+    for method in ["dfs", "kahn"]:
+        try:
+            topological_sort(graph6, method=method)
+        except CycleError as error:
+            cycle = error.cycle
+            assert sorted(cycle) == ["B", "C"], f"Test 6 failed ({method}): {cycle}"
+            assert all(v in graph6[u] for u, v in zip(cycle, cycle[1:] + cycle[:1])), \
+                f"Test 6 failed ({method}): {cycle} is not a cycle"
+        else:
+            raise AssertionError(f"Test 6 failed ({method}): no CycleError")
+    print("Test 6 passed")
+
+    # Test 7: A 200,000-vertex chain, far deeper than the recursion limit.
+    graph7 = {v: [v + 1] for v in range(199_999)}
+    graph7[199_999] = []
+    for method in ["dfs", "kahn"]:
+        assert topological_sort(graph7, method=method) == list(range(200_000)), \
+            f"Test 7 failed ({method})"
+    print("Test 7 passed")
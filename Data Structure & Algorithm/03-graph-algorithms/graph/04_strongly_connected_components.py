@@ -1,6 +1,16 @@
 """
 Algorithm
 =====================
+Tarjan's algorithm (default, one DFS pass):
+- Run DFS on G; on entering v record pre[v] and set low[v] = pre[v], and push v
+  onto a stack of vertices whose SCC has not been decided yet
+- For each edge (v, w): if w is unvisited, explore it and afterwards set
+  low[v] = min(low[v], low[w]); if w is still on the stack, set
+  low[v] = min(low[v], pre[w])
+- When v finishes with low[v] == pre[v], v is the root of an SCC: pop the stack
+  down to v and give all popped vertices the next ccnum
+
+Kosaraju's algorithm (method="kosaraju", two DFS passes):
 - Create a reverse graph G' for the original graph G
 - Run DFS on the reverse graph G' to find the post-visit order
 - Run DFS on the original graph G following the reversed post-visit order
@@ -8,37 +18,60 @@ Algorithm
 
 Correctness
 =====================
-Running DFS on the reverse graph G' gives us the topological order of the metagraph from sink to source
+Tarjan: low[v] is the smallest pre number reachable from v's DFS subtree using
+tree edges plus one edge to a vertex still on the stack. If low[v] == pre[v],
+nothing in v's subtree reaches an earlier open vertex, so v and the vertices
+above it on the stack form a complete SCC. An SCC is popped only after every
+SCC reachable from it has been popped, so components are numbered from sink to
+source.
+
+Kosaraju: Running DFS on the reverse graph G' gives us the topological order of the metagraph from sink to source
 (i.e., the vertex with the highest post-visit number in G' belongs to a sink SCC of the original G).
 Running DFS starting from the sink SCC of the original graph makes sure it won't find a vertex in another component,
 since a sink SCC has no outgoing edges to other SCCs.
 
 Runtime
 =====================
-Building the reverse graph takes O(V + E), and the two DFS passes together also take O(V + E).
-Therefore, the overall time complexity remains O(V + E), where V = number of vertices and E = number of edges.
+Both algorithms take O(V + E), where V = number of vertices and E = number of edges.
+Tarjan's needs a single pass with no reversed copy of the graph and no sort of the
+post-visit numbers, and keeps its per-vertex state in flat int arrays over a CSR
+copy of the graph. Metagraph edges are deduplicated with a per-component set, so
+building the metagraph is O(E) rather than O(E * outdegree).
 """
 
 import importlib.util, pathlib
+from array import array
 
 _mod_path = pathlib.Path(__file__).parent / "02_depth_first_search.py"
 _spec = importlib.util.spec_from_file_location("depth_first_search", _mod_path)
 _mod = importlib.util.module_from_spec(_spec)
 _spec.loader.exec_module(_mod)
 depth_first_search = _mod.depth_first_search
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+NO_VERTEX = _mod.NO_VERTEX
 
-def strongly_connected_components(graph):
+def strongly_connected_components(graph, method="tarjan"):
     # Input:
-    # - graph: a simple, directed graph in adjacency list format
+    # - graph: a simple, directed graph in adjacency list format, or a CSRGraph
+    # - method: "tarjan" (one pass) or "kosaraju" (two DFS passes)
     #
     # Output:
     # - metagraph: the strongly connected components metagraph in adjacency list format
     #   By construction, the metagraph is a DAG with vertices sorted from
     #   sink to source. This ordering is reverse topological ordering.
-    # - all outputs from the final run of depth_first_search() are also
+    # - all outputs from the DFS of the original graph are also
     #   available to you: ccnum, prev, pre, and post.
     #   This data can be used to connect metagraph vertices back to the
     #   original input graph.
+    if method == "tarjan":
+        csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph)
+        return _tarjan(csr)
+    if method != "kosaraju":
+        raise ValueError(f"unknown method: {method!r}")
+    if is_csr_graph(graph):
+        return _strongly_connected_components_csr(graph)
+
     graphr = {v: [] for v in graph}
     for u, neighbors in graph.items():
         for neighbor in neighbors:
@@ -48,15 +81,112 @@ def strongly_connected_components(graph):
 
     ccnum, prev, pre, post = depth_first_search(graph, orders)
 
-    metagraph = {scc: [] for scc in set(ccnum.values())}
+    successors = {scc: {} for scc in range(1, max(ccnum.values(), default=0) + 1)}
     for u, neighbors in graph.items():
         for v in neighbors:
-            if ccnum[u] != ccnum[v] and ccnum[v] not in metagraph[ccnum[u]]:
-                metagraph[ccnum[u]].append(ccnum[v])
+            if ccnum[u] != ccnum[v]:
+                successors[ccnum[u]][ccnum[v]] = None
+    metagraph = {scc: list(succ) for scc, succ in successors.items()}
 
     return metagraph, ccnum, prev, pre, post
 
 
+def _strongly_connected_components_csr(graph):
+    # Same two passes; the reverse graph is a CSR transpose, not a dict copy.
+    _, _, _, postr = depth_first_search(graph.reverse())
+    orders = sorted(postr, key=lambda v: postr[v], reverse=True)
+
+    ccnum, prev, pre, post = depth_first_search(graph, orders)
+
+    labels = graph.labels
+    ids = array('q', (ccnum[label] for label in labels))
+    return (_metagraph(graph, ids, max(ids, default=0)),
+            ccnum, prev, pre, post)
+
+
+def _tarjan(graph):
+    # Iterative Tarjan on integer vertex ids.
+    # - pre[v] == 0 marks unvisited; a visited vertex with ccnum[v] == 0 is
+    #   still on the stack
+    # - calls: the vertices whose explore() is open, innermost last, with
+    #   next_edge[v] the next edge explore(v) will look at
+    offsets, targets = graph.offsets, graph.targets
+    n = graph.n
+    ccnum = array('q', bytes(8 * n))
+    prev = array('q', [NO_VERTEX]) * n
+    pre = array('q', bytes(8 * n))
+    post = array('q', bytes(8 * n))
+    low = array('q', bytes(8 * n))
+    next_edge = array('q', offsets)
+    stack = array('q')
+    calls = array('q')
+    order = []
+    clock = 1
+    component = 0
+
+    for root in range(n):
+        if pre[root]:
+            continue
+        pre[root] = low[root] = clock
+        clock += 1
+        order.append(root)
+        stack.append(root)
+        calls.append(root)
+        while calls:
+            v = calls[-1]
+            e, end = next_edge[v], offsets[v + 1]
+            while e < end:
+                w = targets[e]
+                e += 1
+                if not pre[w]:
+                    next_edge[v] = e
+                    prev[w] = v
+                    pre[w] = low[w] = clock
+                    clock += 1
+                    order.append(w)
+                    stack.append(w)
+                    calls.append(w)
+                    break
+                if not ccnum[w] and pre[w] < low[v]:
+                    low[v] = pre[w]
+            else:
+                next_edge[v] = e
+                calls.pop()
+                post[v] = clock
+                clock += 1
+                if calls and low[v] < low[calls[-1]]:
+                    low[calls[-1]] = low[v]
+                if low[v] == pre[v]:
+                    component += 1
+                    while True:
+                        w = stack.pop()
+                        ccnum[w] = component
+                        if w == v:
+                            break
+
+    labels = graph.labels
+    return (_metagraph(graph, ccnum, component),
+            {labels[v]: ccnum[v] for v in order},
+            {labels[v]: graph.label(prev[v]) for v in order},
+            {labels[v]: pre[v] for v in order},
+            {labels[v]: post[v] for v in order})
+
+
+def _metagraph(graph, ccnum, count):
+    # ccnum[v] is the component of vertex id v; each component's successors
+    # are collected in a dict used as an insertion-ordered set.
+    targets = graph.targets
+    successors = [None] + [{} for _ in range(count)]
+    for u in range(graph.n):
+        cu = ccnum[u]
+        succ = successors[cu]
+        for e in graph.edge_range(u):
+            cv = ccnum[targets[e]]
+            if cu != cv:
+                succ[cv] = None
+    return {scc: list(successors[scc]) for scc in range(1, count + 1)}
+
+
 def same_scc(ccnum, u, v):
     """Return True if u and v belong to the same strongly connected component."""
     return ccnum[u] == ccnum[v]
@@ -98,3 +228,29 @@ if __name__ == "__main__":
     total_edges3 = sum(len(v) for v in metagraph3.values())
     assert total_edges3 == 1, f"Test 3 failed: expected 1 metagraph edge, got {total_edges3}"
     print("Test 3 passed:", metagraph3)
+
+    # Test 4: The graph from Test 3 in CSR form gives identical results.
+    result4 = strongly_connected_components(CSRGraph.from_adjacency(graph3))
+    assert result4 == strongly_connected_components(graph3), f"Test 4 failed: {result4}"
+    print("Test 4 passed:", result4[0])
+
+    # Test 5: Tarjan and Kosaraju find the same components on a graph mixing
+    # cycles and cross edges, and both number them from sink to source.
+    graph5 = {"A": ["B"], "B": ["C", "E"], "C": ["A", "D"], "D": ["F"],
+              "E": ["F"], "F": ["G"], "G": ["D"], "H": ["G", "A"]}
+    metagraph5, ccnum5, _, _, _ = strongly_connected_components(graph5)
+    metagraph5k, ccnum5k, _, _, _ = strongly_connected_components(graph5, method="kosaraju")
+    components = lambda ccnum: {frozenset(v for v in ccnum if ccnum[v] == c) for c in ccnum.values()}
+    assert components(ccnum5) == components(ccnum5k), f"Test 5 failed: {ccnum5} vs {ccnum5k}"
+    for metagraph in (metagraph5, metagraph5k):
+        assert all(c < scc for scc, succ in metagraph.items() for c in succ), \
+            f"Test 5 failed: metagraph not in reverse topological order: {metagraph}"
+    print("Test 5 passed:", metagraph5)
+
+    # Test 6: A 200,000-vertex cycle is one SCC without hitting the recursion limit.
+    n6 = 200_000
+    graph6 = {v: [(v + 1) % n6] for v in range(n6)}
+    metagraph6, ccnum6, _, _, post6 = strongly_connected_components(graph6)
+    assert metagraph6 == {1: []} and set(ccnum6.values()) == {1}, "Test 6 failed"
+    assert post6[0] == 2 * n6, "Test 6 failed: wrong post-visit numbers"
+    print("Test 6 passed")
@@ -9,6 +9,27 @@ Algorithm
     - Relax each outgoing edge by updating a neighbor's distance and parent when a shorter path is found
     - Push improved neighbors back into the heap
 
+Priority queues for integer weights:
+- Dial's bucket queue: when every weight is an integer in [0, C], all tentative
+  distances in the queue lie in [d, d + C] for the current minimum d, so C + 1
+  circular buckets indexed by distance mod (C + 1) replace the heap
+- Radix heap: for larger integer weights, bucket i holds keys whose highest bit
+  differing from the last popped key is bit i; popping redistributes the lowest
+  non-empty bucket around its minimum
+- Float weights (or negative ones) keep the binary heap
+
+Point-to-point queries:
+- Given target vertices, stop as soon as the last target is popped (settled)
+- Distances are recorded lazily as vertices are settled instead of initializing
+  every vertex up front
+
+Bidirectional search:
+- Run one search forward from the start and one backward (over reversed edges)
+  from the target, always advancing the side whose heap top is smaller
+- Whenever an edge reaches a vertex labelled by the other side, record the
+  candidate path length mu
+- Stop when the two heap tops sum to at least mu
+
 Correctness
 =====================
 Because all edge weights are non-negative, the first time a vertex is removed from the
@@ -16,26 +37,71 @@ min-heap with minimum tentative distance, that distance is final and equals the
 shortest-path distance from the start vertex. Repeating this argument for each extracted
 vertex shows that Dijkstra's algorithm correctly computes shortest-path distances and a
 shortest-path tree for every reachable vertex.
+Stopping after the targets are settled is safe because settled distances never change.
+In the bidirectional search, any path shorter than mu would have to pass through a
+vertex unsettled on both sides, so its length would be at least the sum of the two
+heap tops; once that sum reaches mu, mu is the shortest distance.
 
 Runtime
 =====================
 Using an adjacency list and a min-heap, each edge relaxation may trigger a heap push and
 each heap operation costs O(log V). Therefore, the total running time is
 O((V + E) log V), where V is the number of vertices and E is the number of edges.
+A target query only settles the vertices closer than the farthest target, and the
+bidirectional search roughly the vertices within half the distance from either end,
+so both are usually far below the full-graph bound.
+With integer weights of at most C, Dial's bucket queue takes O(V + E + D) time, where
+D <= (V - 1) * C is the largest distance, and the radix heap O(E + V log C); both
+replace the O(log V) heap operations with O(1) amortized bucket appends.
 """
 import heapq
+import importlib.util, pathlib
+from array import array
+
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+NO_VERTEX = _csr_mod.NO_VERTEX
+
 
-def dijkstra(graph, start, weights):
+def dijkstra(graph, start, weights=None, target=None, queue="auto", max_weight=1024,
+             stats=None):
     # Input:
-    # - graph: a simple graph in adjacency list format
+    # - graph: a simple graph in adjacency list format, or a CSRGraph
     # - start: starting vertex
     # - weights: non-negative edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - target: optional target vertex, or list of target vertices
+    #   The search stops once every target has been settled.
+    # - queue: priority queue to use: "heap" (binary heap), "dial" (bucket
+    #   queue), "radix" (radix heap), or "auto", which scans the weights once
+    #   and picks "dial" for integer weights up to max_weight, "radix" for
+    #   larger integer weights, and "heap" otherwise. Target queries skip the
+    #   scan and use "heap" unless a queue is given explicitly.
+    # - max_weight: largest edge weight the bucket queue is built for
+    # - stats: optional dict; filled with the queue used and its push/pop counts
     #
     # Output:
     # - dist: weighted distance from start to every vertex
     #   Unreachable vertices have distance inf.
+    #   With a target, only the settled vertices are stored; any other
+    #   vertex (including an unreachable target) reads as inf.
     # - prev: parent of each vertex on the shortest-path tree
     #   Unreachable vertices and the starting vertex have parent nil.
+    if target is not None:
+        targets = target if isinstance(target, list) else [target]
+        if queue == "auto":
+            queue = "heap"
+        pq = _make_queue(queue, None, max_weight, stats)
+        return _dijkstra_query(graph, start, weights, targets, pq)
+    weight_values = graph.weights if is_csr_graph(graph) else weights.values()
+    pq = _make_queue(queue, weight_values, max_weight, stats)
+    if is_csr_graph(graph):
+        return _dijkstra_csr(graph, start, pq)
+
     dist = {}
     prev = {}
 
@@ -53,9 +119,9 @@ def dijkstra(graph, start, weights):
     else:
         dist[start] = 0
 
-    heap = [(0, start)]
-    while heap:
-        distance, v = heapq.heappop(heap)
+    pq.push(0, start)
+    while pq:
+        distance, v = pq.pop()
         if distance != dist[v]:
             continue
 
@@ -64,11 +130,297 @@ def dijkstra(graph, start, weights):
             if dist[neighbor] > new_distance:
                 dist[neighbor] = new_distance
                 prev[neighbor] = v
-                heapq.heappush(heap, (new_distance, neighbor))
+                pq.push(new_distance, neighbor)
 
+    pq.report()
     return dist, prev
 
 
+def _dijkstra_csr(graph, start, pq):
+    # Same algorithm on integer vertex ids with flat dist/prev arrays.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = array('d', [float('inf')]) * graph.n
+    prev = array('q', [NO_VERTEX]) * graph.n
+    s = graph.index[start]
+    dist[s] = 0
+
+    pq.push(0, s)
+    while pq:
+        distance, v = pq.pop()
+        if distance != dist[v]:
+            continue
+
+        for e in range(offsets[v], offsets[v + 1]):
+            neighbor = targets[e]
+            new_distance = distance + weights[e]
+            if dist[neighbor] > new_distance:
+                dist[neighbor] = new_distance
+                prev[neighbor] = v
+                pq.push(new_distance, neighbor)
+
+    pq.report()
+    labels = graph.labels
+    return ({labels[v]: dist[v] for v in range(graph.n)},
+            {labels[v]: graph.label(prev[v]) for v in range(graph.n)})
+
+
+def _dijkstra_query(graph, start, weights, targets, pq):
+    out_edges, to_id, to_label = _edge_source(graph, weights)
+    targets = {to_id(t) for t in targets if not is_csr_graph(graph) or t in graph}
+    start = to_id(start)
+    best = {start: 0}
+    parent = {start: None}
+    dist, prev = {}, {}
+
+    pq.push(0, start)
+    while pq and targets:
+        distance, v = pq.pop()
+        if v in dist:
+            continue
+        dist[v] = distance
+        prev[v] = parent[v]
+        targets.discard(v)
+
+        for neighbor, weight in out_edges(v):
+            new_distance = distance + weight
+            if new_distance < best.get(neighbor, float('inf')):
+                best[neighbor] = new_distance
+                parent[neighbor] = v
+                pq.push(new_distance, neighbor)
+
+    pq.report()
+    return (_Distances((to_label(v), d) for v, d in dist.items()),
+            _Parents((to_label(v), to_label(u)) for v, u in prev.items()))
+
+
+def _make_queue(kind, weight_values, max_weight, stats):
+    """Return an empty priority queue of the requested kind ("auto" scans weight_values)."""
+    if kind == "auto":
+        kind = "dial"
+        for w in weight_values:
+            if w < 0 or not (isinstance(w, int) or float(w).is_integer()):
+                kind = "heap"
+                break
+            if w > max_weight:
+                kind = "radix"
+    if kind == "heap":
+        return _BinaryHeap(stats)
+    if kind == "dial":
+        return _BucketQueue(max_weight, stats)
+    if kind == "radix":
+        return _RadixHeap(stats)
+    raise ValueError(f"unknown queue: {kind!r}")
+
+
+class _BinaryHeap:
+    # heapq with lazy deletion: a vertex is pushed again instead of decreased.
+    name = "heap"
+
+    def __init__(self, stats):
+        self.heap = []
+        self.stats = stats
+        self.pushes = self.pops = 0
+
+    def push(self, key, v):
+        self.pushes += 1
+        heapq.heappush(self.heap, (key, v))
+
+    def pop(self):
+        self.pops += 1
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def report(self):
+        if self.stats is not None:
+            self.stats.update(queue=self.name, pushes=self.pushes, pops=self.pops)
+
+
+class _BucketQueue(_BinaryHeap):
+    # Dial's circular buckets; keys must be integers within max_weight of the
+    # current minimum, which holds for Dijkstra with weights in [0, max_weight].
+    name = "dial"
+
+    def __init__(self, max_weight, stats):
+        super().__init__(stats)
+        self.buckets = [[] for _ in range(int(max_weight) + 1)]
+        self.current = 0
+        self.size = 0
+
+    def push(self, key, v):
+        if key - self.current >= len(self.buckets):
+            raise ValueError(f"edge weight exceeds max_weight {len(self.buckets) - 1}")
+        self.pushes += 1
+        self.size += 1
+        self.buckets[int(key) % len(self.buckets)].append((key, v))
+
+    def pop(self):
+        bucket = self.buckets[self.current % len(self.buckets)]
+        while not bucket:
+            self.current += 1
+            bucket = self.buckets[self.current % len(self.buckets)]
+        self.pops += 1
+        self.size -= 1
+        return bucket.pop()
+
+    def __len__(self):
+        return self.size
+
+
+class _RadixHeap(_BinaryHeap):
+    # Monotone integer priority queue: bucket i holds keys whose highest bit
+    # that differs from the last popped key is bit i - 1 (bucket 0: equal).
+    name = "radix"
+
+    def __init__(self, stats):
+        super().__init__(stats)
+        self.buckets = [[]]
+        self.last = 0
+        self.size = 0
+
+    def push(self, key, v):
+        self.pushes += 1
+        self.size += 1
+        self._place(key, v)
+
+    def _place(self, key, v):
+        i = (int(key) ^ self.last).bit_length()
+        while len(self.buckets) <= i:
+            self.buckets.append([])
+        self.buckets[i].append((key, v))
+
+    def pop(self):
+        if not self.buckets[0]:
+            i = 1
+            while not self.buckets[i]:
+                i += 1
+            entries, self.buckets[i] = self.buckets[i], []
+            self.last = int(min(key for key, _ in entries))
+            for key, v in entries:
+                self._place(key, v)
+        self.pops += 1
+        self.size -= 1
+        return self.buckets[0].pop()
+
+    def __len__(self):
+        return self.size
+
+
+def bidirectional_dijkstra(graph, start, target, weights=None, graphr=None):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a CSRGraph
+    # - start: starting vertex
+    # - target: target vertex
+    # - weights: non-negative edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - graphr: optional reverse of graph (same format), built here if not
+    #   given; pass it in to reuse it across queries
+    #
+    # Output:
+    # - distance: shortest-path distance from start to target (inf if unreachable)
+    # - path: list of vertices from start to target, or [] if unreachable
+    if graphr is None:
+        if is_csr_graph(graph):
+            graphr = graph.reverse()
+        else:
+            graphr = {v: [] for v in graph}
+            for u, neighbors in graph.items():
+                for v in neighbors:
+                    graphr.setdefault(v, []).append(u)
+    weightsr = None if weights is None else _ReversedWeights(weights)
+    out_edges, to_id, to_label = _edge_source(graph, weights)
+    in_edges, _, _ = _edge_source(graphr, weightsr)
+
+    if start == target:
+        return 0, [start]
+    if start not in graph or target not in graphr:
+        return float('inf'), []
+    s, t = to_id(start), to_id(target)
+
+    sides = (out_edges, in_edges)
+    dist = ({s: 0}, {t: 0})
+    parent = ({s: None}, {t: None})
+    settled = (set(), set())
+    heaps = ([(0, s)], [(0, t)])
+    mu, meet = float('inf'), None
+
+    while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < mu:
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, v = heapq.heappop(heaps[side])
+        if v in settled[side]:
+            continue
+        settled[side].add(v)
+        other = dist[1 - side]
+
+        for neighbor, weight in sides[side](v):
+            new_distance = distance + weight
+            if new_distance < dist[side].get(neighbor, float('inf')):
+                dist[side][neighbor] = new_distance
+                parent[side][neighbor] = v
+                heapq.heappush(heaps[side], (new_distance, neighbor))
+            if neighbor in other and dist[side][neighbor] + other[neighbor] < mu:
+                mu = dist[side][neighbor] + other[neighbor]
+                meet = neighbor
+
+    if meet is None:
+        return float('inf'), []
+    path = []
+    v = meet
+    while v is not None:
+        path.append(to_label(v))
+        v = parent[0][v]
+    path.reverse()
+    v = parent[1][meet]
+    while v is not None:
+        path.append(to_label(v))
+        v = parent[1][v]
+    return mu, path
+
+
+def _edge_source(graph, weights):
+    """Return (out_edges, to_id, to_label) for a dict graph or a CSRGraph.
+
+    out_edges(v) yields (neighbor, weight) pairs; to_id/to_label convert
+    between caller labels and the ids the search runs on.
+    """
+    if is_csr_graph(graph):
+        offsets, targets, edge_weights = graph.offsets, graph.targets, graph.weights
+        labels = graph.labels
+
+        def out_edges(v):
+            return zip(targets[offsets[v]:offsets[v + 1]],
+                       edge_weights[offsets[v]:offsets[v + 1]])
+
+        return out_edges, graph.index.__getitem__, lambda v: None if v is None else labels[v]
+
+    def out_edges(v):
+        return ((neighbor, weights[(v, neighbor)]) for neighbor in graph.get(v, []))
+
+    return out_edges, lambda v: v, lambda v: v
+
+
+class _ReversedWeights:
+    # Looks up weights[(u, v)] for the reversed edge (v, u).
+    def __init__(self, weights):
+        self.weights = weights
+
+    def __getitem__(self, edge):
+        return self.weights[(edge[1], edge[0])]
+
+
+class _Distances(dict):
+    # Lazily populated distance map: vertices never settled read as inf.
+    def __missing__(self, v):
+        return float('inf')
+
+
+class _Parents(dict):
+    # Lazily populated parent map: vertices never settled read as None.
+    def __missing__(self, v):
+        return None
+
+
 def test_simple_weighted_path():
     # Linear chain: A -> B -> C -> D with total distance 6 from A to D.
     graph = {
@@ -138,9 +490,129 @@ def test_disconnected_graph():
     assert prev["D"] is None
 
 
+def test_csr_graph_matches_dict():
+    # The CSR path must return the same labelled dist/prev as the dict path.
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B", "D"],
+        "D": [],
+        "E": ["A"],
+    }
+    weights = {
+        ("A", "B"): 10,
+        ("A", "C"): 1,
+        ("C", "B"): 1,
+        ("B", "D"): 1,
+        ("C", "D"): 5,
+        ("E", "A"): 2,
+    }
+    csr = CSRGraph.from_adjacency(graph, weights)
+
+    assert dijkstra(csr, "A") == dijkstra(graph, "A", weights)
+
+
+def test_target_query_stops_early():
+    # Only A and C are closer than B, so D and E are never settled.
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B", "E"],
+        "D": [],
+        "E": [],
+    }
+    weights = {
+        ("A", "B"): 10,
+        ("A", "C"): 1,
+        ("C", "B"): 1,
+        ("B", "D"): 1,
+        ("C", "E"): 5,
+    }
+
+    dist, prev = dijkstra(graph, "A", weights, target="B")
+
+    assert dist == {"A": 0, "C": 1, "B": 2}
+    assert prev["B"] == "C"
+    assert dist["D"] == float("inf")              # not settled, read lazily
+
+    dist, _ = dijkstra(graph, "A", weights, target=["D", "E"])
+    full_dist, _ = dijkstra(graph, "A", weights)
+    assert dist["D"] == full_dist["D"] and dist["E"] == full_dist["E"]
+
+    csr = CSRGraph.from_adjacency(graph, weights)
+    assert dijkstra(csr, "A", target="B") == ({"A": 0, "C": 1, "B": 2},
+                                              {"A": None, "C": "A", "B": "C"})
+
+
+def test_bidirectional_matches_dijkstra():
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B", "D"],
+        "D": ["E"],
+        "E": [],
+        "F": ["A"],
+    }
+    weights = {
+        ("A", "B"): 10,
+        ("A", "C"): 1,
+        ("C", "B"): 1,
+        ("B", "D"): 1,
+        ("C", "D"): 5,
+        ("D", "E"): 2,
+        ("F", "A"): 1,
+    }
+
+    distance, path = bidirectional_dijkstra(graph, "A", "E", weights)
+
+    assert distance == dijkstra(graph, "A", weights)[0]["E"] == 5
+    assert path == ["A", "C", "B", "D", "E"]
+    assert bidirectional_dijkstra(graph, "E", "A", weights) == (float("inf"), [])
+
+    csr = CSRGraph.from_adjacency(graph, weights)
+    assert bidirectional_dijkstra(csr, "F", "E") == (6, ["F", "A", "C", "B", "D", "E"])
+
+
+def test_integer_queues_match_heap():
+    # Small integer weights select Dial's buckets, large ones the radix heap;
+    # both must produce the same distances as the binary heap.
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B", "D"],
+        "D": ["E"],
+        "E": [],
+    }
+    small = {("A", "B"): 7, ("A", "C"): 1, ("C", "B"): 2,
+             ("B", "D"): 0, ("C", "D"): 9, ("D", "E"): 3}
+    large = {edge: w * 100000 + 1 for edge, w in small.items()}
+
+    for weights, expected_queue in [(small, "dial"), (large, "radix")]:
+        stats = {}
+        dist, prev = dijkstra(graph, "A", weights, stats=stats)
+        heap_stats = {}
+        assert (dist, prev) == dijkstra(graph, "A", weights, queue="heap", stats=heap_stats)
+        assert stats["queue"] == expected_queue
+        assert stats["pops"] == stats["pushes"]
+        assert heap_stats["queue"] == "heap"
+
+    stats = {}
+    dijkstra(graph, "A", {edge: w + 0.5 for edge, w in small.items()}, stats=stats)
+    assert stats["queue"] == "heap"
+
+    csr = CSRGraph.from_adjacency(graph, small)
+    stats = {}
+    assert dijkstra(csr, "A", stats=stats) == dijkstra(graph, "A", small)
+    assert stats["queue"] == "dial"
+
+
 if __name__ == "__main__":
     test_simple_weighted_path()
     test_prefers_cheaper_indirect_path()
     test_disconnected_graph()
+    test_integer_queues_match_heap()
+    test_target_query_stops_early()
+    test_bidirectional_matches_dijkstra()
+    test_csr_graph_matches_dict()
     print("All tests passed.")
 
@@ -10,22 +10,70 @@ Recurrence:
 - T(0, v) = inf, for v in graph and v is not s
 - T(k, v) = min(T(k-1, v), min over (u,v) in E of T(k-1, u) + w(u, v))
 
+Queue mode (SPFA):
+- Keep a FIFO of vertices whose distance improved, starting with s
+- Each round pops the current queue and relaxes only the edges of those vertices
+- Stop as soon as a round leaves the queue empty
+- Track the number of edges on each tentative path; a path of n or more edges
+  repeats a vertex, and the repeated part of the prev chain is a negative cycle
+
+Vectorized mode:
+- Pack the edges once into parallel arrays src, dst, w
+- Each round gathers dist[src] + w for every edge and scatters the minimum into
+  dist with np.minimum.at; prev[v] is set to the src of an edge that achieved it
+- Stop as soon as a round changes nothing
+
 Correctness
 =====================
 Correct when there are no negative-weight cycles. Any simple shortest path visits at most
 n-1 edges, so T(n-1, v) gives the correct distance for all reachable vertices. A negative
 cycle is detectable if any distance improves on an nth iteration.
+In queue mode a vertex that did not improve cannot improve its neighbors, so skipping it
+changes nothing; after round k every vertex whose shortest path has at most k edges is
+final, so the queue empties within n-1 rounds unless a negative cycle is reachable.
+A vectorized round reads only the previous round's distances, so it computes exactly
+T(k, v); if T(n, v) still differs from T(n-1, v) a negative cycle is reachable.
 
 Runtime
 =====================
 O(V * E): there are n-1 iterations, and each iteration relaxes all E edges.
+The iteration table is stored as the starting distances plus, per iteration,
+only the entries that changed, so it costs O(V + number of updates) memory
+instead of O(V^2); rebuilding iter[i] on access costs O(V + updates up to i).
+Queue mode is still O(V * E) in the worst case, but each round only scans the edges of
+vertices that improved and it stops after the last improving round, which on graphs
+that converge in a few rounds is close to O(E).
+Vectorized mode does the same O(E) work per round, but as a handful of NumPy array
+operations instead of one Python-level dict lookup per edge.
 """
+from collections.abc import Sequence
+import importlib.util, pathlib
+from array import array
+
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+NO_VERTEX = _csr_mod.NO_VERTEX
+
 
-def bellman_ford(graph, start, weights):
+def bellman_ford(graph, start, weights=None, trace=None, method="rounds"):
     # Input:
-    # - graph: a simple graph in adjacency list format
+    # - graph: a simple graph in adjacency list format, or a CSRGraph
     # - start: starting vertex
     # - weights: edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - trace: record the iteration table. Defaults to on for "rounds" and
+    #   off for the faster modes.
+    # - method: "rounds" relaxes every edge in each of the n-1 iterations;
+    #   "queue" (SPFA) only revisits vertices whose distance improved, stops
+    #   after the first round without changes, and raises NegativeCycleError
+    #   when a negative cycle is reachable from start; "numpy" relaxes all
+    #   edges per round as vectorized array operations (requires NumPy),
+    #   stops after the first round without changes, and raises
+    #   NegativeCycleError if round n still improves a distance
     #
     # Output:
     # - dist: weighted distance from start to every vertex
@@ -36,6 +84,27 @@ def bellman_ford(graph, start, weights):
     # - iter: iter[i][v] is the shortest-path distance from the starting
     #   vertex to v at the end of iteration i.
     #   This table contains iterations 0 through n-1.
+    #   It is an IterationTrace that stores only the changed entries of each
+    #   iteration and rebuilds iter[i] on access; None when trace is off.
+    #   In queue and numpy mode it ends at the first round without changes.
+    if method == "queue":
+        csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+        dist, prev, iter, cycle = _bellman_ford_queue(csr, start, bool(trace))
+        if cycle is not None:
+            raise NegativeCycleError([csr.labels[v] for v in cycle])
+        labels = csr.labels
+        return ({labels[v]: dist[v] for v in range(csr.n)},
+                {labels[v]: csr.label(prev[v]) for v in range(csr.n)},
+                iter)
+    if method == "numpy":
+        csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+        return _bellman_ford_numpy(csr, start, bool(trace))
+    if method != "rounds":
+        raise ValueError(f"unknown method: {method!r}")
+    trace = trace is None or trace
+    if is_csr_graph(graph):
+        return _bellman_ford_csr(graph, start, trace)
+
     dist = {}
     prev = {}
 
@@ -50,20 +119,220 @@ def bellman_ford(graph, start, weights):
     dist[start] = 0
 
     n = len(dist)
-    iter = [{v: dist[v] for v in dist}]
+    iter = IterationTrace(dist) if trace else None
 
     for i in range(1, n):
-        prev_dist = iter[i - 1]
+        prev_dist = dict(dist)
+        changes = {}
         for u, neighbors in graph.items():
             for v in neighbors:
                 if prev_dist[u] + weights[(u, v)] < dist[v]:
                     dist[v] = prev_dist[u] + weights[(u, v)]
                     prev[v] = u
-        iter.append({v: dist[v] for v in dist})
+                    changes[v] = dist[v]
+        if iter is not None:
+            iter.record(changes)
 
     return dist, prev, iter
 
 
+def _bellman_ford_csr(graph, start, trace):
+    # Same rounds on integer vertex ids; each round reads the previous round's
+    # distances from a flat array copy instead of a dict.
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    labels = graph.labels
+    n = graph.n
+    dist = array('d', [float('inf')]) * n
+    prev = array('q', [NO_VERTEX]) * n
+    dist[graph.index[start]] = 0
+
+    iter = IterationTrace({labels[v]: dist[v] for v in range(n)}) if trace else None
+
+    for i in range(1, n):
+        prev_dist = array('d', dist)
+        changes = {}
+        for u in range(n):
+            du = prev_dist[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if du + weights[e] < dist[v]:
+                    dist[v] = du + weights[e]
+                    prev[v] = u
+                    changes[labels[v]] = dist[v]
+        if iter is not None:
+            iter.record(changes)
+
+    return ({labels[v]: dist[v] for v in range(n)},
+            {labels[v]: graph.label(prev[v]) for v in range(n)},
+            iter)
+
+
+def _bellman_ford_queue(graph, start, trace):
+    # Queue-based rounds on integer vertex ids. Returns the raw dist/prev
+    # arrays, the trace, and a negative cycle as vertex ids (or None).
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    labels = graph.labels
+    n = graph.n
+    dist = array('d', [float('inf')]) * n
+    prev = array('q', [NO_VERTEX]) * n
+    length = array('q', [0]) * n     # edges on the current path to v
+    queued = bytearray(n)
+    s = graph.index[start]
+    dist[s] = 0
+
+    iter = IterationTrace({labels[v]: dist[v] for v in range(n)}) if trace else None
+
+    queue = [s]
+    queued[s] = 1
+    while queue:
+        next_queue = []
+        changes = {}
+        for u in queue:
+            queued[u] = 0
+            du = dist[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if du + weights[e] < dist[v]:
+                    dist[v] = du + weights[e]
+                    prev[v] = u
+                    length[v] = length[u] + 1
+                    if length[v] >= n:
+                        cycle = _prev_cycle(prev, v)
+                        if cycle is not None:
+                            return dist, prev, iter, cycle
+                    if iter is not None:
+                        changes[labels[v]] = dist[v]
+                    if not queued[v]:
+                        queued[v] = 1
+                        next_queue.append(v)
+        if iter is not None:
+            iter.record(changes)
+        queue = next_queue
+
+    return dist, prev, iter, None
+
+
+def _bellman_ford_numpy(graph, start, trace):
+    import numpy as np
+
+    labels = graph.labels
+    n = graph.n
+    offsets, dst, w = graph.as_numpy()
+    src = np.repeat(np.arange(n), np.diff(offsets))
+    dist = np.full(n, np.inf)
+    prev = np.full(n, NO_VERTEX, dtype=np.int64)
+    dist[graph.index[start]] = 0
+
+    iter = IterationTrace(dict(zip(labels, dist.tolist()))) if trace else None
+
+    for i in range(1, n + 1):
+        candidate = dist[src] + w
+        new_dist = dist.copy()
+        np.minimum.at(new_dist, dst, candidate)
+        improved = new_dist < dist
+        if not improved.any():
+            break
+        if i == n:
+            # Still improving after n - 1 rounds; let queue mode find the cycle.
+            _, _, _, cycle = _bellman_ford_queue(graph, start, False)
+            raise NegativeCycleError([labels[v] for v in cycle])
+        winners = improved[dst] & (candidate == new_dist[dst])
+        prev[dst[winners]] = src[winners]
+        if iter is not None:
+            changed = np.flatnonzero(improved)
+            iter.record(dict(zip([labels[v] for v in changed], new_dist[changed].tolist())))
+        dist = new_dist
+
+    return (dict(zip(labels, dist.tolist())),
+            {labels[v]: graph.label(p) for v, p in enumerate(prev.tolist())},
+            iter)
+
+
+def _prev_cycle(prev, v):
+    """Return the cycle on the prev chain from v in edge order, or None."""
+    seen = set()
+    while v != NO_VERTEX and v not in seen:
+        seen.add(v)
+        v = prev[v]
+    if v == NO_VERTEX:
+        return None
+    cycle = [v]
+    u = prev[v]
+    while u != v:
+        cycle.append(u)
+        u = prev[u]
+    cycle.reverse()
+    return cycle
+
+
+def find_negative_cycle(graph, start, weights=None):
+    # Input:
+    # - graph: a simple graph in adjacency list format, or a CSRGraph
+    # - start: starting vertex
+    # - weights: edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    #
+    # Output:
+    # - cycle: list of vertices [v1, v2, ..., vk] of a negative cycle
+    #   v1 -> v2 -> ... -> vk -> v1 reachable from start, or None
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+    _, _, _, cycle = _bellman_ford_queue(csr, start, False)
+    return None if cycle is None else [csr.labels[v] for v in cycle]
+
+
+class NegativeCycleError(ValueError):
+    """Raised when a negative-weight cycle is reachable from the start vertex."""
+
+    def __init__(self, cycle):
+        super().__init__(f"negative cycle reachable from start: {cycle}")
+        self.cycle = cycle
+
+
+class IterationTrace(Sequence):
+    """Iteration table stored as a base snapshot plus per-iteration deltas.
+
+    trace[0] is the base; trace[i] is rebuilt on demand by applying the
+    first i deltas, so trace[i][v] reads like the full table it replaces.
+    """
+
+    def __init__(self, base):
+        self.base = self._copy(base)
+        self.deltas = []
+
+    def record(self, delta):
+        """Append the entries that changed during the next iteration."""
+        self.deltas.append(delta)
+
+    def __len__(self):
+        return len(self.deltas) + 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("iteration out of range")
+        snapshot = self._copy(self.base)
+        for delta in self.deltas[:i]:
+            self._apply(snapshot, delta)
+        return self._view(snapshot)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def _copy(self, snapshot):
+        return dict(snapshot)
+
+    def _apply(self, snapshot, delta):
+        snapshot.update(delta)
+
+    def _view(self, snapshot):
+        return snapshot
+
+
 def test_simple_weighted_path():
     # Linear chain: A -> B -> C -> D with total distance 6 from A to D.
     graph = {
@@ -147,6 +416,150 @@ def test_iter_table():
     assert itr[0] == {"A": 0, "B": float("inf"), "C": float("inf")}
     assert itr[1] == {"A": 0, "B": 2, "C": float("inf")}
     assert itr[2] == {"A": 0, "B": 2, "C": 5}
+    assert itr.deltas == [{"B": 2}, {"C": 5}]
+    assert itr[-1] == itr[2]
+
+
+def test_trace_disabled():
+    # With trace=False no table is kept, but dist and prev are unchanged.
+    graph = {
+        "A": ["B"],
+        "B": ["C"],
+        "C": [],
+    }
+    weights = {
+        ("A", "B"): 2,
+        ("B", "C"): 3,
+    }
+
+    dist, prev, itr = bellman_ford(graph, "A", weights, trace=False)
+
+    assert itr is None
+    assert dist == {"A": 0, "B": 2, "C": 5}
+    assert prev == {"A": None, "B": "A", "C": "B"}
+
+
+def test_csr_graph_matches_dict():
+    # The CSR path must return the same labelled dist/prev/iter as the dict path.
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B"],
+        "D": [],
+    }
+    weights = {
+        ("A", "B"): 4,
+        ("A", "C"): 1,
+        ("C", "B"): -2,
+        ("B", "D"): 1,
+    }
+    csr = CSRGraph.from_adjacency(graph, weights)
+
+    assert bellman_ford(csr, "A") == bellman_ford(graph, "A", weights)
+
+
+def test_queue_mode_matches_rounds():
+    # SPFA must reach the same distances, and stop once the queue empties.
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B"],
+        "D": [],
+        "E": ["A"],
+    }
+    weights = {
+        ("A", "B"): 4,
+        ("A", "C"): 1,
+        ("C", "B"): -2,
+        ("B", "D"): 1,
+        ("E", "A"): 1,
+    }
+
+    dist, prev, itr = bellman_ford(graph, "A", weights, method="queue")
+    expected_dist, expected_prev, _ = bellman_ford(graph, "A", weights)
+
+    assert itr is None
+    assert dist == expected_dist
+    assert prev == expected_prev
+
+    _, _, itr = bellman_ford(graph, "A", weights, method="queue", trace=True)
+    assert itr[-1] == expected_dist
+
+    # A star converges in one round; the second round finds nothing to do,
+    # so the table stops at iteration 2 instead of n - 1 = 4.
+    star = {"A": ["B", "C", "D", "E"]}
+    star_weights = {("A", v): 1 for v in "BCDE"}
+    _, _, itr = bellman_ford(star, "A", star_weights, method="queue", trace=True)
+    assert len(itr) == 3
+    assert itr.deltas[-1] == {}
+
+
+def test_negative_cycle():
+    # B -> C -> D -> B has total weight 1 - 3 + 1 = -1 and is reachable from A.
+    graph = {
+        "A": ["B"],
+        "B": ["C"],
+        "C": ["D"],
+        "D": ["B", "E"],
+        "E": [],
+    }
+    weights = {
+        ("A", "B"): 1,
+        ("B", "C"): 1,
+        ("C", "D"): -3,
+        ("D", "B"): 1,
+        ("D", "E"): 2,
+    }
+
+    cycle = find_negative_cycle(graph, "A", weights)
+
+    assert sorted(cycle) == ["B", "C", "D"]
+    assert sum(weights[(u, v)] for u, v in zip(cycle, cycle[1:] + cycle[:1])) < 0
+    assert find_negative_cycle(graph, "E", weights) is None
+    try:
+        bellman_ford(graph, "A", weights, method="queue")
+    except NegativeCycleError as error:
+        assert sorted(error.cycle) == ["B", "C", "D"]
+    else:
+        raise AssertionError("expected NegativeCycleError")
+
+
+def test_numpy_mode_matches_rounds():
+    # The vectorized rounds compute the same table, entry for entry.
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return  # optional dependency
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B"],
+        "D": [],
+        "E": ["A"],
+    }
+    weights = {
+        ("A", "B"): 4,
+        ("A", "C"): 1,
+        ("C", "B"): -2,
+        ("B", "D"): 1,
+        ("E", "A"): 1,
+    }
+
+    dist, prev, itr = bellman_ford(graph, "A", weights, method="numpy", trace=True)
+    expected_dist, expected_prev, expected_itr = bellman_ford(graph, "A", weights)
+
+    assert dist == expected_dist
+    assert prev == expected_prev
+    assert list(itr) == list(expected_itr)[:len(itr)]
+
+    cycle_graph = {"A": ["B"], "B": ["C"], "C": ["B"]}
+    cycle_weights = {("A", "B"): 1, ("B", "C"): -2, ("C", "B"): 1}
+    try:
+        bellman_ford(cycle_graph, "A", cycle_weights, method="numpy")
+    except NegativeCycleError as error:
+        assert sorted(error.cycle) == ["B", "C"]
+    else:
+        raise AssertionError("expected NegativeCycleError")
 
 
 if __name__ == "__main__":
@@ -154,4 +567,9 @@ if __name__ == "__main__":
     test_negative_edge_weight()
     test_disconnected_graph()
     test_iter_table()
+    test_trace_disabled()
+    test_queue_mode_matches_rounds()
+    test_negative_cycle()
+    test_numpy_mode_matches_rounds()
+    test_csr_graph_matches_dict()
     print("All tests passed.")
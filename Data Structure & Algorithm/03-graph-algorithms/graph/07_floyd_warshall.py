@@ -20,12 +20,39 @@ is negative after the algorithm completes.
 Runtime
 =====================
 O(V^3): three nested loops each over all n vertices.
+The NumPy engine does the same O(V^3) work, but each k step is one broadcast
+over the dense V x V matrix, so the two inner loops run in compiled code.
+The iteration table keeps only the entries each k step changed, so it costs
+O(V^2 + number of updates) memory instead of O(V^3).
 """
+from collections.abc import Mapping
+import importlib.util, pathlib
 
-def floyd_warshall(graph, weights):
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+
+_mod_path = pathlib.Path(__file__).parent / "06_bellman_ford.py"
+_spec = importlib.util.spec_from_file_location("bellman_ford", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+IterationTrace = _mod.IterationTrace
+
+
+def floyd_warshall(graph, weights=None, method="loops", trace=None):
     # Input:
-    # - graph: a simple graph in adjacency list format
+    # - graph: a simple graph in adjacency list format, or a CSRGraph
     # - weights: edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - method: "loops" runs the triple Python loop below; "numpy" keeps dist
+    #   as a dense float matrix and does each k step as one broadcast
+    #   np.minimum (requires NumPy). The numpy engine returns dist (and each
+    #   iter[i]) as a DistanceMatrix view.
+    # - trace: record the iteration table. Defaults to on for "loops" and
+    #   off for "numpy".
     #
     # Output:
     # - dist: all-pairs shortest-path distances
@@ -35,6 +62,16 @@ def floyd_warshall(graph, weights):
     # - iter: iter[i][u][v] is the distance from u to v at the end of
     #   iteration i.
     #   This table contains iterations 0 through n.
+    #   It is an IterationTrace that stores only the entries changed by each
+    #   iteration and rebuilds iter[i] on access; None when trace is off.
+    if method == "numpy":
+        return _floyd_warshall_numpy(graph, weights, bool(trace))
+    if method != "loops":
+        raise ValueError(f"unknown method: {method!r}")
+    trace = trace is None or trace
+    if is_csr_graph(graph):
+        return _floyd_warshall_csr(graph, trace)
+
     vertices = set()
     for u, neighbors in graph.items():
         vertices.add(u)
@@ -49,18 +86,140 @@ def floyd_warshall(graph, weights):
         for v in neighbors:
             dist[u][v] = weights[(u, v)]
 
-    iter = [{u: dict(dist[u]) for u in vertices}]
+    iter = _MatrixTrace(dist) if trace else None
 
     for k in vertices:
+        changes = {}
         for u in vertices:
             for v in vertices:
                 if dist[u][k] + dist[k][v] < dist[u][v]:
                     dist[u][v] = dist[u][k] + dist[k][v]
-        iter.append({u: dict(dist[u]) for u in vertices})
+                    changes[(u, v)] = dist[u][v]
+        if iter is not None:
+            iter.record(changes)
 
     return dist, iter
 
 
+def _floyd_warshall_csr(graph, trace):
+    # Same triple loop on integer vertex ids over a list-of-lists matrix,
+    # relabelled into dict-of-dicts at the end.
+    labels = graph.labels
+    n = graph.n
+    dist = [[float('inf')] * n for _ in range(n)]
+    for u in range(n):
+        dist[u][u] = 0
+        for e in graph.edge_range(u):
+            dist[u][graph.targets[e]] = graph.weights[e]
+
+    def relabel(matrix):
+        return {labels[u]: dict(zip(labels, matrix[u])) for u in range(n)}
+
+    iter = _MatrixTrace(relabel(dist)) if trace else None
+
+    for k in range(n):
+        dist_k = dist[k]
+        changes = {}
+        for u in range(n):
+            dist_u = dist[u]
+            d_uk = dist_u[k]
+            for v in range(n):
+                if d_uk + dist_k[v] < dist_u[v]:
+                    dist_u[v] = d_uk + dist_k[v]
+                    changes[(labels[u], labels[v])] = dist_u[v]
+        if iter is not None:
+            iter.record(changes)
+
+    return relabel(dist), iter
+
+
+def _floyd_warshall_numpy(graph, weights, trace):
+    import numpy as np
+
+    if not is_csr_graph(graph):
+        graph = CSRGraph.from_adjacency(graph, weights)
+    n = graph.n
+    offsets, targets, edge_weights = graph.as_numpy()
+
+    dist = np.full((n, n), np.inf)
+    np.fill_diagonal(dist, 0)
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    dist[sources, targets] = edge_weights
+
+    iter = _NumpyMatrixTrace(dist, graph.labels) if trace else None
+
+    # dist[:, k] and dist[k, :] are read into the sum before the in-place
+    # minimum writes back, so each step sees the iteration k-1 values.
+    for k in range(n):
+        through_k = dist[:, k, None] + dist[None, k, :]
+        if iter is not None:
+            rows, cols = np.nonzero(through_k < dist)
+            iter.record((rows, cols, through_k[rows, cols]))
+        np.minimum(dist, through_k, out=dist)
+
+    return DistanceMatrix(dist, graph.labels), iter
+
+
+class _MatrixTrace(IterationTrace):
+    # Base is a dict-of-dicts; each delta maps (u, v) -> new distance.
+    def _copy(self, snapshot):
+        return {u: dict(row) for u, row in snapshot.items()}
+
+    def _apply(self, snapshot, delta):
+        for (u, v), d in delta.items():
+            snapshot[u][v] = d
+
+
+class _NumpyMatrixTrace(IterationTrace):
+    # Base is a dense matrix; each delta is (rows, cols, values) arrays.
+    def __init__(self, base, labels):
+        super().__init__(base)
+        self.labels = labels
+
+    def _copy(self, snapshot):
+        return snapshot.copy()
+
+    def _apply(self, snapshot, delta):
+        rows, cols, values = delta
+        snapshot[rows, cols] = values
+
+    def _view(self, snapshot):
+        return DistanceMatrix(snapshot, self.labels)
+
+
+class DistanceMatrix(Mapping):
+    """Read-only dist[u][v] view over a dense matrix, keyed by vertex labels."""
+
+    def __init__(self, matrix, labels):
+        self.matrix = matrix
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+
+    def __getitem__(self, u):
+        return _DistanceRow(self.matrix[self.index[u]], self.index)
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class _DistanceRow(Mapping):
+    def __init__(self, row, index):
+        self.row = row
+        self.index = index
+
+    def __getitem__(self, v):
+        return float(self.row[self.index[v]])
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+
 def test_simple_weighted_path():
     # Linear chain: A -> B -> C, shortest path A -> C is 3.
     graph = {
@@ -126,8 +285,87 @@ def test_disconnected_graph():
     assert dist["C"]["A"] == float("inf")
 
 
+def test_csr_graph_matches_dict():
+    # The CSR path must return the same labelled distances as the dict path.
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B"],
+        "D": [],
+    }
+    weights = {
+        ("A", "B"): 4,
+        ("A", "C"): 1,
+        ("C", "B"): -2,
+        ("B", "D"): 1,
+    }
+    csr = CSRGraph.from_adjacency(graph, weights)
+
+    dist, _ = floyd_warshall(csr)
+
+    assert dist == floyd_warshall(graph, weights)[0]
+
+
+def test_numpy_engine_matches_loops():
+    # The broadcast engine must agree with the triple loop on every pair.
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return  # optional dependency
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B"],
+        "D": ["A"],
+        "E": [],
+    }
+    weights = {
+        ("A", "B"): 4,
+        ("A", "C"): 1,
+        ("C", "B"): -2,
+        ("B", "D"): 1,
+        ("D", "A"): 3,
+    }
+
+    dist, itr = floyd_warshall(graph, weights, method="numpy")
+    expected, expected_itr = floyd_warshall(graph, weights)
+
+    assert itr is None
+    assert floyd_warshall(graph, weights, method="numpy", trace=True)[1][-1] == expected_itr[-1]
+    assert dist["A"]["D"] == 0
+    assert dist["E"]["A"] == float("inf")
+    assert dist == expected
+    assert floyd_warshall(CSRGraph.from_adjacency(graph, weights), method="numpy")[0] == expected
+
+
+def test_iter_table():
+    # Only the entries changed by each k step are stored, yet every
+    # iteration can still be read back as a full table.
+    graph = {
+        "A": ["B"],
+        "B": ["C"],
+        "C": [],
+    }
+    weights = {
+        ("A", "B"): 1,
+        ("B", "C"): 2,
+    }
+    csr = CSRGraph.from_adjacency(graph, weights)
+
+    _, itr = floyd_warshall(csr)
+
+    assert len(itr) == 4
+    assert itr[0]["A"]["C"] == float("inf")
+    assert itr[2]["A"]["C"] == 3                       # k = B
+    assert itr.deltas == [{}, {("A", "C"): 3}, {}]
+    assert floyd_warshall(graph, weights, trace=False)[1] is None
+
+
 if __name__ == "__main__":
     test_simple_weighted_path()
     test_negative_edge_weight()
     test_disconnected_graph()
+    test_csr_graph_matches_dict()
+    test_iter_table()
+    test_numpy_engine_matches_loops()
     print("All tests passed.")
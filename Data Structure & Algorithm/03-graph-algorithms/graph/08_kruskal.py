@@ -22,41 +22,35 @@ Runtime
 - Union-Find operations: O(m · α(n)) ≈ O(m),  α is the inverse Ackermann function
 - Overall:              O(m log n)
 """
+import importlib.util, pathlib
 
-class UnionFind:
-    def __init__(self, size):
-        self.root = [i for i in range(size)]
-        self.rank = [0] * size
-    
-    def find(self, x):
-        if self.root[x] != x:
-            self.root[x] = self.find(self.root[x]) # Path compression
-        return self.root[x]
-    
-    def union(self, x, y):
-        rootx = self.find(x)
-        rooty = self.find(y)
-        if rootx != rooty:
-            if self.rank[rootx] < self.rank[rooty]:
-                self.root[rootx] = rooty
-            elif self.rank[rootx] > self.rank[rooty]:
-                self.root[rooty] = rootx
-            else:
-                self.root[rooty] = rootx
-                self.rank[rootx] += 1
-    
-    def connected(self, x, y):
-        return self.find(x) == self.find(y)
-
-
-def kruskal(graph, weights):
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+
+_uf_path = pathlib.Path(__file__).parent / "27_union_find.py"
+_uf_spec = importlib.util.spec_from_file_location("union_find", _uf_path)
+_uf_mod = importlib.util.module_from_spec(_uf_spec)
+_uf_spec.loader.exec_module(_uf_mod)
+UnionFind = _uf_mod.UnionFind
+
+
+def kruskal(graph, weights=None):
     # Input:
-    # - graph: a simple, connected, undirected graph in adjacency list format
+    # - graph: a simple, connected, undirected graph in adjacency list format,
+    #   or a CSRGraph (built with symmetric=True)
     # - weights: edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
     #
     # Output:
     # - edges: a list of n - 1 edges that represent a minimum spanning tree
     #   for the input graph
+    if is_csr_graph(graph):
+        return _kruskal_csr(graph)
+
     # Collect all unique edges as (weight, u, v); skip duplicates for undirected graph
     all_edges = []
     for u, neighbors in graph.items():
@@ -66,12 +60,11 @@ def kruskal(graph, weights):
     all_edges.sort()
 
     n = len(graph)
-    uf = UnionFind(n)
+    uf = UnionFind(graph)
     mst = []
 
     for w, u, v in all_edges:
-        if not uf.connected(u, v):
-            uf.union(u, v)
+        if uf.union(u, v):
             mst.append((u, v))
             if len(mst) == n - 1:
                 break
@@ -79,6 +72,31 @@ def kruskal(graph, weights):
     return mst
 
 
+def _kruskal_csr(graph):
+    # Same algorithm on integer vertex ids; each undirected edge is taken once
+    # from its lower-numbered endpoint.
+    targets, weights = graph.targets, graph.weights
+    all_edges = []
+    for u in range(graph.n):
+        for e in graph.edge_range(u):
+            v = targets[e]
+            if u < v:
+                all_edges.append((weights[e], u, v))
+    all_edges.sort()
+
+    n = graph.n
+    uf = UnionFind(n)
+    mst = []
+
+    for w, u, v in all_edges:
+        if uf.union(u, v):
+            mst.append((graph.labels[u], graph.labels[v]))
+            if len(mst) == n - 1:
+                break
+
+    return mst
+
+
 if __name__ == "__main__":
     # Test 1: Simple triangle — one edge is heavier and should be excluded
     #
@@ -121,3 +139,15 @@ if __name__ == "__main__":
     mst3 = kruskal(graph3, weights3)
     assert sorted(mst3) == [(0, 1), (0, 2), (1, 3)], f"Test 3 failed: {mst3}"
     print("Test 3 passed:", mst3)
+
+    # Test 4: The dense graph from Test 3 in CSR form gives the same MST.
+    mst4 = kruskal(CSRGraph.from_adjacency(graph3, weights3, symmetric=True))
+    assert sorted(mst4) == sorted(mst3), f"Test 4 failed: {mst4}"
+    print("Test 4 passed:", mst4)
+
+    # Test 5: String labels work directly with the label-mapping UnionFind.
+    graph5 = {"A": ["B", "C"], "B": ["A", "C"], "C": ["A", "B"]}
+    weights5 = {("A", "B"): 1, ("A", "C"): 4, ("B", "C"): 2}
+    mst5 = kruskal(graph5, weights5)
+    assert sorted(mst5) == [("A", "B"), ("B", "C")], f"Test 5 failed: {mst5}"
+    print("Test 5 passed:", mst5)
@@ -25,15 +25,29 @@ Runtime
 """
 
 import heapq
+import importlib.util, pathlib
 
-def prim(graph, weights):
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+
+
+def prim(graph, weights=None):
     # Input:
-    # - graph: a simple, connected, undirected graph in adjacency list format
+    # - graph: a simple, connected, undirected graph in adjacency list format,
+    #   or a CSRGraph (built with symmetric=True)
     # - weights: a dict mapping (u, v) with u < v to edge weight
+    #   Not needed for a CSRGraph, which carries its own edge weights.
     #
     # Output:
     # - prev: parent of each vertex in the minimum spanning tree
     #   The starting vertex is chosen arbitrarily and has parent None.
+    if is_csr_graph(graph):
+        return _prim_csr(graph)
+
     start = next(iter(graph))
     visited = {start}
     prev = {start: None}
@@ -58,6 +72,32 @@ def prim(graph, weights):
     return prev
 
 
+def _prim_csr(graph):
+    # Same algorithm on integer vertex ids; the weight of each edge is read
+    # by edge id, so no (u, v) key normalisation is needed.
+    targets, weights = graph.targets, graph.weights
+    visited = [False] * graph.n
+    visited[0] = True
+    prev = {graph.labels[0]: None}
+
+    heap = []
+    for e in graph.edge_range(0):
+        heapq.heappush(heap, (weights[e], targets[e], 0))
+
+    while heap:
+        w, v, u = heapq.heappop(heap)
+        if visited[v]:
+            continue
+        visited[v] = True
+        prev[graph.labels[v]] = graph.labels[u]
+        for e in graph.edge_range(v):
+            neighbor = targets[e]
+            if not visited[neighbor]:
+                heapq.heappush(heap, (weights[e], neighbor, v))
+
+    return prev
+
+
 if __name__ == "__main__":
     # Test 1: Simple triangle
     #
@@ -94,3 +134,8 @@ if __name__ == "__main__":
     prev3 = prim(graph3, weights3)
     assert prev3 == {0: None, 1: 0, 3: 1, 2: 0}, f"Test 3 failed: {prev3}"
     print("Test 3 passed:", prev3)
+
+    # Test 4: The dense graph from Test 3 in CSR form gives the same tree.
+    prev4 = prim(CSRGraph.from_adjacency(graph3, weights3, symmetric=True))
+    assert prev4 == prev3, f"Test 4 failed: {prev4}"
+    print("Test 4 passed:", prev4)
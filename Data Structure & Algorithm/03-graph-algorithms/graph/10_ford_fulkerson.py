@@ -16,6 +16,13 @@ Algorithm
   reachable from s. The cut consists of all original edges crossing from S to V\S;
   by the Max-Flow Min-Cut theorem, this cut's capacity equals the maximum flow.
 
+Capacity scaling (method="scaling"):
+- Start with Δ = the largest power of two not above the largest capacity
+- In each phase, only augment along paths whose edges all have residual
+  capacity >= Δ; when none is left, halve Δ
+- After the Δ = 1 phase, finish with plain BFS augmentation (this only finds
+  anything when some capacities are fractional)
+
 Correctness
 =====================
 Correctness follows from the Max-Flow Min-Cut theorem: in any flow network, the value of the
@@ -30,79 +37,77 @@ with a valid maximum flow because:
 Runtime
 =====================
 O(m * C), where the C is the value of the maximum flow from the starting vertex to the terminating vertex.
+With capacity scaling: O(m^2 log U), where U is the largest capacity. When a phase ends, the
+residual cut left by the Δ-paths has capacity below m * Δ, so the next phase makes at most 2m
+augmentations, and there are log U phases; the count no longer depends on C.
 """
+import importlib.util, pathlib
 
+_mod_path = pathlib.Path(__file__).parent / "22_residual_network.py"
+_spec = importlib.util.spec_from_file_location("residual_network", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+ResidualNetwork = _mod.ResidualNetwork
+CSRGraph = _mod.CSRGraph
 
-def ford_fulkerson(graph, capacities, source, sink):
+def ford_fulkerson(graph, capacities, source, sink, method="bfs", stats=None):
     # Input:
-    # - graph: a simple, connected, directed graph in adjacency list format
+    # - graph: a simple, connected, directed graph in adjacency list format,
+    #   or a CSRGraph whose edge weights are the capacities
     # - capacities: dict mapping (u, v) -> capacity for each edge
+    #   Pass None for a CSRGraph.
     # - source: source vertex
     # - sink: sink vertex
+    # - method: "bfs" (any augmenting path) or "scaling" (capacity scaling)
+    # - stats: optional dict; filled with "augmentations" (number of paths
+    #   augmented) and "phases" (number of Δ values tried; 1 for "bfs")
     #
     # Output:
     # - flow: dict mapping (u, v) -> flow on each original edge
     # - C: the value of the maximum flow from source to sink
 
-    # Build residual graph: residual[u][v] = remaining capacity
-    vertices = set(graph.keys())
-    for neighbors in graph.values():
-        vertices.update(neighbors)
-
-    residual = {v: {} for v in vertices}
-    for (u, v), cap in capacities.items():
-        residual[u][v] = residual[u].get(v, 0) + cap
-        if v not in residual:
-            residual[v] = {}
-        if u not in residual[v]:
-            residual[v][u] = 0
-
-    def bfs_find_path():
-        """Return parent dict representing an augmenting path, or None if none exists."""
-        visited = {source}
-        parent = {source: None}
-        queue = [source]
-        while queue:
-            u = queue.pop(0)
-            for v, cap in residual[u].items():
-                if v not in visited and cap > 0:
-                    visited.add(v)
-                    parent[v] = u
-                    if v == sink:
-                        return parent
-                    queue.append(v)
-        return None
-
+    # Residual graph in flat lists: edge e and its reverse e ^ 1 are paired,
+    # so the backward edge of every original edge exists from the start.
+    residual = ResidualNetwork(graph, capacities)
+    s, t = residual.index[source], residual.index[sink]
+    if method == "bfs":
+        C, augmentations = _augment_until_max(residual, s, t)
+        phases = 1
+    elif method == "scaling":
+        C, augmentations, phases = 0, 0, 0
+        delta = 1 << max(int(max(residual.original, default=0)).bit_length() - 1, 0)
+        # The last phase (minimum 0) picks up fractional leftovers.
+        for minimum in [delta >> k for k in range(delta.bit_length())] + [0]:
+            pushed, count = _augment_until_max(residual, s, t, minimum)
+            C += pushed
+            augmentations += count
+            phases += 1
+    else:
+        raise ValueError(f"unknown method: {method!r}")
+    if stats is not None:
+        stats["augmentations"] = augmentations
+        stats["phases"] = phases
+
+    # Flow on each original edge = capacity - remaining residual capacity
+    return residual.flow(), C
+
+
+def _augment_until_max(residual, source, sink, minimum=0):
+    """Augment along BFS paths whose residual capacities are all >= minimum
+    until none is left; return the total flow pushed and the number of paths."""
     C = 0
+    augmentations = 0
     while True:
-        parent = bfs_find_path()
-        if parent is None:
+        path = residual.find_path(source, sink, minimum)
+        if path is None:
             break
 
-        # Find bottleneck along the augmenting path
-        bottleneck = float('inf')
-        v = sink
-        while v != source:
-            u = parent[v]
-            bottleneck = min(bottleneck, residual[u][v])
-            v = u
-
-        # Update residual capacities
-        v = sink
-        while v != source:
-            u = parent[v]
-            residual[u][v] -= bottleneck
-            residual[v][u] = residual[v].get(u, 0) + bottleneck
-            v = u
-
-        C += bottleneck
+        # Push the bottleneck along the path: each forward edge loses it and
+        # each paired backward edge gains it
+        C += residual.augment(path)
+        augmentations += 1
 
-    # Recover per-edge flow from residual graph (flow on edge = capacity - remaining residual)
-    flow = {}
-    for (u, v), cap in capacities.items():
-        flow[(u, v)] = cap - residual[u].get(v, 0)
-
-    return flow, C
+    return C, augmentations
 
 
 # ---------------------------------------------------------------------------
@@ -172,8 +177,56 @@ def test_backward_edge_needed():
     print("test_backward_edge_needed passed")
 
 
+def test_csr_graph_matches_dict():
+    """A CSRGraph carrying the capacities gives the same flow as the dict input."""
+    graph = {'s': ['a', 'b'], 'a': ['b', 't'], 'b': ['c'], 'c': ['t'], 't': []}
+    capacities = {('s', 'a'): 3, ('s', 'b'): 3, ('a', 'b'): 3,
+                  ('a', 't'): 3, ('b', 'c'): 3, ('c', 't'): 3}
+    csr = CSRGraph.from_adjacency(graph, capacities)
+    flow, C = ford_fulkerson(csr, None, 's', 't')
+    assert (flow, C) == ford_fulkerson(graph, capacities, 's', 't')
+    print("test_csr_graph_matches_dict passed")
+
+
+def test_capacity_scaling():
+    """Capacity scaling finds the same flow value, including fractional capacities."""
+    import random
+    rng = random.Random(7)
+    for trial in range(10):
+        graph = {v: [] for v in range(15)}
+        capacities = {}
+        for u in range(15):
+            for v in range(15):
+                if u != v and rng.random() < 0.25:
+                    graph[u].append(v)
+                    capacities[(u, v)] = rng.randint(1, 10 ** 9) if trial % 2 else rng.random() * 50
+        _, expected = ford_fulkerson(graph, capacities, 0, 14)
+        stats = {}
+        flow, C = ford_fulkerson(graph, capacities, 0, 14, method="scaling", stats=stats)
+        assert abs(C - expected) <= 1e-9 * max(1, expected), (trial, C, expected)
+        assert all(0 <= flow[e] <= capacities[e] + 1e-9 for e in capacities)
+        assert stats["augmentations"] >= 1 and stats["phases"] >= 2
+    stats = {}
+    ford_fulkerson({'s': ['t'], 't': []}, {('s', 't'): 8}, 's', 't', method="scaling", stats=stats)
+    assert stats == {"augmentations": 1, "phases": 5}  # Δ = 8, 4, 2, 1, then 0
+    print("test_capacity_scaling passed")
+
+
+def test_source_is_sink():
+    """With source == sink there is nothing to push: zero flow on every edge."""
+    graph = {'s': ['a'], 'a': ['s'], 't': []}
+    capacities = {('s', 'a'): 4, ('a', 's'): 2}
+    for method in ("bfs", "scaling"):
+        flow, C = ford_fulkerson(graph, capacities, 's', 's', method=method)
+        assert C == 0 and flow == {('s', 'a'): 0, ('a', 's'): 0}
+    print("test_source_is_sink passed")
+
+
 if __name__ == "__main__":
     test_simple_two_paths()
     test_bottleneck_edge()
     test_backward_edge_needed()
+    test_csr_graph_matches_dict()
+    test_capacity_scaling()
+    test_source_is_sink()
     print("All tests passed.")
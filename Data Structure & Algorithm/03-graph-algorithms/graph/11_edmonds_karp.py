@@ -13,6 +13,9 @@ Algorithm
       residual capacity by the bottleneck, and increase each reverse edge's
       residual capacity by the bottleneck
 - The sum of all bottleneck values sent is the maximum flow value
+- Minimum cut (min_cut()): the last BFS, the one that fails to reach the sink,
+  has visited exactly the source side S of a minimum cut; the cut edges are the
+  original edges from S to V - S
 
 Correctness
 =====================
@@ -32,15 +35,26 @@ O(VE^2), where V = number of vertices, E = number of edges
   shortest path length is non-decreasing and each edge can become a bottleneck
   (critical edge) at most O(V) times before the path length must increase
 - Total: O(VE) iterations × O(E) per BFS = O(VE^2)
+- min_cut() adds only an O(E) scan for the cut edges; S comes from the last BFS
 """
 
-from collections import deque
+import importlib.util, pathlib
+
+_mod_path = pathlib.Path(__file__).parent / "22_residual_network.py"
+_spec = importlib.util.spec_from_file_location("residual_network", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+ResidualNetwork = _mod.ResidualNetwork
+CSRGraph = _mod.CSRGraph
+
 
 def edmonds_karp(graph, capacities, source, sink):
     # Input:
     # - graph: a simple, connected, directed graph in adjacency list format
-    #          {vertex: [neighbor, ...]}
+    #          {vertex: [neighbor, ...]}, or a CSRGraph whose edge weights
+    #          are the capacities
     # - capacities: dict of (u, v) -> positive integer capacity
+    #   Pass None for a CSRGraph.
     # - source: source vertex
     # - sink: sink vertex
     #
@@ -48,50 +62,47 @@ def edmonds_karp(graph, capacities, source, sink):
     # - flow: dict of (u, v) -> flow used on each original edge
     # - C: the value of the maximum flow from source to sink
 
-    # Residual adjacency list: {u: {v: residual_capacity}}
-    # Forward edges get the original capacity; backward edges start at 0
-    residual = {}
-    for (u, v), cap in capacities.items():
-        residual.setdefault(u, {})[v] = cap
-        residual.setdefault(v, {}).setdefault(u, 0)
+    # Residual network: each original edge e is paired with its backward
+    # edge e ^ 1, which starts at capacity 0
+    residual = ResidualNetwork(graph, capacities)
+
+    C = _augment_until_max(residual, residual.index[source], residual.index[sink])
+
+    # Flow on each original edge = original capacity minus remaining residual
+    return residual.flow(), C
+
 
+def min_cut(graph, capacities, source, sink):
+    # Input: the same as edmonds_karp()
+    #
+    # Output:
+    # - source_side: set of vertices on the source side of a minimum cut
+    # - cut_edges: list of edges (u, v) from the source side to the rest;
+    #   their capacities add up to C
+    # - C: the value of the maximum flow, equal to the capacity of the cut
+    #   Raises ValueError if source == sink, since no cut separates them.
+    if source == sink:
+        raise ValueError("source and sink must differ for a minimum cut")
+    residual = ResidualNetwork(graph, capacities)
+    C = _augment_until_max(residual, residual.index[source], residual.index[sink])
+    source_side, cut_edges = residual.min_cut()
+    return source_side, cut_edges, C
+
+
+def _augment_until_max(residual, source, sink):
+    """Augment along shortest (BFS) paths until none is left; return the total flow."""
     C = 0
 
     while True:
         # BFS: find the shortest augmenting path from source to sink
-        parent = {source: None}
-        queue = deque([source])
-        while queue and sink not in parent:
-            u = queue.popleft()
-            for v, cap in residual.get(u, {}).items():
-                if v not in parent and cap > 0:
-                    parent[v] = u
-                    queue.append(v)
-
-        if sink not in parent:
+        path = residual.find_path(source, sink)
+        if path is None:
             break
 
-        # Find the bottleneck (minimum residual capacity along the path)
-        bottleneck = float('inf')
-        v = sink
-        while v != source:
-            u = parent[v]
-            bottleneck = min(bottleneck, residual[u][v])
-            v = u
+        # Find the bottleneck and update the paired residual edges along the path
+        C += residual.augment(path)
 
-        # Update residual graph along the path
-        v = sink
-        while v != source:
-            u = parent[v]
-            residual[u][v] -= bottleneck
-            residual[v][u] = residual[v].get(u, 0) + bottleneck
-            v = u
-
-        C += bottleneck
-
-    # Flow on each original edge = original capacity minus remaining residual
-    flow = {(u, v): cap - residual[u][v] for (u, v), cap in capacities.items()}
-    return flow, C
+    return C
 
 
 def test_two_parallel_paths():
@@ -138,8 +149,47 @@ def test_multi_path_with_shared_edges():
     print("test_multi_path_with_shared_edges passed")
 
 
+def test_csr_graph_matches_dict():
+    """A CSRGraph carrying the capacities gives the same flow as the dict input."""
+    graph = {0: [1, 2], 1: [2, 3], 2: [3], 3: []}
+    caps = {(0, 1): 3, (0, 2): 2, (1, 2): 1, (1, 3): 2, (2, 3): 3}
+    csr = CSRGraph.from_adjacency(graph, caps)
+    flow, C = edmonds_karp(csr, None, source=0, sink=3)
+    assert (flow, C) == edmonds_karp(graph, caps, source=0, sink=3)
+    print("test_csr_graph_matches_dict passed")
+
+
+def test_min_cut():
+    """The cut from the final residual separates source and sink at capacity C."""
+    graph = {0: [1, 2], 1: [2, 3], 2: [3], 3: []}
+    caps = {(0, 1): 3, (0, 2): 2, (1, 2): 1, (1, 3): 2, (2, 3): 3}
+    source_side, cut_edges, C = min_cut(graph, caps, source=0, sink=3)
+    assert C == 5 and 0 in source_side and 3 not in source_side
+    assert sum(caps[e] for e in cut_edges) == C
+    assert all((u in source_side) != (v in source_side) for u, v in cut_edges)
+    try:
+        min_cut(graph, caps, source=0, sink=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    print("test_min_cut passed")
+
+
+def test_source_is_sink():
+    """With source == sink there is nothing to push: zero flow on every edge."""
+    graph = {0: [1], 1: [0]}
+    caps = {(0, 1): 5, (1, 0): 5}
+    flow, C = edmonds_karp(graph, caps, source=0, sink=0)
+    assert C == 0 and flow == {(0, 1): 0, (1, 0): 0}
+    print("test_source_is_sink passed")
+
+
 if __name__ == "__main__":
     test_two_parallel_paths()
     test_bottleneck_edge()
     test_multi_path_with_shared_edges()
+    test_csr_graph_matches_dict()
+    test_min_cut()
+    test_source_is_sink()
     print("All tests passed.")
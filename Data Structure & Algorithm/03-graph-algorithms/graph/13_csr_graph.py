@@ -0,0 +1,199 @@
+"""
+Representation
+=====================
+Compressed sparse row (CSR) stores a graph in three flat arrays instead of a
+dict of lists plus a dict of (u, v) weights:
+- Relabel every vertex to an integer 0..n-1; labels[i] is the original vertex
+  and index[label] maps it back
+- offsets: length n + 1; the outgoing edges of vertex i are the edge ids
+  offsets[i] .. offsets[i + 1] - 1
+- targets: length E; targets[e] is the head of edge e
+- weights: length E (optional); weights[e] is the weight of edge e
+
+Vertices are numbered in the order the adjacency dict lists them (keys first,
+then vertices that only appear as neighbors), and each vertex keeps its
+neighbor order, so algorithms visit vertices in the same order on both formats.
+
+
+Correctness
+=====================
+Edges are laid out grouped by tail vertex, so the slice
+targets[offsets[i]:offsets[i + 1]] is exactly the neighbor list of i, and
+weights[e] belongs to the same edge as targets[e]. from_adjacency() followed
+by to_adjacency() reproduces the original graph and weights.
+
+
+Runtime
+=====================
+Building the CSR graph takes O(V + E) once. Afterwards each edge costs one
+8-byte target and one 8-byte weight (instead of a list slot plus a tuple key
+and a dict entry), and looking up the weight of an edge is an array index
+instead of a tuple hash.
+"""
+from array import array
+
+# Sentinel stored in integer parent arrays for "no vertex".
+NO_VERTEX = -1
+
+
+class CSRGraph:
+    def __init__(self, labels, offsets, targets, weights=None):
+        # - labels: list of original vertex labels, labels[i] is vertex i
+        # - offsets, targets, weights: the CSR arrays described above
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.offsets = array('q', offsets)
+        self.targets = array('q', targets)
+        self.weights = None if weights is None else array('d', weights)
+        self.n = len(self.labels)
+
+    @classmethod
+    def from_adjacency(cls, graph, weights=None, symmetric=False):
+        # Input:
+        # - graph: a simple graph in adjacency list format
+        # - weights: optional edge weights keyed by (u, v)
+        # - symmetric: when True, a missing (u, v) weight falls back to
+        #   (v, u), matching the undirected convention of kruskal and prim
+        #   where only one orientation of each edge is stored
+        #
+        # Output:
+        # - a CSRGraph with the same vertices, edges and weights
+        labels = list(graph)
+        seen = set(labels)
+        for neighbors in graph.values():
+            for v in neighbors:
+                if v not in seen:
+                    seen.add(v)
+                    labels.append(v)
+        index = {label: i for i, label in enumerate(labels)}
+
+        offsets = array('q', [0])
+        targets = array('q')
+        edge_weights = None if weights is None else array('d')
+        for u in labels:
+            for v in graph.get(u, []):
+                targets.append(index[v])
+                if weights is not None:
+                    if symmetric and (u, v) not in weights:
+                        edge_weights.append(weights[(v, u)])
+                    else:
+                        edge_weights.append(weights[(u, v)])
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, edge_weights)
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, label):
+        return label in self.index
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def edge_range(self, u):
+        """Return the ids of the edges leaving vertex index u."""
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def neighbors(self, u):
+        """Return the vertex indices adjacent to vertex index u."""
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def label(self, i):
+        """Return the original label of vertex index i, or None for NO_VERTEX."""
+        return None if i == NO_VERTEX else self.labels[i]
+
+    def reverse(self):
+        """Return the CSR graph with every edge (and its weight) reversed."""
+        counts = [0] * (self.n + 1)
+        for v in self.targets:
+            counts[v + 1] += 1
+        for i in range(self.n):
+            counts[i + 1] += counts[i]
+        offsets = array('q', counts)
+        fill = counts[:-1]
+        targets = array('q', bytes(8 * self.num_edges))
+        weights = None if self.weights is None else array('d', bytes(8 * self.num_edges))
+        for u in range(self.n):
+            for e in self.edge_range(u):
+                v = self.targets[e]
+                targets[fill[v]] = u
+                if weights is not None:
+                    weights[fill[v]] = self.weights[e]
+                fill[v] += 1
+        return CSRGraph(self.labels, offsets, targets, weights)
+
+    def to_adjacency(self):
+        """Return (graph, weights) in the dict format used by the other modules."""
+        graph = {}
+        weights = None if self.weights is None else {}
+        for u, label in enumerate(self.labels):
+            graph[label] = [self.labels[v] for v in self.neighbors(u)]
+            if weights is not None:
+                for e in self.edge_range(u):
+                    weights[(label, self.labels[self.targets[e]])] = self.weights[e]
+        return graph, weights
+
+    def as_numpy(self):
+        """Return (offsets, targets, weights) as zero-copy NumPy views."""
+        import numpy as np
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        targets = np.frombuffer(self.targets, dtype=np.int64)
+        weights = None if self.weights is None else np.frombuffer(self.weights, dtype=np.float64)
+        return offsets, targets, weights
+
+
+def is_csr_graph(graph):
+    """Return True if graph is a CSRGraph.
+
+    Checked structurally so that graphs built from a separately loaded copy
+    of this module (every sibling loads it with importlib) are recognized.
+    """
+    return hasattr(graph, "offsets") and hasattr(graph, "targets") and hasattr(graph, "labels")
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def test_from_adjacency_layout():
+    # Vertex "D" only appears as a neighbor, so it is numbered last.
+    graph = {"A": ["B", "C"], "B": ["D"], "C": []}
+    weights = {("A", "B"): 1, ("A", "C"): 4, ("B", "D"): 2}
+    csr = CSRGraph.from_adjacency(graph, weights)
+    assert csr.labels == ["A", "B", "C", "D"]
+    assert list(csr.offsets) == [0, 2, 3, 3, 3]
+    assert list(csr.targets) == [1, 2, 3]
+    assert list(csr.weights) == [1.0, 4.0, 2.0]
+    assert list(csr.neighbors(csr.index["A"])) == [1, 2]
+
+
+def test_round_trip():
+    graph = {0: [1, 2], 1: [2], 2: [0]}
+    weights = {(0, 1): 3, (0, 2): 5, (1, 2): -1, (2, 0): 7}
+    graph2, weights2 = CSRGraph.from_adjacency(graph, weights).to_adjacency()
+    assert graph2 == graph
+    assert weights2 == weights
+
+
+def test_reverse():
+    graph = {"A": ["B", "C"], "B": ["C"], "C": []}
+    weights = {("A", "B"): 1, ("A", "C"): 2, ("B", "C"): 3}
+    graphr, weightsr = CSRGraph.from_adjacency(graph, weights).reverse().to_adjacency()
+    assert graphr == {"A": [], "B": ["A"], "C": ["A", "B"]}
+    assert weightsr == {("B", "A"): 1, ("C", "A"): 2, ("C", "B"): 3}
+
+
+def test_symmetric_weights():
+    # Undirected weights are stored once with u < v, as kruskal and prim expect.
+    graph = {0: [1], 1: [0]}
+    csr = CSRGraph.from_adjacency(graph, {(0, 1): 9}, symmetric=True)
+    assert list(csr.weights) == [9.0, 9.0]
+
+
+if __name__ == "__main__":
+    test_from_adjacency_layout()
+    test_round_trip()
+    test_reverse()
+    test_symmetric_weights()
+    print("All tests passed.")
@@ -0,0 +1,304 @@
+"""
+Algorithm
+=====================
+Preprocessing (once per graph):
+- Pick k landmark vertices by farthest-first selection: start from the vertex
+  farthest from vertex 0, then repeatedly add the vertex whose distance to the
+  closest chosen landmark is largest
+- For every landmark L, run dijkstra() from L on the graph and on the reversed
+  graph, storing d(L, v) and d(v, L) for all v in flat float arrays
+
+Query (A* search from s to t):
+- Same as dijkstra(), except the heap is keyed by g(v) + h(v), where g(v) is the
+  tentative distance from s and h(v) is a lower bound on the distance from v to t:
+      h(v) = max over L of max(d(L, t) - d(L, v), d(v, L) - d(t, L))
+- Stop as soon as t is popped from the heap
+
+Correctness
+=====================
+By the triangle inequality, d(L, v) + d(v, t) >= d(L, t) and
+d(v, t) + d(t, L) >= d(v, L), so both differences are lower bounds on d(v, t).
+A maximum of lower bounds is still a lower bound, and each term changes by at most
+w(u, v) along an edge (u, v), so h is consistent. A* with a consistent heuristic is
+Dijkstra's algorithm on the reduced weights w(u, v) - h(u) + h(v) >= 0, so the first
+time t is popped its distance is final.
+
+Runtime
+=====================
+- Preprocessing: 2k + 1 runs of dijkstra(), O(k (V + E) log V), and 2k floats per vertex
+- Query: still O((V + E) log V) in the worst case, plus O(k) per heap push to evaluate h;
+  in practice the bounds steer the search toward t, so it settles only a small
+  fraction of the vertices plain dijkstra() settles
+- The index is saved to disk as raw arrays (the CSR graph and the distances),
+  so loading it is O(kV + E) with no shortest-path computations
+- Checking the query graph against the index is O(V + E), done only when the
+  graph or weights object differs from the previous query's
+"""
+import heapq
+import importlib.util, pathlib
+import pickle
+from array import array
+
+_mod_path = pathlib.Path(__file__).parent / "05_dijkstra.py"
+_spec = importlib.util.spec_from_file_location("dijkstra", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dijkstra = _mod.dijkstra
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+
+
+class LandmarkIndex:
+    def __init__(self, graph, landmarks, dist_from, dist_to):
+        # - graph: the CSRGraph the index was built for; queries are checked
+        #   against it and search it
+        # - landmarks: vertex ids of the chosen landmarks
+        # - dist_from[j][v]: d(landmarks[j], v)
+        # - dist_to[j][v]: d(v, landmarks[j])
+        self.graph = graph
+        self.labels = graph.labels
+        self.landmarks = list(landmarks)
+        self.dist_from = [array('d', d) for d in dist_from]
+        self.dist_to = [array('d', d) for d in dist_to]
+        # (graph, weights) last checked against self.graph, so repeated
+        # queries with the same objects skip the O(V + E) comparison.
+        self._checked = (graph, None)
+
+    def lower_bound(self, v, t):
+        """Return a lower bound on d(v, t) for vertex ids v and t (inf if t is unreachable)."""
+        inf = float('inf')
+        bound = 0
+        for d_from, d_to in zip(self.dist_from, self.dist_to):
+            if d_from[v] != inf:
+                # L reaches v; if L cannot reach t then neither can v.
+                bound = max(bound, d_from[t] - d_from[v])
+            if d_to[t] != inf:
+                # t reaches L; if v cannot reach L then v cannot reach t.
+                bound = max(bound, d_to[v] - d_to[t])
+        return bound
+
+    def save(self, path):
+        """Write the index to path so it can be reloaded without preprocessing."""
+        with open(path, "wb") as f:
+            pickle.dump({
+                "labels": self.labels,
+                "offsets": self.graph.offsets.tobytes(),
+                "targets": self.graph.targets.tobytes(),
+                "weights": None if self.graph.weights is None else self.graph.weights.tobytes(),
+                "landmarks": self.landmarks,
+                "dist_from": [d.tobytes() for d in self.dist_from],
+                "dist_to": [d.tobytes() for d in self.dist_to],
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        weights = data["weights"]
+        graph = CSRGraph(
+            data["labels"],
+            array('q', data["offsets"]),
+            array('q', data["targets"]),
+            None if weights is None else array('d', weights),
+        )
+        return cls(
+            graph,
+            data["landmarks"],
+            [array('d', d) for d in data["dist_from"]],
+            [array('d', d) for d in data["dist_to"]],
+        )
+
+
+def build_landmark_index(graph, k, weights=None):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a CSRGraph
+    # - k: number of landmarks
+    # - weights: non-negative edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    #
+    # Output:
+    # - index: a LandmarkIndex holding the landmarks and their distance arrays
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+    csr_reversed = csr.reverse()
+    labels = csr.labels
+    inf = float('inf')
+
+    def distances(g, v):
+        dist, _ = dijkstra(g, labels[v])
+        return array('d', (dist[label] for label in labels))
+
+    # Farthest-first: closest[v] is the distance from v's nearest landmark.
+    closest = distances(csr, 0)
+    landmarks, dist_from, dist_to = [], [], []
+    for _ in range(min(k, csr.n)):
+        candidates = [v for v in range(csr.n) if closest[v] != inf and v not in landmarks]
+        if not candidates:
+            # The rest of the graph is unreachable from the landmarks so far.
+            candidates = [v for v in range(csr.n) if v not in landmarks]
+        landmark = max(candidates, key=lambda v: closest[v] if closest[v] != inf else -1)
+        landmarks.append(landmark)
+        dist_from.append(distances(csr, landmark))
+        dist_to.append(distances(csr_reversed, landmark))
+        closest = array('d', map(min, closest, dist_from[-1])) if len(landmarks) > 1 else dist_from[-1]
+
+    index = LandmarkIndex(csr, landmarks, dist_from, dist_to)
+    index._checked = (graph, weights)
+    return index
+
+
+def landmark_astar(graph, index, start, target, weights=None, stats=None):
+    # Input:
+    # - graph: the graph the index was built from (adjacency list or CSRGraph).
+    #   It is compared with the index's graph, labels and weights included,
+    #   unless it and weights are the objects of the previous query; modify
+    #   neither in place between queries.
+    # - index: a LandmarkIndex from build_landmark_index() or LandmarkIndex.load()
+    # - start: starting vertex
+    # - target: target vertex
+    # - weights: non-negative edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - stats: optional dict; "settled" is set to the number of vertices settled
+    #
+    # Output:
+    # - distance: shortest-path distance from start to target (inf if unreachable)
+    # - path: list of vertices from start to target, or [] if unreachable
+    checked_graph, checked_weights = index._checked
+    if graph is not checked_graph or weights is not checked_weights:
+        csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+        if not _same_graph(csr, index.graph):
+            raise ValueError("index was built for a different graph")
+        index._checked = (graph, weights)
+    csr = index.graph
+    offsets, targets, edge_weights = csr.offsets, csr.targets, csr.weights
+    s, t = csr.index[start], csr.index[target]
+    inf = float('inf')
+
+    best = {s: 0}
+    parent = {s: None}
+    settled = set()
+    heap = [(index.lower_bound(s, t), s)]
+    while heap:
+        _, v = heapq.heappop(heap)
+        if v in settled:
+            continue
+        settled.add(v)
+        if v == t:
+            break
+        for e in range(offsets[v], offsets[v + 1]):
+            neighbor = targets[e]
+            new_distance = best[v] + edge_weights[e]
+            if new_distance < best.get(neighbor, inf):
+                h = index.lower_bound(neighbor, t)
+                if h == inf:
+                    continue
+                best[neighbor] = new_distance
+                parent[neighbor] = v
+                heapq.heappush(heap, (new_distance + h, neighbor))
+
+    if stats is not None:
+        stats["settled"] = len(settled)
+    if t not in settled:
+        return inf, []
+    path = []
+    v = t
+    while v is not None:
+        path.append(csr.labels[v])
+        v = parent[v]
+    path.reverse()
+    return best[t], path
+
+
+def _same_graph(a, b):
+    """Return True if CSRGraphs a and b have the same labels, edges and weights."""
+    return (a is b or a.labels == b.labels and a.offsets == b.offsets
+            and a.targets == b.targets and a.weights == b.weights)
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def _grid(width, height):
+    # Directed grid with edges in both directions and weights 1 or 2.
+    graph, weights = {}, {}
+    for x in range(width):
+        for y in range(height):
+            graph[(x, y)] = []
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                u = (x + dx, y + dy)
+                if 0 <= u[0] < width and 0 <= u[1] < height:
+                    graph[(x, y)].append(u)
+                    weights[((x, y), u)] = 1 + (x * 7 + y * 3) % 2
+    return graph, weights
+
+
+def test_matches_dijkstra():
+    graph, weights = _grid(12, 12)
+    index = build_landmark_index(graph, 4, weights)
+    dist, _ = dijkstra(graph, (0, 0), weights)
+    for target in [(11, 11), (5, 7), (0, 0), (11, 0)]:
+        distance, path = landmark_astar(graph, index, (0, 0), target, weights)
+        assert distance == dist[target]
+        assert path[0] == (0, 0) and path[-1] == target
+        assert sum(weights[(u, v)] for u, v in zip(path, path[1:])) == distance
+
+
+def test_settles_fewer_vertices():
+    # The lower bounds steer the search; plain dijkstra settles far more.
+    graph, weights = _grid(20, 20)
+    index = build_landmark_index(graph, 4, weights)
+    stats = {}
+    landmark_astar(graph, index, (0, 10), (19, 10), weights, stats=stats)
+    _, full_prev = dijkstra(graph, (0, 10), weights, target=(19, 10))
+    assert stats["settled"] < len(full_prev)
+
+
+def test_unreachable_target():
+    graph = {"A": ["B"], "B": [], "C": ["A"]}
+    weights = {("A", "B"): 1, ("C", "A"): 2}
+    index = build_landmark_index(graph, 2, weights)
+    assert landmark_astar(graph, index, "A", "C", weights) == (float("inf"), [])
+    assert landmark_astar(graph, index, "C", "B", weights) == (3, ["C", "A", "B"])
+
+
+def test_save_and_load():
+    import os, tempfile
+    graph, weights = _grid(6, 6)
+    csr = CSRGraph.from_adjacency(graph, weights)
+    index = build_landmark_index(csr, 3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "landmarks.idx")
+        index.save(path)
+        loaded = LandmarkIndex.load(path)
+    assert loaded.landmarks == index.landmarks
+    assert loaded.dist_from == index.dist_from and loaded.dist_to == index.dist_to
+    assert landmark_astar(csr, loaded, (0, 0), (5, 5)) == landmark_astar(csr, index, (0, 0), (5, 5))
+    assert landmark_astar(graph, loaded, (0, 0), (5, 5), weights) == landmark_astar(csr, index, (0, 0), (5, 5))
+
+
+def test_rejects_a_different_graph():
+    # Same adjacency with every weight scaled, or with the weights swapped
+    # (same vertex and edge counts); both must be rejected.
+    graph, weights = _grid(6, 6)
+    index = build_landmark_index(graph, 3, weights)
+    heavier = {e: 5 * w for e, w in weights.items()}
+    shifted = {(u, v): 3 - w for (u, v), w in weights.items()}
+    for query_weights in (heavier, shifted):
+        try:
+            landmark_astar(graph, index, (0, 0), (0, 2), query_weights)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+    assert landmark_astar(graph, index, (0, 0), (5, 5), dict(weights))[0] == \
+        dijkstra(graph, (0, 0), weights)[0][(5, 5)]
+
+
+if __name__ == "__main__":
+    test_matches_dijkstra()
+    test_settles_fewer_vertices()
+    test_unreachable_target()
+    test_save_and_load()
+    test_rejects_a_different_graph()
+    print("All tests passed.")
@@ -0,0 +1,348 @@
+"""
+Algorithm
+=====================
+Preprocessing (once per graph):
+- Order the vertices by importance with a lazily updated min-heap keyed by
+  edge difference (shortcuts added - edges removed) + contracted neighbors
+- Contract vertices in that order. Contracting v removes it from the remaining
+  graph; for each pair of remaining edges u -> v -> w, run a bounded witness
+  search from u that avoids v, and add a shortcut u -> w with weight
+  w(u, v) + w(v, w) (remembering v as its middle vertex) only if no path of at
+  most that length is found
+- The edges of v to its remaining (higher-ranked) neighbors form the upward
+  graph (out-edges) and the downward graph (in-edges, stored reversed)
+
+Query from s to t:
+- Run dijkstra() forward from s on the upward graph and backward from t on the
+  downward graph, alternating by the smaller heap top
+- mu = min over vertices v settled by one side and labelled by the other of
+  d_forward(v) + d_backward(v); a side stops once its heap top reaches mu
+- Unpack every shortcut on the resulting path into its two halves recursively
+
+Correctness
+=====================
+A shortcut is added whenever contracting v could destroy a shortest path, so after
+each contraction the distances between the remaining vertices are unchanged. Hence
+for every pair s, t some shortest path (with shortcuts) first only climbs in rank
+and then only descends: take any shortest path in the original graph and repeatedly
+replace its lowest-ranked interior vertex by the shortcut (or a witness path) that
+was considered when it was contracted. The forward search finds the climbing part
+and the backward search the descending part, meeting at the highest-ranked vertex.
+
+Runtime
+=====================
+- Preprocessing: one bounded witness search per in/out edge pair of each contracted
+  vertex; cheap on road-like graphs, where few shortcuts are needed
+- Query: two Dijkstra searches restricted to the upward and downward graphs, which
+  on road-like graphs settle only a few hundred vertices regardless of V
+- The index is written to disk as flat arrays (offsets, targets, weights, middles
+  for each search graph), so loading it needs no preprocessing
+"""
+import heapq
+import importlib.util, pathlib
+import pickle
+from array import array
+
+_mod_path = pathlib.Path(__file__).parent / "05_dijkstra.py"
+_spec = importlib.util.spec_from_file_location("dijkstra", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dijkstra = _mod.dijkstra
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+NO_VERTEX = _mod.NO_VERTEX
+
+
+class ContractionHierarchy:
+    def __init__(self, labels, rank, up, down):
+        # - labels: original vertex labels, labels[i] is vertex i
+        # - rank: rank[v] is the position of v in the contraction order
+        # - up: (offsets, targets, weights, middles) of the upward graph,
+        #   edges v -> u with rank[u] > rank[v]
+        # - down: the same for the downward graph, stored reversed: an entry
+        #   v -> u stands for the edge u -> v with rank[u] > rank[v]
+        # A middle of NO_VERTEX marks an original edge, anything else the
+        # vertex a shortcut bypasses.
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.rank = array('q', rank)
+        self.up = _search_graph(*up)
+        self.down = _search_graph(*down)
+
+    def query(self, start, target):
+        # Input:
+        # - start: starting vertex
+        # - target: target vertex
+        #
+        # Output:
+        # - distance: shortest-path distance from start to target (inf if unreachable)
+        # - path: list of vertices from start to target, or [] if unreachable
+        s, t = self.index[start], self.index[target]
+        if s == t:
+            return 0, [start]
+        inf = float('inf')
+        graphs = (self.up, self.down)
+        dist = ({s: 0}, {t: 0})
+        parent = ({s: None}, {t: None})
+        heaps = ([(0, s)], [(0, t)])
+        mu, meet = inf, None
+
+        while heaps[0] or heaps[1]:
+            if not heaps[1] or (heaps[0] and heaps[0][0][0] <= heaps[1][0][0]):
+                side = 0
+            else:
+                side = 1
+            distance, v = heapq.heappop(heaps[side])
+            if distance > dist[side][v]:
+                continue
+            if distance >= mu:
+                heaps[side].clear()
+                continue
+            other = dist[1 - side]
+            if v in other and distance + other[v] < mu:
+                mu, meet = distance + other[v], v
+
+            offsets, targets, weights, _ = graphs[side]
+            for e in range(offsets[v], offsets[v + 1]):
+                neighbor = targets[e]
+                new_distance = distance + weights[e]
+                if new_distance < dist[side].get(neighbor, inf):
+                    dist[side][neighbor] = new_distance
+                    parent[side][neighbor] = v
+                    heapq.heappush(heaps[side], (new_distance, neighbor))
+
+        if meet is None:
+            return inf, []
+        path = [meet]
+        while parent[0][path[-1]] is not None:
+            path.append(parent[0][path[-1]])
+        path.reverse()
+        while parent[1][path[-1]] is not None:
+            path.append(parent[1][path[-1]])
+        return mu, [self.labels[v] for v in self._unpack(path)]
+
+    def _unpack(self, path):
+        """Replace every shortcut edge on path by the original edges it stands for."""
+        result = [path[0]]
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+        while stack:
+            u, v = stack.pop()
+            middle = self._middle(u, v)
+            if middle == NO_VERTEX:
+                result.append(v)
+            else:
+                stack.append((middle, v))
+                stack.append((u, middle))
+        return result
+
+    def _middle(self, u, v):
+        # The edge u -> v is stored with its lower-ranked endpoint.
+        if self.rank[u] < self.rank[v]:
+            offsets, targets, weights, middles = self.up
+            a, b = u, v
+        else:
+            offsets, targets, weights, middles = self.down
+            a, b = v, u
+        for e in range(offsets[a], offsets[a + 1]):
+            if targets[e] == b:
+                return middles[e]
+        raise KeyError((u, v))
+
+    def save(self, path):
+        """Write the hierarchy to path so it can be reloaded without preprocessing."""
+        with open(path, "wb") as f:
+            pickle.dump({
+                "labels": self.labels,
+                "rank": self.rank.tobytes(),
+                "up": [a.tobytes() for a in self.up],
+                "down": [a.tobytes() for a in self.down],
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Read a hierarchy written by save()."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(
+            data["labels"],
+            array('q', data["rank"]),
+            [array(code, raw) for code, raw in zip("qqdq", data["up"])],
+            [array(code, raw) for code, raw in zip("qqdq", data["down"])],
+        )
+
+
+def _search_graph(offsets, targets, weights, middles):
+    return (array('q', offsets), array('q', targets), array('d', weights), array('q', middles))
+
+
+def build_contraction_hierarchy(graph, weights=None, witness_limit=64):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a CSRGraph
+    # - weights: non-negative edge weights
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - witness_limit: maximum number of vertices a witness search settles
+    #   A lower limit preprocesses faster but may add unneeded shortcuts.
+    #
+    # Output:
+    # - ch: a ContractionHierarchy answering point-to-point queries
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+    n = csr.n
+    inf = float('inf')
+
+    # Remaining graph: out_edges[u][v] = in_edges[v][u] = (weight, middle)
+    out_edges = [{} for _ in range(n)]
+    in_edges = [{} for _ in range(n)]
+    for u in range(n):
+        for e in csr.edge_range(u):
+            v, w = csr.targets[e], csr.weights[e]
+            if u != v and w < out_edges[u].get(v, (inf,))[0]:
+                out_edges[u][v] = in_edges[v][u] = (w, NO_VERTEX)
+
+    def shortcuts_for(v):
+        shortcuts = []
+        if not out_edges[v]:
+            return shortcuts
+        max_out = max(w for w, _ in out_edges[v].values())
+        for u, (w_uv, _) in in_edges[v].items():
+            dist = _witness_search(out_edges, u, v, w_uv + max_out, witness_limit)
+            for x, (w_vx, _) in out_edges[v].items():
+                if x != u and dist.get(x, inf) > w_uv + w_vx:
+                    shortcuts.append((u, x, w_uv + w_vx))
+        return shortcuts
+
+    contracted_neighbors = [0] * n
+
+    def priority(v, shortcuts):
+        return (len(shortcuts) - len(in_edges[v]) - len(out_edges[v])
+                + contracted_neighbors[v])
+
+    heap = [(priority(v, shortcuts_for(v)), v) for v in range(n)]
+    heapq.heapify(heap)
+    rank = array('q', [0]) * n
+    up, down = [None] * n, [None] * n
+    order = 0
+    while heap:
+        _, v = heapq.heappop(heap)
+        shortcuts = shortcuts_for(v)
+        p = priority(v, shortcuts)
+        if heap and p > heap[0][0]:
+            heapq.heappush(heap, (p, v))
+            continue
+
+        rank[v] = order
+        order += 1
+        up[v] = [(x, w, m) for x, (w, m) in out_edges[v].items()]
+        down[v] = [(u, w, m) for u, (w, m) in in_edges[v].items()]
+        for x in out_edges[v]:
+            del in_edges[x][v]
+            contracted_neighbors[x] += 1
+        for u in in_edges[v]:
+            del out_edges[u][v]
+            contracted_neighbors[u] += 1
+        out_edges[v], in_edges[v] = {}, {}
+        for u, x, w in shortcuts:
+            if w < out_edges[u].get(x, (inf,))[0]:
+                out_edges[u][x] = in_edges[x][u] = (w, v)
+
+    return ContractionHierarchy(csr.labels, rank, _flatten(up), _flatten(down))
+
+
+def _witness_search(out_edges, source, excluded, max_dist, limit):
+    """Dijkstra from source that avoids excluded; stops past max_dist or limit settled."""
+    best = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    while heap and settled < limit:
+        distance, v = heapq.heappop(heap)
+        if distance > best[v]:
+            continue
+        if distance > max_dist:
+            break
+        settled += 1
+        for neighbor, (w, _) in out_edges[v].items():
+            if neighbor != excluded and distance + w < best.get(neighbor, float('inf')):
+                best[neighbor] = distance + w
+                heapq.heappush(heap, (distance + w, neighbor))
+    # Tentative distances are lengths of real paths, so they are valid witnesses too.
+    return best
+
+
+def _flatten(adjacency):
+    offsets, targets, weights, middles = [0], [], [], []
+    for edges in adjacency:
+        for v, w, m in edges:
+            targets.append(v)
+            weights.append(w)
+            middles.append(m)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middles
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def _path_weight(path, weights):
+    return sum(weights[(u, v)] for u, v in zip(path, path[1:]))
+
+
+def test_matches_dijkstra_on_grid():
+    # Road-like grid with mixed weights; every query must agree with dijkstra
+    # and unpack to a path of original edges.
+    graph, weights = {}, {}
+    for x in range(8):
+        for y in range(8):
+            graph[(x, y)] = []
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                u = (x + dx, y + dy)
+                if 0 <= u[0] < 8 and 0 <= u[1] < 8:
+                    graph[(x, y)].append(u)
+                    weights[((x, y), u)] = 1 + (3 * x + 5 * y + dx) % 4
+    ch = build_contraction_hierarchy(graph, weights)
+    for start in [(0, 0), (3, 4), (7, 7)]:
+        dist, _ = dijkstra(graph, start, weights)
+        for target in graph:
+            distance, path = ch.query(start, target)
+            assert distance == dist[target]
+            assert path[0] == start and path[-1] == target
+            assert _path_weight(path, weights) == distance
+
+
+def test_directed_and_unreachable():
+    # One-way edges: C cannot reach A, and E is isolated.
+    graph = {"A": ["B", "C"], "B": ["C", "D"], "C": ["D"], "D": [], "E": []}
+    weights = {("A", "B"): 1, ("A", "C"): 5, ("B", "C"): 1,
+               ("B", "D"): 4, ("C", "D"): 1}
+    ch = build_contraction_hierarchy(graph, weights)
+    assert ch.query("A", "D") == (3, ["A", "B", "C", "D"])
+    assert ch.query("C", "A") == (float("inf"), [])
+    assert ch.query("A", "E") == (float("inf"), [])
+    assert ch.query("B", "B") == (0, ["B"])
+    try:
+        ch.query("Z", "Z")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected KeyError")
+
+
+def test_save_and_load():
+    import os, tempfile
+    graph = {0: [1, 2], 1: [3], 2: [3], 3: [0]}
+    weights = {(0, 1): 2, (0, 2): 1, (1, 3): 1, (2, 3): 3, (3, 0): 1}
+    ch = build_contraction_hierarchy(CSRGraph.from_adjacency(graph, weights))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.ch")
+        ch.save(path)
+        loaded = ContractionHierarchy.load(path)
+    for s in graph:
+        for t in graph:
+            assert loaded.query(s, t) == ch.query(s, t)
+            assert loaded.query(s, t)[0] == dijkstra(graph, s, weights)[0][t]
+
+
+if __name__ == "__main__":
+    test_matches_dijkstra_on_grid()
+    test_directed_and_unreachable()
+    test_save_and_load()
+    print("All tests passed.")
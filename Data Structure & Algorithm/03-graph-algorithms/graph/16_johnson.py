@@ -0,0 +1,187 @@
+"""
+Algorithm
+=====================
+- Add a new vertex q with a zero-weight edge to every vertex
+- Run bellman_ford() from q to get a potential h(v) = d(q, v) for every vertex
+  (this also detects negative cycles)
+- Reweight every edge: w'(u, v) = w(u, v) + h(u) - h(v)
+- For every source s, run dijkstra() on the reweighted graph and recover the
+  original distances as d(s, v) = d'(s, v) - h(s) + h(v)
+- The per-source runs are independent, so they are fanned out to a process pool
+  and their results are streamed back one source at a time
+
+Correctness
+=====================
+By the triangle inequality for shortest paths, h(v) <= h(u) + w(u, v), so every
+reweighted edge is non-negative and dijkstra() applies. Along any path from s to t
+the potentials telescope: w'(path) = w(path) + h(s) - h(t), so the reweighting
+shifts all s-t paths by the same amount and preserves which one is shortest.
+
+Runtime
+=====================
+- Bellman-Ford: O(VE) worst case (queue mode usually much less)
+- V runs of Dijkstra: O(V (V + E) log V), divided across the worker processes
+- On sparse graphs (E = O(V)) this is O(V^2 log V), against O(V^3) for Floyd-Warshall
+- Memory: O(V + E) for the graph plus O(V) per source in flight, instead of a V x V table
+"""
+import importlib.util, pathlib
+
+_mod_path = pathlib.Path(__file__).parent / "05_dijkstra.py"
+_spec = importlib.util.spec_from_file_location("dijkstra", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dijkstra = _mod.dijkstra
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+
+_mod_path = pathlib.Path(__file__).parent / "06_bellman_ford.py"
+_spec = importlib.util.spec_from_file_location("bellman_ford", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+bellman_ford = _mod.bellman_ford
+NegativeCycleError = _mod.NegativeCycleError
+
+_mod_path = pathlib.Path(__file__).parent / "28_process_pool.py"
+_spec = importlib.util.spec_from_file_location("process_pool", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+fork_available = _mod.fork_available
+fork_map = _mod.fork_map
+
+# Label of the extra vertex q; never equal to a caller's vertex.
+_VIRTUAL_SOURCE = object()
+
+
+def johnson(graph, weights=None, sources=None, workers=None):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a CSRGraph
+    # - weights: edge weights (may be negative)
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    # - sources: optional list of source vertices; defaults to every vertex
+    # - workers: number of worker processes; 1 runs everything in this
+    #   process, None uses one per CPU
+    #
+    # Output:
+    # - an iterator of (source, dist, prev) triples in source order, where
+    #   dist and prev have the same shape as the output of dijkstra()
+    #   Raises NegativeCycleError (before any source is run) if the graph
+    #   contains a negative cycle.
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+    h = _potentials(csr)
+    reweighted = []
+    for u in range(csr.n):
+        for e in csr.edge_range(u):
+            # Clamp float round-off; exact potentials never go below zero.
+            reweighted.append(max(0.0, csr.weights[e] + h[u] - h[csr.targets[e]]))
+    reweighted = CSRGraph(csr.labels, csr.offsets, csr.targets, reweighted)
+
+    if sources is None:
+        sources = csr.labels
+    indices = [csr.index[s] for s in sources]
+    if workers == 1 or not fork_available():
+        return (_run_source(reweighted, h, s) for s in indices)
+    # fork_map() keeps a bounded window of sources in flight, so results are
+    # streamed instead of piling up in memory.
+    return fork_map(_worker_run_source, ((s,) for s in indices), workers,
+                    _init_worker, (reweighted, h))
+
+
+def _potentials(csr):
+    """Return h[v] = d(q, v) for the extra vertex q, computed with bellman_ford()."""
+    n = csr.n
+    offsets = list(csr.offsets) + [csr.num_edges + n]
+    targets = list(csr.targets) + list(range(n))
+    edge_weights = list(csr.weights) + [0.0] * n
+    augmented = CSRGraph(csr.labels + [_VIRTUAL_SOURCE], offsets, targets, edge_weights)
+    dist, _, _ = bellman_ford(augmented, _VIRTUAL_SOURCE, method="queue")
+    return [dist[label] for label in csr.labels]
+
+
+def _run_source(graph, h, s):
+    """Run dijkstra() from vertex id s on the reweighted graph; undo the reweighting."""
+    source = graph.labels[s]
+    dist, prev = dijkstra(graph, source)
+    for v, label in enumerate(graph.labels):
+        dist[label] = dist[label] - h[s] + h[v]
+    return source, dist, prev
+
+
+# Worker-process state, set once per worker by _init_worker().
+_worker_graph = None
+_worker_h = None
+
+
+def _init_worker(graph, h):
+    global _worker_graph, _worker_h
+    _worker_graph, _worker_h = graph, h
+
+
+def _worker_run_source(s):
+    return _run_source(_worker_graph, _worker_h, s)
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_fw_path = pathlib.Path(__file__).parent / "07_floyd_warshall.py"
+_fw_spec = importlib.util.spec_from_file_location("floyd_warshall", _fw_path)
+_fw_mod = importlib.util.module_from_spec(_fw_spec)
+_fw_spec.loader.exec_module(_fw_mod)
+floyd_warshall = _fw_mod.floyd_warshall
+
+
+def _sample_graph():
+    graph = {
+        "A": ["B", "C"],
+        "B": ["D"],
+        "C": ["B", "E"],
+        "D": ["A", "E"],
+        "E": [],
+        "F": ["E"],
+    }
+    weights = {
+        ("A", "B"): 4,
+        ("A", "C"): 1,
+        ("C", "B"): -2,
+        ("B", "D"): 1,
+        ("C", "E"): 6,
+        ("D", "A"): 3,
+        ("D", "E"): -1,
+        ("F", "E"): 2,
+    }
+    return graph, weights
+
+
+def test_matches_floyd_warshall():
+    graph, weights = _sample_graph()
+    expected, _ = floyd_warshall(graph, weights)
+    for source, dist, prev in johnson(graph, weights, workers=1):
+        assert dist == expected[source]
+        assert prev[source] is None
+
+
+def test_process_pool_streams_same_results():
+    graph, weights = _sample_graph()
+    sequential = list(johnson(graph, weights, workers=1))
+    parallel = list(johnson(CSRGraph.from_adjacency(graph, weights), workers=2))
+    assert parallel == sequential
+    assert [source for source, _, _ in parallel] == list(graph)
+
+
+def test_negative_cycle():
+    graph = {"A": ["B"], "B": ["C"], "C": ["A"]}
+    weights = {("A", "B"): 1, ("B", "C"): -1, ("C", "A"): -1}
+    try:
+        johnson(graph, weights)
+    except NegativeCycleError as error:
+        assert sorted(error.cycle) == ["A", "B", "C"]
+    else:
+        raise AssertionError("expected NegativeCycleError")
+
+
+if __name__ == "__main__":
+    test_matches_floyd_warshall()
+    test_process_pool_streams_same_results()
+    test_negative_cycle()
+    print("All tests passed.")
@@ -0,0 +1,269 @@
+"""
+Algorithm
+=====================
+Maintain the condensation (metagraph) of a directed graph while edges are
+inserted one at a time, together with a topological order of its components
+(Pearce-Kelly dynamic topological ordering):
+- ord[c] is the position of component c; every metagraph edge c -> d has
+  ord[c] < ord[d]
+- Insert (u, v) with cu = component(u), cv = component(v):
+    - If cu == cv, or ord[cu] < ord[cv], the order is still valid: just add
+      the metagraph edge
+    - Otherwise search forward from cv over components with ord <= ord[cu]
+      (set F), and backward from cu over components with ord >= ord[cv] (set B)
+    - If cu is in F the new edge closes a cycle: every component in F and B
+      lies on a path cv -> ... -> cu, so merge them into one component
+    - Reuse the ord values of F and B: the components of B (with the merged
+      component last) take the lowest ones and the rest of F the highest,
+      each group keeping its relative order
+
+Correctness
+=====================
+Components outside F and B keep their positions and every edge inside the
+affected region goes from B to F, so the ordering stays topological. A cycle
+through the new edge must use a path from cv back to cu, and every vertex on
+such a path has ord between ord[cv] and ord[cu], so the bounded searches find
+exactly the components that must be merged. Components only ever merge, which
+is all that inserting edges can do to the SCCs.
+
+Runtime
+=====================
+- same_scc(u, v) and component(v): O(1) dictionary lookups
+- add_edge(u, v): O(1) when the edge respects the current order; otherwise
+  proportional to the edges of the components whose ord lies between ord[cv]
+  and ord[cu], which is usually a small part of the graph
+- Merging relabels the smaller member lists into the largest, so each vertex is
+  relabelled O(log V) times over any sequence of insertions
+- snapshot(): O(V + E') where E' is the number of metagraph edges
+"""
+import importlib.util, pathlib
+
+_mod_path = pathlib.Path(__file__).parent / "04_strongly_connected_components.py"
+_spec = importlib.util.spec_from_file_location("strongly_connected_components", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+strongly_connected_components = _mod.strongly_connected_components
+
+
+class IncrementalSCC:
+    def __init__(self, graph=None):
+        # Input:
+        # - graph: optional directed graph in adjacency list format (or a
+        #   CSRGraph) to start from; its SCCs are found once with
+        #   strongly_connected_components()
+        #
+        # Internal:
+        # - _component[v]: id of the component containing vertex v
+        # - _members[c]: vertices of component c
+        # - _out[c], _in[c]: metagraph successors and predecessors of c
+        # - _ord[c]: position of c in a topological order of the metagraph;
+        #   _top is the largest position handed out so far
+        self._component = {}
+        self._members = {}
+        self._out = {}
+        self._in = {}
+        self._ord = {}
+        self._next_id = 0
+        self._top = -1
+        if graph is None:
+            return
+        metagraph, ccnum, _, _, _ = strongly_connected_components(graph)
+        # ccnum runs from sink (1) to source (len(metagraph)); reversing it
+        # gives a topological order, and ccnum itself serves as component id.
+        for scc, successors in metagraph.items():
+            self._members[scc] = []
+            self._out[scc] = set(successors)
+            self._in.setdefault(scc, set())
+            self._ord[scc] = len(metagraph) - scc
+            for successor in successors:
+                self._in.setdefault(successor, set()).add(scc)
+        for v, scc in ccnum.items():
+            self._component[v] = scc
+            self._members[scc].append(v)
+        self._next_id = len(metagraph) + 1
+        self._top = len(metagraph) - 1
+
+    def __len__(self):
+        """Return the number of vertices."""
+        return len(self._component)
+
+    def __contains__(self, v):
+        return v in self._component
+
+    @property
+    def num_components(self):
+        return len(self._members)
+
+    def add_vertex(self, v):
+        """Add v as a new single-vertex component (no-op if already present)."""
+        if v in self._component:
+            return
+        c = self._next_id
+        self._next_id += 1
+        self._component[v] = c
+        self._members[c] = [v]
+        self._out[c] = set()
+        self._in[c] = set()
+        # Isolated, so the end of the order is as good as anywhere.
+        self._top += 1
+        self._ord[c] = self._top
+
+    def component(self, v):
+        """Return the id of the component containing v (stable until it merges)."""
+        return self._component[v]
+
+    def same_scc(self, u, v):
+        """Return True if u and v belong to the same strongly connected component."""
+        return self._component[u] == self._component[v]
+
+    def add_edge(self, u, v):
+        # Input:
+        # - u, v: endpoints of the new edge u -> v; unseen vertices are added
+        #
+        # Output:
+        # - True if the edge closed a cycle and merged components, else False
+        self.add_vertex(u)
+        self.add_vertex(v)
+        cu, cv = self._component[u], self._component[v]
+        if cu == cv or cv in self._out[cu]:
+            return False
+        self._out[cu].add(cv)
+        self._in[cv].add(cu)
+        order = self._ord
+        lower, upper = order[cv], order[cu]
+        if upper < lower:
+            return False
+
+        forward = self._search(cv, self._out, lambda c: order[c] <= upper)
+        backward = self._search(cu, self._in, lambda c: order[c] >= lower)
+        positions = sorted(order[c] for c in forward | backward)
+        closed_cycle = cu in forward
+        if closed_cycle:
+            cycle = forward & backward
+            forward -= cycle
+            backward -= cycle
+            lower_part = sorted(backward, key=order.get) + [self._merge(cycle)]
+        else:
+            lower_part = sorted(backward, key=order.get)
+        upper_part = sorted(forward, key=order.get)
+        # After a merge the positions left over in the middle are dropped.
+        for c, position in zip(lower_part, positions):
+            order[c] = position
+        for c, position in zip(upper_part, positions[len(positions) - len(upper_part):]):
+            order[c] = position
+        return closed_cycle
+
+    def _search(self, start, edges, within):
+        """Return the components reachable from start along edges, staying within the bound."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            c = stack.pop()
+            for d in edges[c]:
+                if d not in seen and within(d):
+                    seen.add(d)
+                    stack.append(d)
+        return seen
+
+    def _merge(self, components):
+        """Merge the given components into the one with the most members; return its id."""
+        keep = max(components, key=lambda c: len(self._members[c]))
+        out, into = self._out[keep], self._in[keep]
+        for c in components:
+            if c == keep:
+                continue
+            for v in self._members[c]:
+                self._component[v] = keep
+            self._members[keep].extend(self._members.pop(c))
+            for d in self._out.pop(c):
+                self._in[d].discard(c)
+                if d not in components:
+                    self._in[d].add(keep)
+                    out.add(d)
+            for d in self._in.pop(c):
+                self._out[d].discard(c)
+                if d not in components:
+                    self._out[d].add(keep)
+                    into.add(d)
+            del self._ord[c]
+        out -= components
+        into -= components
+        return keep
+
+    def snapshot(self):
+        # Output:
+        # - metagraph, ccnum: the same shape as strongly_connected_components(),
+        #   with components numbered 1..k from sink to source, so the metagraph
+        #   is in reverse topological order
+        ranked = sorted(self._members, key=self._ord.get, reverse=True)
+        number = {c: i for i, c in enumerate(ranked, 1)}
+        metagraph = {number[c]: [number[d] for d in self._out[c]] for c in ranked}
+        ccnum = {v: number[c] for v, c in self._component.items()}
+        return metagraph, ccnum
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def _partition(ccnum):
+    groups = {}
+    for v, c in ccnum.items():
+        groups.setdefault(c, set()).add(v)
+    return {frozenset(group) for group in groups.values()}
+
+
+def _check_against_static(scc, graph):
+    metagraph, ccnum = scc.snapshot()
+    expected_metagraph, expected_ccnum, _, _, _ = strongly_connected_components(graph)
+    assert _partition(ccnum) == _partition(expected_ccnum)
+    assert sum(map(len, metagraph.values())) == sum(map(len, expected_metagraph.values()))
+    assert all(d < c for c, successors in metagraph.items() for d in successors)
+
+
+def test_cycle_merges_components():
+    scc = IncrementalSCC()
+    assert scc.add_edge("A", "B") is False
+    assert scc.add_edge("B", "C") is False
+    assert scc.add_edge("C", "D") is False
+    assert not scc.same_scc("A", "C")
+    assert scc.add_edge("C", "A") is True
+    assert scc.same_scc("A", "C") and scc.same_scc("B", "C")
+    assert not scc.same_scc("A", "D")
+    metagraph, ccnum = scc.snapshot()
+    assert metagraph == {1: [], 2: [1]}
+    assert ccnum == {"A": 2, "B": 2, "C": 2, "D": 1}
+
+
+def test_matches_static_after_each_insertion():
+    import random
+    rng = random.Random(7)
+    n = 40
+    graph = {v: [] for v in range(n)}
+    scc = IncrementalSCC()
+    for v in range(n):
+        scc.add_vertex(v)
+    for _ in range(120):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if v in graph[u]:
+            continue
+        graph[u].append(v)
+        scc.add_edge(u, v)
+        _check_against_static(scc, graph)
+
+
+def test_starts_from_existing_graph():
+    graph = {"A": ["B"], "B": ["C"], "C": [], "D": ["A"]}
+    scc = IncrementalSCC(graph)
+    assert scc.num_components == 4
+    assert scc.add_edge("C", "D") is True
+    assert scc.num_components == 1
+    graph["C"].append("D")
+    _check_against_static(scc, graph)
+
+
+if __name__ == "__main__":
+    test_cycle_merges_components()
+    test_matches_static_after_each_insertion()
+    test_starts_from_existing_graph()
+    print("All tests passed.")
@@ -0,0 +1,310 @@
+"""
+Algorithm
+=====================
+Run one task per vertex of a DAG, where an edge u -> v means v depends on u,
+keeping up to `workers` independent tasks running at once:
+- Get a topological order with iter_topological_order() (this also rejects cycles)
+- Walk the order backwards to compute each vertex's bottom level: its own
+  estimated cost plus the largest bottom level among its successors, i.e. the
+  length of the longest chain of work that cannot start until it is done
+- Keep a ready queue of vertices whose predecessors have all finished,
+  highest bottom level first, and submit from it whenever a worker is free
+- When a task finishes, record its duration and decrement the remaining
+  in-degree of its successors, moving any that reach 0 to the ready queue
+- Afterwards, walk the order forwards with the measured durations to find the
+  critical path: the chain of dependent tasks with the largest total duration
+
+dependency_levels() groups the vertices into levels instead: level 0 has no
+predecessors and level i holds the vertices whose longest chain of predecessors
+has i edges, so every level can run fully in parallel.
+
+Correctness
+=====================
+A vertex enters the ready queue only when its in-degree among unfinished tasks
+drops to 0, so no task starts before all of its dependencies have finished,
+and every vertex of a DAG eventually reaches in-degree 0. Starting the task with
+the longest remaining chain first is the classic list-scheduling heuristic: it
+keeps the critical path moving while other workers fill in shorter chains. No
+schedule can finish sooner than the critical path, however many workers are used.
+
+Runtime
+=====================
+- Scheduling overhead: O(V log V + E) for the topological order, bottom levels,
+  ready-queue heap and in-degree updates
+- Wall-clock time: at least the critical path length, and at most about
+  (total work / workers) + critical path length for this greedy schedule
+"""
+import concurrent.futures
+import heapq
+import importlib.util, pathlib
+import os
+import time
+from array import array
+
+_mod_path = pathlib.Path(__file__).parent / "03_topological_sort.py"
+_spec = importlib.util.spec_from_file_location("topological_sort", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+iter_topological_order = _mod.iter_topological_order
+CycleError = _mod.CycleError
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+
+_mod_path = pathlib.Path(__file__).parent / "28_process_pool.py"
+_spec = importlib.util.spec_from_file_location("process_pool", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+fork_pool = _mod.fork_pool
+
+
+def dependency_levels(graph):
+    # Input:
+    # - graph: a directed acyclic graph in adjacency list format, or a CSRGraph;
+    #   an edge u -> v means v depends on u
+    #
+    # Output:
+    # - levels: list of lists of vertices; every vertex in levels[i] depends
+    #   only on vertices in earlier levels
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph)
+    level = array('q', bytes(8 * csr.n))
+    levels = []
+    for label in iter_topological_order(csr, "kahn"):
+        u = csr.index[label]
+        if level[u] == len(levels):
+            levels.append([])
+        levels[level[u]].append(label)
+        for v in csr.neighbors(u):
+            if level[v] < level[u] + 1:
+                level[v] = level[u] + 1
+    return levels
+
+
+def run_dag(graph, run, workers=None, executor="thread", estimates=None, stats=None):
+    # Input:
+    # - graph: a directed acyclic graph in adjacency list format, or a CSRGraph;
+    #   an edge u -> v means v depends on u
+    # - run: callable; run(v) performs the task for vertex v
+    #   With executor="process" it must be picklable (a module-level function).
+    # - workers: maximum number of tasks running at once (default: CPU count)
+    # - executor: "thread", "process", or an existing concurrent.futures.Executor
+    #   (which is used as is and not shut down)
+    # - estimates: optional {vertex: expected cost} used to prioritize ready
+    #   tasks; a vertex missing from it (or every vertex, if not given) counts as 1
+    # - stats: optional dict; filled with "makespan" (seconds of wall time),
+    #   "durations" ({vertex: seconds}), "critical_path" (list of vertices)
+    #   and "critical_path_length" (seconds)
+    #
+    # Output:
+    # - results: {vertex: run(vertex)}
+    #   Raises CycleError (before running anything) if the graph has a cycle.
+    #   If a task raises, no further tasks are started, and the first exception
+    #   is re-raised once the running tasks have finished (on any executor).
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph)
+    labels, n = csr.labels, csr.n
+    order = [csr.index[label] for label in iter_topological_order(csr, "kahn")]
+    workers = workers or os.cpu_count() or 1
+
+    bottom = [0.0] * n
+    for u in reversed(order):
+        tail = max((bottom[v] for v in csr.neighbors(u)), default=0.0)
+        bottom[u] = (1.0 if estimates is None else estimates.get(labels[u], 1.0)) + tail
+
+    indegree = array('q', bytes(8 * n))
+    for v in csr.targets:
+        indegree[v] += 1
+    ready = [(-bottom[v], v) for v in range(n) if not indegree[v]]
+    heapq.heapify(ready)
+
+    if executor == "thread":
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    elif executor == "process":
+        # fork_pool() makes run reachable by the workers even when this
+        # module (or run's) was loaded through importlib.
+        pool = fork_pool([run], workers)
+    elif isinstance(executor, str):
+        raise ValueError(f"unknown executor: {executor!r}")
+    else:
+        pool = executor
+
+    results = {}
+    durations = [0.0] * n
+    running = {}
+    error = None
+    started = time.perf_counter()
+    try:
+        while (ready and error is None) or running:
+            # Only hand the pool as many tasks as it has workers, so a task's
+            # time from submission to completion is its actual run time.
+            while ready and error is None and len(running) < workers:
+                _, u = heapq.heappop(ready)
+                running[pool.submit(run, labels[u])] = (u, time.perf_counter())
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            finished = time.perf_counter()
+            for future in done:
+                u, submitted = running.pop(future)
+                durations[u] = finished - submitted
+                if future.exception() is not None:
+                    # Keep draining the running tasks; raise after the loop.
+                    if error is None:
+                        error = future.exception()
+                    continue
+                results[labels[u]] = future.result()
+                for v in csr.neighbors(u):
+                    indegree[v] -= 1
+                    if not indegree[v]:
+                        heapq.heappush(ready, (-bottom[v], v))
+    finally:
+        if pool is not executor:
+            pool.shutdown(wait=True)
+    if error is not None:
+        raise error
+    makespan = time.perf_counter() - started
+
+    if stats is not None:
+        path, length = _critical_path(csr, order, durations)
+        stats["makespan"] = makespan
+        stats["durations"] = {labels[v]: durations[v] for v in range(n)}
+        stats["critical_path"] = [labels[v] for v in path]
+        stats["critical_path_length"] = length
+    return results
+
+
+def _critical_path(graph, order, durations):
+    """Return the heaviest dependency chain (vertex ids) and its total duration."""
+    finish = [0.0] * graph.n
+    start = [0.0] * graph.n
+    via = [None] * graph.n
+    for u in order:
+        finish[u] = start[u] + durations[u]
+        for v in graph.neighbors(u):
+            if via[v] is None or finish[u] > start[v]:
+                start[v] = finish[u]
+                via[v] = u
+    if not order:
+        return [], 0.0
+    v = max(order, key=lambda u: finish[u])
+    length = finish[v]
+    path = []
+    while v is not None:
+        path.append(v)
+        v = via[v]
+    path.reverse()
+    return path, length
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def _double(x):
+    return 2 * x
+
+
+def test_dependency_levels():
+    graph = {"A": ["C"], "B": ["C", "D"], "C": ["E"], "D": ["E"], "E": [], "F": []}
+    assert dependency_levels(graph) == [["A", "B", "F"], ["C", "D"], ["E"]]
+
+
+def test_dependencies_run_first():
+    import threading
+    graph = {"fetch": ["parse", "index"], "parse": ["report"], "index": ["report"], "report": []}
+    lock = threading.Lock()
+    events = []
+
+    def run(v):
+        with lock:
+            events.append(("start", v))
+        time.sleep(0.01)
+        with lock:
+            events.append(("end", v))
+        return v.upper()
+
+    results = run_dag(graph, run, workers=3, estimates={"index": 2.0})
+    assert results == {v: v.upper() for v in graph}
+    for u, successors in graph.items():
+        for v in successors:
+            assert events.index(("end", u)) < events.index(("start", v))
+
+
+def test_independent_tasks_run_concurrently():
+    # Every task waits at the barrier until all four are running at once.
+    import threading
+    graph = {v: [] for v in range(4)}
+    barrier = threading.Barrier(4, timeout=10)
+    stats = {}
+    run_dag(graph, lambda v: barrier.wait(), workers=4, stats=stats)
+    assert len(stats["critical_path"]) == 1
+
+
+def test_critical_path():
+    # B and C run side by side, and B only finishes after C, so the longest
+    # chain is A -> B -> D.
+    import threading
+    graph = {"A": ["B", "C"], "B": ["D"], "C": ["D"], "D": []}
+    c_done = threading.Event()
+
+    def run(v):
+        if v == "B":
+            assert c_done.wait(10)
+        elif v == "C":
+            c_done.set()
+
+    stats = {}
+    run_dag(graph, run, workers=2, stats=stats)
+    durations = stats["durations"]
+    assert stats["critical_path"] == ["A", "B", "D"]
+    assert stats["critical_path_length"] == durations["A"] + durations["B"] + durations["D"]
+    assert stats["critical_path_length"] <= stats["makespan"]
+
+
+def test_process_pool_and_cycle():
+    graph = {1: [2, 3], 2: [], 3: []}
+    assert run_dag(graph, _double, workers=2, executor="process") == {1: 2, 2: 4, 3: 6}
+    try:
+        run_dag({"A": ["B"], "B": ["A"]}, _double)
+    except CycleError:
+        pass
+    else:
+        raise AssertionError("expected CycleError")
+
+
+def test_process_pool_from_importlib():
+    # Loaded the way sibling modules load each other, so neither this module
+    # nor run is in sys.modules under its own name.
+    spec = importlib.util.spec_from_file_location("dag_scheduler_copy", pathlib.Path(__file__))
+    copy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(copy)
+    graph = {1: [2], 2: [3], 3: []}
+    assert copy.run_dag(graph, copy._double, workers=2, executor="process") == {1: 2, 2: 4, 3: 6}
+
+
+def test_failing_task():
+    # The error is raised only after the task still running has finished,
+    # also on a caller-supplied pool, and no dependent task is started.
+    graph = {"bad": ["after"], "slow": [], "after": []}
+    finished = []
+
+    def run(v):
+        if v == "bad":
+            raise ValueError(v)
+        time.sleep(0.05)
+        finished.append(v)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        try:
+            run_dag(graph, run, workers=2, executor=pool)
+        except ValueError as error:
+            assert str(error) == "bad" and finished == ["slow"]
+        else:
+            raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_dependency_levels()
+    test_dependencies_run_first()
+    test_independent_tasks_run_concurrently()
+    test_critical_path()
+    test_process_pool_and_cycle()
+    test_process_pool_from_importlib()
+    test_failing_task()
+    print("All tests passed.")
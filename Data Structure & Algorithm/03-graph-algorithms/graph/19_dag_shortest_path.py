@@ -0,0 +1,170 @@
+"""
+Algorithm
+=====================
+- Set dist[start] = 0 and dist[v] = inf for every other vertex
+- Visit the vertices in topological order (iter_topological_order())
+- For each visited vertex u with dist[u] < inf, relax every edge (u, v):
+    - If dist[u] + w(u, v) < dist[v]: set dist[v] = dist[u] + w(u, v), prev[v] = u
+
+The longest (critical) path is the same pass with every comparison flipped:
+dist[v] starts at -inf and an edge is taken when it makes dist[v] larger.
+
+Correctness
+=====================
+Every path into v only uses vertices that come before v in topological order,
+so by the time v is visited, each of its incoming edges has already been
+relaxed from a vertex whose own distance was final. dist[v] is therefore final
+when v is visited. Nothing in this argument needs the weights to be
+non-negative, and since a DAG has no cycles there are no negative (or, for the
+longest path, positive) cycles to worry about.
+
+Runtime
+=====================
+Computing the topological order takes O(V + E) and each edge is relaxed exactly
+once, so the total is O(V + E), with no priority queue and no repeated rounds.
+That compares with O((V + E) log V) for dijkstra() (which also cannot take
+negative weights) and O(VE) for bellman_ford().
+"""
+import importlib.util, pathlib
+from array import array
+
+_mod_path = pathlib.Path(__file__).parent / "03_topological_sort.py"
+_spec = importlib.util.spec_from_file_location("topological_sort", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+iter_topological_order = _mod.iter_topological_order
+CycleError = _mod.CycleError
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+NO_VERTEX = _mod.NO_VERTEX
+
+
+def dag_shortest_path(graph, start, weights=None):
+    # Input:
+    # - graph: a directed acyclic graph in adjacency list format, or a CSRGraph
+    # - start: starting vertex
+    # - weights: edge weights (may be negative)
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    #
+    # Output:
+    # - dist: weighted distance from start to every vertex
+    #   Unreachable vertices have distance inf.
+    # - prev: parent of each vertex on the shortest-path tree
+    #   Unreachable vertices and the starting vertex have parent nil.
+    #   Raises CycleError if the graph has a cycle.
+    return _dag_relax(graph, start, weights, 1.0)
+
+
+def dag_longest_path(graph, start, weights=None):
+    # Input:
+    # - graph: a directed acyclic graph in adjacency list format, or a CSRGraph
+    # - start: starting vertex
+    # - weights: edge weights (may be negative)
+    #   Not needed for a CSRGraph, which carries its own edge weights.
+    #
+    # Output:
+    # - dist: weight of the heaviest path from start to every vertex
+    #   Unreachable vertices have distance -inf.
+    # - prev: parent of each vertex on the longest-path tree
+    #   Unreachable vertices and the starting vertex have parent nil.
+    #   Raises CycleError if the graph has a cycle.
+    return _dag_relax(graph, start, weights, -1.0)
+
+
+def _dag_relax(graph, start, weights, sign):
+    # The longest path is the shortest path under negated weights, so both
+    # run the same loop on sign * w and negate the distances back at the end.
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, weights)
+    offsets, targets, edge_weights = csr.offsets, csr.targets, csr.weights
+    index, n = csr.index, csr.n
+    inf = float('inf')
+    dist = array('d', [inf]) * n
+    prev = array('q', [NO_VERTEX]) * n
+    dist[index[start]] = 0
+
+    for label in iter_topological_order(csr):
+        u = index[label]
+        du = dist[u]
+        if du == inf:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_distance = du + sign * edge_weights[e]
+            if new_distance < dist[v]:
+                dist[v] = new_distance
+                prev[v] = u
+
+    labels = csr.labels
+    # Adding 0.0 turns the start vertex's -0.0 back into 0.0.
+    return ({labels[v]: 0.0 + sign * dist[v] for v in range(n)},
+            {labels[v]: csr.label(prev[v]) for v in range(n)})
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_bf_path = pathlib.Path(__file__).parent / "06_bellman_ford.py"
+_bf_spec = importlib.util.spec_from_file_location("bellman_ford", _bf_path)
+_bf_mod = importlib.util.module_from_spec(_bf_spec)
+_bf_spec.loader.exec_module(_bf_mod)
+bellman_ford = _bf_mod.bellman_ford
+
+
+def _sample_dag():
+    graph = {
+        "S": ["A", "B"],
+        "A": ["C", "D"],
+        "B": ["A", "D"],
+        "C": ["E"],
+        "D": ["E"],
+        "E": [],
+        "X": ["A"],
+    }
+    weights = {
+        ("S", "A"): 5, ("S", "B"): 2,
+        ("A", "C"): 1, ("A", "D"): -3,
+        ("B", "A"): -4, ("B", "D"): 6,
+        ("C", "E"): 2, ("D", "E"): 4,
+        ("X", "A"): 1,
+    }
+    return graph, weights
+
+
+def test_matches_bellman_ford():
+    graph, weights = _sample_dag()
+    dist, prev = dag_shortest_path(graph, "S", weights)
+    expected_dist, expected_prev, _ = bellman_ford(graph, "S", weights)
+    assert dist == expected_dist
+    assert prev == expected_prev
+    assert dist["A"] == -2 and dist["X"] == float("inf") and prev["S"] is None
+
+
+def test_longest_path():
+    graph, weights = _sample_dag()
+    dist, prev = dag_longest_path(graph, "S", weights)
+    assert dist == {"S": 0, "A": 5, "B": 2, "C": 6, "D": 8, "E": 12, "X": float("-inf")}
+    path, v = [], "E"
+    while v is not None:
+        path.append(v)
+        v = prev[v]
+    assert path[::-1] == ["S", "B", "D", "E"]
+
+
+def test_csr_graph_and_cycle():
+    graph, weights = _sample_dag()
+    csr = CSRGraph.from_adjacency(graph, weights)
+    assert dag_shortest_path(csr, "S") == dag_shortest_path(graph, "S", weights)
+    try:
+        dag_shortest_path({"A": ["B"], "B": ["A"]}, "A", {("A", "B"): 1, ("B", "A"): 1})
+    except CycleError:
+        pass
+    else:
+        raise AssertionError("expected CycleError")
+
+
+if __name__ == "__main__":
+    test_matches_bellman_ford()
+    test_longest_path()
+    test_csr_graph_and_cycle()
+    print("All tests passed.")
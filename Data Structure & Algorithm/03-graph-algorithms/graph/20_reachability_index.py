@@ -0,0 +1,262 @@
+"""
+Algorithm
+=====================
+Preprocessing:
+- Collapse the graph into its SCC metagraph with strongly_connected_components();
+  u reaches v exactly when u's component reaches v's component
+- Small metagraphs (at most bitset_limit components): transitive closure as
+  bitsets. Components are numbered from sink to source, so every successor of
+  component c has a smaller number; visiting c = 1, 2, ... lets each row be
+      reach[c] = {c} | union of reach[d] over successors d of c
+- Large metagraphs: pruned 2-hop labelling. Take the components in order of
+  decreasing (in-degree + 1) * (out-degree + 1); for the i-th one, r:
+    - BFS forward from r; at each w, stop if the labels so far already show
+      r reaches w, otherwise add i to L_in[w] and continue
+    - BFS backward from r; at each w, stop if w already reaches r by the
+      labels, otherwise add i to L_out[w] and continue
+
+Query reachable(u, v), with cu, cv the components of u and v:
+- Equal components: True. cu numbered below cv: False (cu comes after cv in
+  topological order, so it cannot reach it)
+- Bitset: test bit cv of reach[cu]
+- 2-hop: True exactly when L_out[cu] and L_in[cv] share a landmark
+
+Correctness
+=====================
+The bitset rows follow directly from reach(c) = {c} + reach of its successors.
+For 2-hop labels: if a path cu -> ... -> cv exists, take its highest-ranked
+component r. Neither BFS from r was pruned before reaching cu or cv, because a
+pruning witness would be a landmark ranked above r on the same path, so r ends up
+in both L_out[cu] and L_in[cv] (or an earlier landmark already covers the pair).
+Conversely, a shared landmark r means cu reaches r and r reaches cv.
+
+Runtime
+=====================
+- Condensation: O(V + E)
+- Bitset closure: O(k * E' / w) word operations for k components and E'
+  metagraph edges, and k^2 bits of memory
+- 2-hop labelling: one pruned BFS pair per component; the pruning keeps labels
+  small on real graphs (typically a few dozen entries)
+- Query: O(1) for the bitset, O(|L_out| + |L_in|) for 2-hop labels
+- The index is saved as flat byte arrays and reloads without recomputation
+"""
+from collections import deque
+import importlib.util, pathlib
+import pickle
+from array import array
+
+_mod_path = pathlib.Path(__file__).parent / "04_strongly_connected_components.py"
+_spec = importlib.util.spec_from_file_location("strongly_connected_components", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+strongly_connected_components = _mod.strongly_connected_components
+CSRGraph = _mod.CSRGraph
+is_csr_graph = _mod.is_csr_graph
+
+
+class ReachabilityIndex:
+    def __init__(self, labels, component, kind, rows=None, labelling=None):
+        # - labels: original vertex labels, labels[i] is vertex i
+        # - component[i]: metagraph component of vertex i (1..k, sink first)
+        # - kind: "bitset" or "2hop"
+        # - rows: for "bitset", rows[c] is an int whose bit d is set when
+        #   component c reaches component d (rows[0] is unused)
+        # - labelling: for "2hop", (out_offsets, out_labels, in_offsets,
+        #   in_labels): the landmark ranks of component c are
+        #   out_labels[out_offsets[c]:out_offsets[c + 1]], and likewise for in
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.component = array('q', component)
+        self.kind = kind
+        self.rows = rows
+        self.labelling = None if labelling is None else tuple(array('q', a) for a in labelling)
+
+    def reachable(self, u, v):
+        """Return True if there is a path from vertex u to vertex v."""
+        cu = self.component[self.index[u]]
+        cv = self.component[self.index[v]]
+        if cu == cv:
+            return True
+        if cu < cv:
+            return False
+        if self.kind == "bitset":
+            return (self.rows[cu] >> cv) & 1 == 1
+        out_offsets, out_labels, in_offsets, in_labels = self.labelling
+        return _share_label(out_labels, out_offsets[cu], out_offsets[cu + 1],
+                            in_labels, in_offsets[cv], in_offsets[cv + 1])
+
+    def save(self, path):
+        """Write the index to path so it can be reloaded without preprocessing."""
+        data = {"labels": self.labels, "component": self.component.tobytes(), "kind": self.kind}
+        if self.kind == "bitset":
+            width = (len(self.rows) + 7) // 8
+            data["rows"] = b"".join(row.to_bytes(width, "little") for row in self.rows)
+        else:
+            data["labelling"] = [a.tobytes() for a in self.labelling]
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        component = array('q')
+        component.frombytes(data["component"])
+        if data["kind"] == "bitset":
+            blob = data["rows"]
+            count = max(component, default=0) + 1
+            width = (count + 7) // 8
+            rows = [int.from_bytes(blob[i * width:(i + 1) * width], "little") for i in range(count)]
+            return cls(data["labels"], component, "bitset", rows=rows)
+        labelling = []
+        for raw in data["labelling"]:
+            a = array('q')
+            a.frombytes(raw)
+            labelling.append(a)
+        return cls(data["labels"], component, "2hop", labelling=labelling)
+
+
+def build_reachability_index(graph, bitset_limit=4096):
+    # Input:
+    # - graph: a directed graph in adjacency list format, or a CSRGraph
+    # - bitset_limit: metagraphs with at most this many components get a
+    #   bitset closure; larger ones get 2-hop labels
+    #
+    # Output:
+    # - index: a ReachabilityIndex answering reachable(u, v)
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph)
+    metagraph, ccnum, _, _, _ = strongly_connected_components(csr)
+    component = array('q', (ccnum[label] for label in csr.labels))
+    if len(metagraph) <= bitset_limit:
+        return ReachabilityIndex(csr.labels, component, "bitset", rows=_closure(metagraph))
+    return ReachabilityIndex(csr.labels, component, "2hop", labelling=_two_hop(metagraph))
+
+
+def _closure(metagraph):
+    # Successors always have smaller numbers, so they are done first.
+    rows = [0] * (len(metagraph) + 1)
+    for c in range(1, len(metagraph) + 1):
+        row = 1 << c
+        for d in metagraph[c]:
+            row |= rows[d]
+        rows[c] = row
+    return rows
+
+
+def _two_hop(metagraph):
+    k = len(metagraph)
+    successors = [[]] + [metagraph[c] for c in range(1, k + 1)]
+    predecessors = [[] for _ in range(k + 1)]
+    for c in range(1, k + 1):
+        for d in successors[c]:
+            predecessors[d].append(c)
+    order = sorted(range(1, k + 1),
+                   key=lambda c: (len(predecessors[c]) + 1) * (len(successors[c]) + 1),
+                   reverse=True)
+
+    # Landmarks are added in rank order, so every label list stays sorted.
+    label_out = [[] for _ in range(k + 1)]
+    label_in = [[] for _ in range(k + 1)]
+    for rank, r in enumerate(order):
+        for edges, own, other in ((successors, label_out, label_in),
+                                  (predecessors, label_in, label_out)):
+            # Forward pass: r reaches w, so rank joins L_in[w]; the backward
+            # pass is the mirror image with L_out.
+            seen = {r}
+            queue = deque([r])
+            while queue:
+                w = queue.popleft()
+                if w != r and _share_sorted(own[r], other[w]):
+                    continue
+                other[w].append(rank)
+                for x in edges[w]:
+                    if x not in seen:
+                        seen.add(x)
+                        queue.append(x)
+
+    out_offsets, out_labels = _flatten(label_out)
+    in_offsets, in_labels = _flatten(label_in)
+    return out_offsets, out_labels, in_offsets, in_labels
+
+
+def _flatten(lists):
+    offsets = array('q', [0])
+    values = array('q')
+    for items in lists:
+        values.extend(items)
+        offsets.append(len(values))
+    return offsets, values
+
+
+def _share_sorted(a, b):
+    return _share_label(a, 0, len(a), b, 0, len(b))
+
+
+def _share_label(a, i, i_end, b, j, j_end):
+    """Return True if the sorted slices a[i:i_end] and b[j:j_end] have a common value."""
+    while i < i_end and j < j_end:
+        if a[i] == b[j]:
+            return True
+        if a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_bfs_path = pathlib.Path(__file__).parent / "01_breadth_first_search.py"
+_bfs_spec = importlib.util.spec_from_file_location("breadth_first_search", _bfs_path)
+_bfs_mod = importlib.util.module_from_spec(_bfs_spec)
+_bfs_spec.loader.exec_module(_bfs_mod)
+breadth_first_search = _bfs_mod.breadth_first_search
+
+
+def _random_graph(n, p, seed):
+    import random
+    rng = random.Random(seed)
+    return {v: [u for u in range(n) if u != v and rng.random() < p] for v in range(n)}
+
+
+def test_matches_breadth_first_search():
+    for seed in range(5):
+        graph = _random_graph(30, 0.05, seed)
+        for limit in (4096, 0):
+            index = build_reachability_index(graph, bitset_limit=limit)
+            assert index.kind == ("bitset" if limit else "2hop")
+            for u in graph:
+                dist, _ = breadth_first_search(graph, u)
+                for v in graph:
+                    assert index.reachable(u, v) == (v in dist)
+
+
+def test_cycles_share_a_component():
+    graph = {"A": ["B"], "B": ["C"], "C": ["A", "D"], "D": [], "E": ["D"]}
+    for limit in (4096, 0):
+        index = build_reachability_index(graph, bitset_limit=limit)
+        assert index.reachable("C", "B") and index.reachable("A", "D")
+        assert not index.reachable("D", "A") and not index.reachable("E", "A")
+
+
+def test_save_and_load():
+    import os, tempfile
+    graph = _random_graph(25, 0.08, 11)
+    for limit in (4096, 0):
+        index = build_reachability_index(CSRGraph.from_adjacency(graph), bitset_limit=limit)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "reach.idx")
+            index.save(path)
+            loaded = ReachabilityIndex.load(path)
+        assert loaded.kind == index.kind
+        assert all(loaded.reachable(u, v) == index.reachable(u, v) for u in graph for v in graph)
+
+
+if __name__ == "__main__":
+    test_matches_breadth_first_search()
+    test_cycles_share_a_component()
+    test_save_and_load()
+    print("All tests passed.")
@@ -0,0 +1,395 @@
+"""
+Algorithm
+=====================
+Dinic's algorithm:
+- Repeat until the sink is unreachable in the residual graph:
+    - BFS from the source over edges with residual capacity > 0 to assign each
+      vertex its level (distance from the source); this is the level graph
+    - Find a blocking flow in the level graph: repeatedly walk forward along
+      edges (u, v) with level[v] = level[u] + 1 and capacity left, augmenting
+      whenever the sink is reached. Each vertex keeps a pointer to its current
+      edge, so an edge that is saturated or leads to a dead end is never
+      looked at again in this phase
+
+Highest-label push-relabel:
+- Give the source height V and saturate every edge leaving it; set every other
+  height to its BFS distance to the sink in the residual graph
+- While some vertex other than the source and sink has excess flow, take the
+  active vertex with the greatest height and discharge it:
+    - Push excess along edges (u, v) with capacity left and h(u) = h(v) + 1
+    - If no such edge remains, relabel: h(u) = 1 + min h(v) over edges with
+      capacity left
+- Gap heuristic: when no vertex is left at some height g < V, every vertex
+  above g can no longer reach the sink, so lift it to V + 1 at once; its excess
+  then drains back to the source
+
+Bipartite matching networks: when every capacity is 1 and the edges only run
+source -> L, L -> R and R -> sink for disjoint vertex sets L and R, the maximum
+flow is a maximum matching between L and R; hopcroft_karp() finds it and each
+matched pair (u, v) becomes one unit of flow along source -> u -> v -> sink.
+
+max_flow(method="auto") sends such networks to Hopcroft-Karp, and otherwise
+picks push-relabel for dense networks (E >= V^1.5) and Dinic's for the rest.
+
+Correctness
+=====================
+Dinic's: each phase ends with no source-sink path in the level graph, so the
+next BFS finds a strictly longer shortest path; after at most V phases the sink
+is unreachable and, by the max-flow min-cut theorem, the flow is maximum.
+Push-relabel: the heights stay valid (h(u) <= h(v) + 1 on residual edges), so
+there is never a residual path from source to sink; when no vertex has excess
+the preflow is a flow, and a flow with no augmenting path is maximum.
+
+Runtime
+=====================
+- Dinic's: O(V^2 E) in general; O(E sqrt(V)) on unit-capacity networks such as
+  bipartite matchings
+- Highest-label push-relabel: O(V^2 sqrt(E))
+- Bipartite matching networks: O(E sqrt(V)) with Hopcroft-Karp, plus an O(E)
+  scan to recognise them
+- Both work on a ResidualNetwork (22_residual_network.py), in which edge e and
+  its reverse e ^ 1 sit side by side, so an update is two list writes
+"""
+from collections import deque
+import importlib.util, pathlib
+from array import array
+
+_mod_path = pathlib.Path(__file__).parent / "22_residual_network.py"
+_spec = importlib.util.spec_from_file_location("residual_network", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+ResidualNetwork = _mod.ResidualNetwork
+CSRGraph = _mod.CSRGraph
+
+_mod_path = pathlib.Path(__file__).parent / "26_hopcroft_karp.py"
+_spec = importlib.util.spec_from_file_location("hopcroft_karp", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+hopcroft_karp = _mod.hopcroft_karp
+
+
+def max_flow(graph, capacities, source, sink, method="auto"):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a
+    #   CSRGraph whose edge weights are the capacities
+    # - capacities: dict of (u, v) -> capacity; pass None for a CSRGraph
+    # - source: source vertex
+    # - sink: sink vertex
+    # - method: "dinic", "push_relabel", "matching" (unit-capacity bipartite
+    #   networks only), or "auto"
+    #
+    # Output:
+    # - flow: dict of (u, v) -> flow used on each original edge
+    # - C: the value of the maximum flow from source to sink
+    if method == "auto":
+        residual = ResidualNetwork(graph, capacities)
+        if _bipartite_edges(residual, residual.index[source], residual.index[sink]):
+            method = "matching"
+        else:
+            dense = residual.num_edges >= residual.n ** 1.5
+            method = "push_relabel" if dense else "dinic"
+    else:
+        residual = None
+    if method == "dinic":
+        return dinic(graph, capacities, source, sink, residual)
+    if method == "push_relabel":
+        return push_relabel(graph, capacities, source, sink, residual)
+    if method == "matching":
+        return matching_flow(graph, capacities, source, sink, residual)
+    raise ValueError(f"unknown method: {method!r}")
+
+
+def dinic(graph, capacities, source, sink, residual=None):
+    # Input/Output: the same as max_flow(); residual is an optional
+    # ResidualNetwork already built for graph and capacities
+    residual = residual or ResidualNetwork(graph, capacities)
+    C = _dinic(residual, residual.index[source], residual.index[sink])
+    return residual.flow(), C
+
+
+def push_relabel(graph, capacities, source, sink, residual=None):
+    # Input/Output: the same as max_flow(); residual is an optional
+    # ResidualNetwork already built for graph and capacities
+    residual = residual or ResidualNetwork(graph, capacities)
+    C = _push_relabel(residual, residual.index[source], residual.index[sink])
+    return residual.flow(), C
+
+
+def matching_flow(graph, capacities, source, sink, residual=None):
+    # Input/Output: the same as max_flow(); residual is an optional
+    # ResidualNetwork already built for graph and capacities
+    #   Raises ValueError unless the network is a unit-capacity bipartite one.
+    residual = residual or ResidualNetwork(graph, capacities)
+    sides = _bipartite_edges(residual, residual.index[source], residual.index[sink])
+    if sides is None:
+        raise ValueError("not a unit-capacity bipartite network")
+    from_source, to_sink, middle = sides
+    pairs = {}
+    for u, v in middle:
+        pairs.setdefault(u, []).append(v)
+    matching = hopcroft_karp(pairs)
+    for u, v in matching.items():
+        residual.push(2 * from_source[u], 1)
+        residual.push(2 * middle[(u, v)], 1)
+        residual.push(2 * to_sink[v], 1)
+    return residual.flow(), len(matching)
+
+
+def _bipartite_edges(residual, s, t):
+    """If every edge has capacity 1 and runs s -> L, L -> R or R -> t for
+    disjoint L and R, return the edge ids ({u in L: id of (s, u)},
+    {v in R: id of (v, t)}, {(u, v): id}); otherwise return None."""
+    head, original = residual.head, residual.original
+    from_source, to_sink, middle = {}, {}, {}
+    for i in range(residual.num_edges):
+        if original[i] != 1:
+            return None
+        u, v = head[2 * i + 1], head[2 * i]
+        if u == s and v != t:
+            from_source[v] = i
+        elif v == t and u != s:
+            to_sink[u] = i
+        else:
+            middle[(u, v)] = i
+    if not from_source.keys().isdisjoint(to_sink):
+        return None
+    for u, v in middle:
+        if u not in from_source or v not in to_sink:
+            return None
+    return from_source, to_sink, middle
+
+
+def _dinic(residual, s, t):
+    head, cap, edges = residual.head, residual.cap, residual.edges
+    n = residual.n
+    C = 0
+    while s != t:
+        level = array('q', [-1]) * n
+        level[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for e in edges[u]:
+                if cap[e] > 0 and level[head[e]] < 0:
+                    level[head[e]] = level[u] + 1
+                    queue.append(head[e])
+        if level[t] < 0:
+            # The failed BFS marks the source side of a minimum cut.
+            residual.reached = level
+            return C
+
+        # Blocking flow by iterative DFS; path holds the edges from s to the
+        # current vertex, and pointer[u] is u's current edge (in edges[u]).
+        pointer = [0] * n
+        path = []
+        u = s
+        while True:
+            if u == t:
+                bottleneck = min(cap[e] for e in path)
+                for e in path:
+                    cap[e] -= bottleneck
+                    cap[e ^ 1] += bottleneck
+                C += bottleneck
+                # Retreat to the tail of the first saturated edge.
+                cut = next(k for k, e in enumerate(path) if cap[e] == 0)
+                u = head[path[cut] ^ 1]
+                del path[cut:]
+                continue
+            out = edges[u]
+            end = len(out)
+            i = pointer[u]
+            while i < end:
+                e = out[i]
+                if cap[e] > 0 and level[head[e]] == level[u] + 1:
+                    break
+                i += 1
+            pointer[u] = i
+            if i < end:
+                path.append(out[i])
+                u = head[out[i]]
+            else:
+                # Dead end: no flow can pass through u in this phase.
+                level[u] = -1
+                if not path:
+                    break
+                e = path.pop()
+                u = head[e ^ 1]
+                pointer[u] += 1
+    return C
+
+
+def _push_relabel(residual, s, t):
+    head, cap, edges = residual.head, residual.cap, residual.edges
+    n = residual.n
+    if s == t:
+        return 0
+
+    # Initial heights: BFS distance to t over edges with capacity left.
+    height = array('q', [n]) * n
+    height[t] = 0
+    queue = deque([t])
+    while queue:
+        v = queue.popleft()
+        for e in edges[v]:
+            u = head[e]
+            if cap[e ^ 1] > 0 and height[u] == n and u != s:
+                height[u] = height[v] + 1
+                queue.append(u)
+    height[s] = n
+
+    excess = [0] * n
+    for e in edges[s]:
+        if cap[e] > 0:
+            excess[head[e]] += cap[e]
+            excess[s] -= cap[e]
+            cap[e ^ 1] += cap[e]
+            cap[e] = 0
+
+    # buckets[h] holds the active vertices at height h; count[h] all vertices.
+    max_height = 2 * n
+    buckets = [[] for _ in range(max_height + 1)]
+    count = [0] * (max_height + 1)
+    for v in range(n):
+        count[height[v]] += 1
+        if v != s and v != t and excess[v] > 0:
+            buckets[height[v]].append(v)
+    pointer = [0] * n
+    highest = max_height
+
+    while highest >= 0:
+        if not buckets[highest]:
+            highest -= 1
+            continue
+        u = buckets[highest].pop()
+        # Discharge u.
+        while excess[u] > 0:
+            i = pointer[u]
+            if i == len(edges[u]):
+                # Relabel.
+                old = height[u]
+                new = max_height
+                for e in edges[u]:
+                    if cap[e] > 0 and height[head[e]] + 1 < new:
+                        new = height[head[e]] + 1
+                count[old] -= 1
+                height[u] = new
+                count[new] += 1
+                pointer[u] = 0
+                if count[old] == 0 and old < n:
+                    # Gap: everything between old and n is cut off from t.
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n + 1
+                            count[n + 1] += 1
+                continue
+            e = edges[u][i]
+            v = head[e]
+            if cap[e] > 0 and height[u] == height[v] + 1:
+                delta = min(excess[u], cap[e])
+                cap[e] -= delta
+                cap[e ^ 1] += delta
+                excess[u] -= delta
+                if excess[v] == 0 and v != s and v != t:
+                    buckets[height[v]].append(v)
+                excess[v] += delta
+            else:
+                pointer[u] = i + 1
+        # Only vertices below u were activated, so nothing is above it.
+        highest = max(highest, height[u])
+    return excess[t]
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_ek_path = pathlib.Path(__file__).parent / "11_edmonds_karp.py"
+_ek_spec = importlib.util.spec_from_file_location("edmonds_karp", _ek_path)
+_ek_mod = importlib.util.module_from_spec(_ek_spec)
+_ek_spec.loader.exec_module(_ek_mod)
+edmonds_karp = _ek_mod.edmonds_karp
+
+
+def _is_valid_flow(graph, capacities, flow, source, sink, C):
+    balance = {}
+    for (u, v), f in flow.items():
+        if not 0 <= f <= capacities[(u, v)]:
+            return False
+        balance[u] = balance.get(u, 0) - f
+        balance[v] = balance.get(v, 0) + f
+    return all(b == 0 for v, b in balance.items() if v not in (source, sink)) \
+        and balance.get(sink, 0) == C
+
+
+def _random_network(n, p, seed):
+    import random
+    rng = random.Random(seed)
+    graph = {v: [] for v in range(n)}
+    capacities = {}
+    for u in range(n):
+        for v in range(n):
+            if u != v and rng.random() < p:
+                graph[u].append(v)
+                capacities[(u, v)] = rng.randint(1, 20)
+    return graph, capacities
+
+
+def test_matches_edmonds_karp():
+    for seed in range(20):
+        graph, capacities = _random_network(12, 0.3, seed)
+        _, expected = edmonds_karp(graph, capacities, 0, 11)
+        for method in ("dinic", "push_relabel", "auto"):
+            flow, C = max_flow(graph, capacities, 0, 11, method=method)
+            assert C == expected, (seed, method, C, expected)
+            assert _is_valid_flow(graph, capacities, flow, 0, 11, C)
+
+
+def test_bipartite_assignment():
+    # Workers w0..w2 to jobs j0..j2, every edge with capacity 1.
+    graph = {"s": ["w0", "w1", "w2"], "w0": ["j0", "j1"], "w1": ["j0"], "w2": ["j1", "j2"],
+             "j0": ["t"], "j1": ["t"], "j2": ["t"], "t": []}
+    capacities = {(u, v): 1 for u in graph for v in graph[u]}
+    for method in ("dinic", "push_relabel", "matching", "auto"):
+        flow, C = max_flow(graph, capacities, "s", "t", method=method)
+        assert C == 3 and flow[("w1", "j0")] == 1 and flow[("w2", "j2")] == 1
+        assert _is_valid_flow(graph, capacities, flow, "s", "t", C)
+
+
+def test_matching_detection():
+    graph = {"s": ["w0", "w1"], "w0": ["j0"], "w1": ["j0"], "j0": ["t"], "t": []}
+    capacities = {(u, v): 1 for u in graph for v in graph[u]}
+    residual = ResidualNetwork(graph, capacities)
+    s, t = residual.index["s"], residual.index["t"]
+    assert _bipartite_edges(residual, s, t) is not None
+    # A capacity above 1, or a path s -> w0 -> t, rules out the matching shortcut.
+    for extra in ({("w0", "j0"): 2}, {("w0", "t"): 1}):
+        changed = {u: list(vs) for u, vs in graph.items()}
+        for u, v in extra:
+            if v not in changed[u]:
+                changed[u].append(v)
+        caps = {**capacities, **extra}
+        residual = ResidualNetwork(changed, caps)
+        assert _bipartite_edges(residual, s, t) is None
+        assert max_flow(changed, caps, "s", "t")[1] == max_flow(changed, caps, "s", "t", "dinic")[1]
+        try:
+            max_flow(changed, caps, "s", "t", method="matching")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_csr_graph_matches_dict():
+    graph, capacities = _random_network(10, 0.35, 3)
+    csr = CSRGraph.from_adjacency(graph, capacities)
+    for method in ("dinic", "push_relabel"):
+        assert max_flow(csr, None, 0, 9, method=method) == max_flow(graph, capacities, 0, 9, method=method)
+
+
+if __name__ == "__main__":
+    test_matches_edmonds_karp()
+    test_bipartite_assignment()
+    test_matching_detection()
+    test_csr_graph_matches_dict()
+    print("All tests passed.")
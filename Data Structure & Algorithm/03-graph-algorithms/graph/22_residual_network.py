@@ -0,0 +1,215 @@
+"""
+Representation
+=====================
+The residual network of a flow problem, stored in flat lists:
+- Relabel every vertex to an integer 0..n-1 (labels / index, as in CSRGraph)
+- Original edge i becomes residual edge 2i; its reverse edge is 2i + 1, so the
+  partner of any residual edge e is e ^ 1
+- head[e]: the vertex edge e points to; the tail of e is head[e ^ 1]
+- cap[e]: residual capacity; cap[2i] starts at the capacity of edge i and
+  cap[2i + 1] at 0
+- edges[u]: ids of the residual edges leaving u
+
+Pushing d units along e is cap[e] -= d and cap[e ^ 1] += d, and the flow on
+original edge i is always original[i] - cap[2i].
+
+Every search from the source records which vertices it reached (reached[v] is
+-1 for the others). Once a search fails to reach the sink, the reached vertices
+are the source side S of a minimum cut, and the cut edges are the original
+edges from S to V - S, so min_cut() needs no search of its own.
+
+
+Correctness
+=====================
+Every original edge has exactly one reverse edge, stored at the partner index,
+so cap[e] + cap[e ^ 1] stays equal to the original capacity no matter how flow
+is pushed back and forth. Antiparallel edges (u, v) and (v, u) get separate
+pairs, so each keeps its own flow.
+
+
+Runtime
+=====================
+Building the network takes O(V + E) once. Afterwards a push is two list
+writes and an edge scan walks a list of ints, instead of nested dict lookups
+and dict insertions for reverse edges that did not exist yet. head and cap are
+plain lists rather than array('q'): reading an array element creates a new
+int object every time, which makes the augmenting-path loops about twice as
+slow as the dict version, while a list read returns the stored object.
+"""
+from collections import deque
+import importlib.util, pathlib
+from array import array
+
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+CSRGraph = _csr_mod.CSRGraph
+is_csr_graph = _csr_mod.is_csr_graph
+
+
+class ResidualNetwork:
+    def __init__(self, graph, capacities):
+        # Input:
+        # - graph: a directed graph in adjacency list format, or a CSRGraph
+        #   whose edge weights are the capacities
+        # - capacities: dict of (u, v) -> capacity; pass None for a CSRGraph
+        if is_csr_graph(graph):
+            labels = graph.labels
+            tails = array('q')
+            for u in range(graph.n):
+                tails.extend([u] * (graph.offsets[u + 1] - graph.offsets[u]))
+            heads, caps = graph.targets, graph.weights
+        else:
+            labels = list(graph)
+            seen = set(labels)
+            for neighbors in graph.values():
+                for v in neighbors:
+                    if v not in seen:
+                        seen.add(v)
+                        labels.append(v)
+            index = {label: i for i, label in enumerate(labels)}
+            tails = array('q', (index[u] for u, _ in capacities))
+            heads = array('q', (index[v] for _, v in capacities))
+            caps = list(capacities.values())
+        self.labels = list(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.n = len(self.labels)
+        self.num_edges = len(heads)
+
+        self.original = list(caps)
+        self.head = [0] * (2 * self.num_edges)
+        self.cap = [0] * (2 * self.num_edges)
+        self.edges = [[] for _ in range(self.n)]
+        for i in range(self.num_edges):
+            u, v = tails[i], heads[i]
+            self.head[2 * i] = v
+            self.head[2 * i + 1] = u
+            self.cap[2 * i] = self.original[i]
+            self.edges[u].append(2 * i)
+            self.edges[v].append(2 * i + 1)
+        self.reached = None
+
+    def tail(self, e):
+        """Return the vertex residual edge e leaves from."""
+        return self.head[e ^ 1]
+
+    def out_edges(self, u):
+        """Return the ids of the residual edges leaving vertex id u."""
+        return self.edges[u]
+
+    def push(self, e, amount):
+        """Send amount units of flow along residual edge e."""
+        self.cap[e] -= amount
+        self.cap[e ^ 1] += amount
+
+    def find_path(self, s, t, minimum=0):
+        """Return the edge ids of a fewest-edges s-t path using only edges with
+        residual capacity > 0 and >= minimum, or None if there is none (always
+        None when s == t: a flow from a vertex to itself has nothing to push)."""
+        head, cap, edges = self.head, self.cap, self.edges
+        parent = [-1] * self.n
+        parent[s] = -2
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for e in edges[u]:
+                if cap[e] > 0 and cap[e] >= minimum:
+                    v = head[e]
+                    if parent[v] == -1:
+                        parent[v] = e
+                        if v == t:
+                            queue.clear()
+                            break
+                        queue.append(v)
+        self.reached = parent
+        if s == t or parent[t] == -1:
+            return None
+        path = []
+        v = t
+        while v != s:
+            e = parent[v]
+            path.append(e)
+            v = head[e ^ 1]
+        path.reverse()
+        return path
+
+    def augment(self, path, limit=None):
+        """Push the bottleneck capacity (at most limit) along path; return the
+        amount pushed."""
+        cap = self.cap
+        bottleneck = min(cap[e] for e in path)
+        if limit is not None and limit < bottleneck:
+            bottleneck = limit
+        for e in path:
+            cap[e] -= bottleneck
+            cap[e ^ 1] += bottleneck
+        return bottleneck
+
+    def min_cut(self):
+        """Return (source_side, cut_edges) from the last search, which must
+        have failed to reach the sink: the set of vertices it reached and the
+        list of original edges (u, v) leaving that set."""
+        if self.reached is None:
+            raise ValueError("no search has been run")
+        reached, labels, head = self.reached, self.labels, self.head
+        source_side = {labels[v] for v in range(self.n) if reached[v] != -1}
+        cut_edges = [(labels[head[2 * i + 1]], labels[head[2 * i]])
+                     for i in range(self.num_edges)
+                     if reached[head[2 * i + 1]] != -1 and reached[head[2 * i]] == -1]
+        return source_side, cut_edges
+
+    def flow(self):
+        """Return {(u, v): flow} for every original edge."""
+        labels, head = self.labels, self.head
+        return {(labels[head[2 * i + 1]], labels[head[2 * i]]): self.original[i] - self.cap[2 * i]
+                for i in range(self.num_edges)}
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def test_paired_edges():
+    graph = {"s": ["a", "b"], "a": ["b", "t"], "b": ["a", "t"], "t": []}
+    capacities = {("s", "a"): 4, ("s", "b"): 2, ("a", "b"): 1, ("b", "a"): 3,
+                  ("a", "t"): 2, ("b", "t"): 5}
+    residual = ResidualNetwork(graph, capacities)
+    assert residual.num_edges == 6
+    for e in range(2 * residual.num_edges):
+        assert residual.head[e ^ 1] == residual.tail(e)
+        assert residual.tail(e) == residual.index[list(capacities)[e // 2][e % 2]]
+    assert sorted(residual.out_edges(residual.index["a"])) == [1, 4, 7, 8]
+
+
+def test_augment_and_flow():
+    graph = {"s": ["a"], "a": ["t"], "t": []}
+    capacities = {("s", "a"): 5, ("a", "t"): 3}
+    residual = ResidualNetwork(graph, capacities)
+    s, t = residual.index["s"], residual.index["t"]
+    path = residual.find_path(s, t)
+    assert path == [0, 2]
+    assert residual.augment(path) == 3
+    assert residual.find_path(s, t) is None
+    assert residual.find_path(s, s) is None
+    assert residual.flow() == {("s", "a"): 3, ("a", "t"): 3}
+    assert residual.min_cut() == ({"s", "a"}, [("a", "t")])
+    residual.push(1, 1)
+    assert residual.cap[0] == 3 and residual.cap[1] == 2
+    assert residual.augment([1], limit=1) == 1 and residual.cap[0] == 4
+
+
+def test_csr_graph_matches_dict():
+    graph = {0: [1, 2], 1: [2], 2: []}
+    capacities = {(0, 1): 2, (0, 2): 1, (1, 2): 4}
+    residual = ResidualNetwork(CSRGraph.from_adjacency(graph, capacities), None)
+    expected = ResidualNetwork(graph, capacities)
+    assert residual.head == expected.head and residual.edges == expected.edges
+    assert residual.cap == expected.cap
+
+
+if __name__ == "__main__":
+    test_paired_edges()
+    test_augment_and_flow()
+    test_csr_graph_matches_dict()
+    print("All tests passed.")
@@ -0,0 +1,177 @@
+"""
+Algorithm
+=====================
+Keep the residual network of the last maximum flow and update it in place
+when capacities change, instead of starting again from zero flow:
+- First solve: Dinic's algorithm (dinic()) on a fresh ResidualNetwork
+- Capacity of edge (u, v) changes to c while it carries flow f:
+    - c >= f: the flow stays feasible; only the residual capacity of (u, v)
+      changes, to c - f
+    - c < f: cut the flow on (u, v) down to c. That leaves u with r = f - c
+      units of excess and v with r units of deficit. Repair it locally:
+        - Reroute: push up to r units from u to v along other residual paths;
+          this keeps the flow value unchanged
+        - Whatever is left is pushed back from u to the source and pulled
+          from the sink to v along residual paths, lowering the flow value
+- Re-solve: run dinic() again on the same residual network. It starts from
+  the current flow, so it only has to push the flow the changes made room for
+
+Correctness
+=====================
+After every repair the flow obeys the capacities and conservation again. The
+reroute and drain paths always exist while r > 0: by flow decomposition, the r
+units that reached u came from the source along flow-carrying edges, whose
+reverse edges form a residual path from u back to the source; likewise the
+sink reaches v through the reverse edges of the flow v used to forward. Dinic's
+algorithm accepts any feasible starting flow and stops only when there is no
+augmenting path, so the re-solve returns a maximum flow for the new capacities.
+
+Runtime
+=====================
+- First solve: O(V^2 E), as dinic()
+- Capacity change: O(1) for an increase or a decrease above the current flow;
+  otherwise one BFS per repair path
+- Re-solve: one BFS when nothing changed, and in general only as many phases
+  as the changes need, compared with a full solve from zero flow
+"""
+import importlib.util, pathlib
+
+_mod_path = pathlib.Path(__file__).parent / "21_max_flow.py"
+_spec = importlib.util.spec_from_file_location("max_flow", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dinic = _mod.dinic
+ResidualNetwork = _mod.ResidualNetwork
+CSRGraph = _mod.CSRGraph
+
+
+class IncrementalMaxFlow:
+    def __init__(self, graph, capacities, source, sink):
+        # Input:
+        # - graph: a simple, directed graph in adjacency list format, or a
+        #   CSRGraph whose edge weights are the capacities
+        # - capacities: dict of (u, v) -> capacity; pass None for a CSRGraph
+        # - source: source vertex
+        # - sink: sink vertex
+        self.residual = ResidualNetwork(graph, capacities)
+        self.source = source
+        self.sink = sink
+        residual = self.residual
+        labels, head = residual.labels, residual.head
+        self.edge = {(labels[head[2 * i + 1]], labels[head[2 * i]]): i
+                     for i in range(residual.num_edges)}
+        self.value = 0
+
+    def solve(self):
+        # Output: the same as edmonds_karp()
+        # - flow: dict of (u, v) -> flow used on each original edge
+        # - C: the value of the maximum flow from source to sink
+        flow, pushed = dinic(None, None, self.source, self.sink, self.residual)
+        self.value += pushed
+        return flow, self.value
+
+    def set_capacity(self, u, v, capacity):
+        """Change the capacity of edge (u, v), keeping the current flow feasible."""
+        residual = self.residual
+        i = self.edge[(u, v)]
+        flow = residual.original[i] - residual.cap[2 * i]
+        residual.original[i] = capacity
+        if capacity >= flow:
+            residual.cap[2 * i] = capacity - flow
+            return
+        residual.cap[2 * i] = 0
+        residual.cap[2 * i + 1] = capacity
+        self.value -= self._repair(residual.index[u], residual.index[v], flow - capacity)
+
+    def update(self, capacities):
+        """Apply set_capacity() to every (u, v) -> capacity entry."""
+        for (u, v), capacity in capacities.items():
+            self.set_capacity(u, v, capacity)
+
+    def _repair(self, u, v, excess):
+        # u has excess units of inflow it can no longer forward over (u, v),
+        # and v is short by the same amount. Returns how much the flow value
+        # had to drop.
+        residual = self.residual
+        s, t = residual.index[self.source], residual.index[self.sink]
+        excess -= self._push(u, v, excess)
+        if excess > 0:
+            if u != s:
+                self._push(u, s, excess)
+            if v != t:
+                self._push(t, v, excess)
+        return excess
+
+    def _push(self, u, v, amount):
+        """Send up to amount units from u to v along residual paths."""
+        residual = self.residual
+        pushed = 0
+        while pushed < amount:
+            path = residual.find_path(u, v)
+            if path is None:
+                break
+            pushed += residual.augment(path, amount - pushed)
+        return pushed
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_ek_path = pathlib.Path(__file__).parent / "11_edmonds_karp.py"
+_ek_spec = importlib.util.spec_from_file_location("edmonds_karp", _ek_path)
+_ek_mod = importlib.util.module_from_spec(_ek_spec)
+_ek_spec.loader.exec_module(_ek_mod)
+edmonds_karp = _ek_mod.edmonds_karp
+_is_valid_flow = _mod._is_valid_flow
+_random_network = _mod._random_network
+
+
+def test_decrease_reroutes_flow():
+    # s -> a -> t carries 4; cutting a -> t to 1 reroutes 2 units via a -> b -> t
+    # and drops the value by 1.
+    graph = {"s": ["a"], "a": ["t", "b"], "b": ["t"], "t": []}
+    capacities = {("s", "a"): 4, ("a", "t"): 4, ("a", "b"): 2, ("b", "t"): 5}
+    solver = IncrementalMaxFlow(graph, capacities, "s", "t")
+    assert solver.solve()[1] == 4
+    solver.set_capacity("a", "t", 1)
+    assert solver.value == 3
+    flow, C = solver.solve()
+    capacities[("a", "t")] = 1
+    assert C == 3 and _is_valid_flow(graph, capacities, flow, "s", "t", C)
+
+
+def test_matches_edmonds_karp_after_changes():
+    import random
+    rng = random.Random(5)
+    for seed in range(5):
+        graph, capacities = _random_network(12, 0.3, seed)
+        solver = IncrementalMaxFlow(graph, capacities, 0, 11)
+        solver.solve()
+        edges = list(capacities)
+        for _ in range(30):
+            changes = {e: rng.randint(0, 20) for e in rng.sample(edges, 3)}
+            solver.update(changes)
+            capacities.update(changes)
+            flow, C = solver.solve()
+            assert C == edmonds_karp(graph, capacities, 0, 11)[1]
+            assert _is_valid_flow(graph, capacities, flow, 0, 11, C)
+
+
+def test_csr_graph_and_source_edges():
+    graph, capacities = _random_network(10, 0.35, 8)
+    solver = IncrementalMaxFlow(CSRGraph.from_adjacency(graph, capacities), None, 0, 9)
+    solver.solve()
+    # Edges out of the source and into the sink need no drain on that side.
+    changes = {e: 0 for e in capacities if e[0] == 0 or e[1] == 9}
+    solver.update(changes)
+    capacities.update(changes)
+    flow, C = solver.solve()
+    assert C == 0 and _is_valid_flow(graph, capacities, flow, 0, 9, C)
+
+
+if __name__ == "__main__":
+    test_decrease_reroutes_flow()
+    test_matches_edmonds_karp_after_changes()
+    test_csr_graph_and_source_edges()
+    print("All tests passed.")
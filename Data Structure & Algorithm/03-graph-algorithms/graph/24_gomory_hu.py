@@ -0,0 +1,227 @@
+"""
+Algorithm
+=====================
+Gusfield's construction of a Gomory-Hu tree for an undirected graph with edge
+capacities. Number the vertices 0..n-1 and set parent[v] = 0 for every v:
+- For s = 1, ..., n-1, with t = parent[s]:
+    - Compute a minimum s-t cut in the original graph (dinic()); let X be its
+      source side (the side containing s) and f its value
+    - weight[s] = f
+    - Every other vertex v in X with parent[v] = t moves under s: parent[v] = s
+    - If parent[t] is in X, s takes t's place in the tree: parent[s] = parent[t],
+      parent[t] = s, and the two weights are swapped
+- The tree edges are (v, parent[v]) with capacity weight[v] for v = 1..n-1
+The minimum u-v cut of the graph is the smallest weight on the tree path
+between u and v (min_cut_value()).
+
+Parallel version: every s only needs its own min cut between s and parent[s].
+The cuts are computed ahead on a process pool for the current parents; when s
+comes up in order and its parent has changed since its cut was submitted, the
+cut is computed again for the new parent. The tree is exactly the sequential one.
+
+Correctness
+=====================
+Gomory and Hu showed that min cuts never need to cross: the cut found for s and
+t can be chosen so that it does not split any group of vertices already merged
+in the tree, so one min cut per tree edge (n - 1 in total) suffices. Gusfield
+showed that the cuts can be taken in the original graph, without contracting
+it, as long as the parents are updated as above. Each tree edge (v, parent[v])
+then splits the vertices into the two sides of a minimum v-parent[v] cut, and
+every pairwise minimum cut equals the lightest edge on the tree path.
+
+Runtime
+=====================
+- n - 1 max-flow computations, each O(V^2 E) with Dinic's algorithm, instead of
+  one per pair of vertices (n (n - 1) / 2)
+- The flows run in parallel on `workers` processes; a precomputed cut is only
+  thrown away when an earlier vertex changed its parent
+- min_cut_value(): O(V) walk along the tree path
+"""
+from collections import deque
+import importlib.util, pathlib
+
+_mod_path = pathlib.Path(__file__).parent / "21_max_flow.py"
+_spec = importlib.util.spec_from_file_location("max_flow", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dinic = _mod.dinic
+ResidualNetwork = _mod.ResidualNetwork
+CSRGraph = _mod.CSRGraph
+
+_csr_path = pathlib.Path(__file__).parent / "13_csr_graph.py"
+_csr_spec = importlib.util.spec_from_file_location("csr_graph", _csr_path)
+_csr_mod = importlib.util.module_from_spec(_csr_spec)
+_csr_spec.loader.exec_module(_csr_mod)
+is_csr_graph = _csr_mod.is_csr_graph
+
+_mod_path = pathlib.Path(__file__).parent / "28_process_pool.py"
+_spec = importlib.util.spec_from_file_location("process_pool", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+fork_available = _mod.fork_available
+fork_map = _mod.fork_map
+
+
+def gomory_hu_tree(graph, capacities=None, workers=None):
+    # Input:
+    # - graph: a simple, undirected graph in adjacency list format (every edge
+    #   listed in both directions), or a CSRGraph built with symmetric=True
+    # - capacities: dict of (u, v) -> capacity; either orientation of an edge
+    #   may be given. Not needed for a CSRGraph.
+    # - workers: number of worker processes; 1 runs everything in this
+    #   process, None uses one per CPU
+    #
+    # Output:
+    # - tree: a list of n - 1 edges (u, v, cut), one per non-root vertex u; cut
+    #   is the value of a minimum u-v cut in the graph
+    csr = graph if is_csr_graph(graph) else CSRGraph.from_adjacency(graph, capacities, symmetric=True)
+    n = csr.n
+    parent = [0] * n
+    weight = [0] * n
+    if n < 2:
+        return []
+
+    if workers == 1 or not fork_available():
+        cuts = (_min_cut(csr, s, parent[s]) for s in range(1, n))
+        for s, (value, side) in enumerate(cuts, 1):
+            _add_cut(parent, weight, s, value, side)
+    else:
+        _build_on_pool(csr, parent, weight, workers)
+
+    labels = csr.labels
+    return [(labels[v], labels[parent[v]], weight[v]) for v in range(1, n)]
+
+
+def min_cut_value(tree, u, v):
+    # Input:
+    # - tree: the output of gomory_hu_tree()
+    # - u, v: two distinct vertices
+    #
+    # Output:
+    # - the value of a minimum u-v cut: the lightest edge on the tree path
+    adjacency = {}
+    for a, b, cut in tree:
+        adjacency.setdefault(a, []).append((b, cut))
+        adjacency.setdefault(b, []).append((a, cut))
+    lightest = {u: float("inf")}
+    queue = deque([u])
+    while queue:
+        a = queue.popleft()
+        for b, cut in adjacency.get(a, ()):
+            if b not in lightest:
+                lightest[b] = min(lightest[a], cut)
+                queue.append(b)
+    return lightest[v]
+
+
+def _add_cut(parent, weight, s, value, side):
+    """Gusfield's update after the min cut between s and t = parent[s]."""
+    t = parent[s]
+    weight[s] = value
+    for v in range(len(parent)):
+        if v != s and side[v] and parent[v] == t:
+            parent[v] = s
+    if side[parent[t]]:
+        parent[s] = parent[t]
+        parent[t] = s
+        weight[s] = weight[t]
+        weight[t] = value
+
+
+def _min_cut(csr, s, t):
+    """Return the min s-t cut value and a bytes mask of its source side."""
+    residual = ResidualNetwork(csr, None)
+    _, value = dinic(None, None, csr.labels[s], csr.labels[t], residual)
+    return value, bytes(r != -1 for r in residual.reached)
+
+
+# Worker-process state, set once per worker by _init_worker().
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _worker_min_cut(s, t):
+    return t, _min_cut(_worker_graph, s, t)
+
+
+def _build_on_pool(csr, parent, weight, workers):
+    # fork_map() reads each (s, parent[s]) only when it submits s, after the
+    # cuts before the window have been added, so most cuts are for the final
+    # parent already.
+    n = csr.n
+    cuts = fork_map(_worker_min_cut, ((s, parent[s]) for s in range(1, n)), workers,
+                    _init_worker, (csr,))
+    for s, (t, (value, side)) in enumerate(cuts, 1):
+        if t != parent[s]:
+            # An earlier cut moved s under a new parent; redo this one.
+            value, side = _min_cut(csr, s, parent[s])
+        _add_cut(parent, weight, s, value, side)
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+def _random_undirected(n, p, seed):
+    import random
+    rng = random.Random(seed)
+    graph = {v: [] for v in range(n)}
+    capacities = {}
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < p:
+                graph[u].append(v)
+                graph[v].append(u)
+                capacities[(u, v)] = rng.randint(1, 10)
+    return graph, capacities
+
+
+def test_matches_pairwise_max_flow():
+    for seed in range(4):
+        graph, capacities = _random_undirected(10, 0.35, seed)
+        csr = CSRGraph.from_adjacency(graph, capacities, symmetric=True)
+        for workers in (1, 2):
+            tree = gomory_hu_tree(graph, capacities, workers=workers)
+            assert len(tree) == 9
+            for u in graph:
+                for v in graph:
+                    if u < v:
+                        _, expected = dinic(csr, None, u, v)
+                        assert min_cut_value(tree, u, v) == expected, (seed, u, v)
+
+
+def test_tree_edges_are_cuts():
+    # Removing tree edge (u, v) splits the vertices into the two sides of a
+    # minimum u-v cut, whose capacity in the graph is the edge's value.
+    graph, capacities = _random_undirected(12, 0.3, 9)
+    tree = gomory_hu_tree(graph, capacities, workers=1)
+    for i, (u, v, cut) in enumerate(tree):
+        side = {u}
+        queue = deque([u])
+        while queue:
+            a = queue.popleft()
+            for j, (x, y, _) in enumerate(tree):
+                if j != i and a in (x, y):
+                    b = y if a == x else x
+                    if b not in side:
+                        side.add(b)
+                        queue.append(b)
+        crossing = sum(c for (a, b), c in capacities.items() if (a in side) != (b in side))
+        assert v not in side and crossing == cut
+
+
+def test_path_graph():
+    graph = {"A": ["B"], "B": ["A", "C"], "C": ["B"]}
+    tree = gomory_hu_tree(graph, {("A", "B"): 3, ("C", "B"): 5}, workers=1)
+    assert min_cut_value(tree, "A", "C") == 3 and min_cut_value(tree, "B", "C") == 5
+
+
+if __name__ == "__main__":
+    test_matches_pairwise_max_flow()
+    test_tree_edges_are_cuts()
+    test_path_graph()
+    print("All tests passed.")
@@ -0,0 +1,317 @@
+"""
+Algorithm
+=====================
+Minimum-cost maximum flow: among all maximum flows from source to sink, find
+one with the smallest total cost sum(flow(u, v) * cost(u, v)). Residual edges
+cost cost(u, v) forwards and -cost(u, v) backwards.
+
+Successive shortest paths (method="ssp"):
+- Start from zero flow with potentials h = 0, or h = bellman_ford() distances
+  from the source when some costs are negative
+- Repeat:
+    - Run dijkstra() from the source over the residual edges with capacity
+      left, using the reduced costs cost(u, v) + h(u) - h(v) >= 0
+    - If the sink is unreachable, stop
+    - Augment along the shortest path by its bottleneck capacity
+    - Add the distances to the potentials: h(v) += dist(v)
+
+Cost scaling (method="cost_scaling", integer costs):
+- Compute any maximum flow with dinic(); what is left is to remove its negative
+  cost cycles, which never changes the flow value
+- Multiply every cost by n + 1 and set prices p = 0; the flow is then
+  eps-optimal (every residual edge has reduced cost c + p(u) - p(v) >= -eps)
+  for eps = the largest cost
+- Repeat refine(eps / 4) until eps = 1:
+    - Saturate every residual edge with negative reduced cost; this leaves some
+      vertices with excess flow and others with a deficit
+    - Push-relabel: an active vertex pushes excess along residual edges with
+      negative reduced cost; when it has none, lower its price to
+      max(p(v) - c(u, v)) - eps over its residual edges
+
+Correctness
+=====================
+SSP: the potentials keep every residual reduced cost non-negative, so dijkstra()
+applies, and the reduced path costs differ from the real ones by h(s) - h(t),
+the same for every path. Each augmentation therefore uses a cheapest path, so
+after every augmentation the flow is the cheapest one of its value; the last
+one is a maximum flow, hence a minimum-cost maximum flow.
+Cost scaling: refine(eps) ends with every residual edge at reduced cost >= -eps,
+so every residual cycle costs at least -n * eps. With costs scaled by n + 1 and
+eps = 1, a negative cycle would cost at least -n > -(n + 1), but scaled cycle
+costs are multiples of n + 1, so no negative cycle is left and the flow is optimal.
+
+Runtime
+=====================
+- SSP: one dijkstra() per augmentation, O(C * E log V) for integer capacities
+  and flow value C; competitive when few augmenting paths are needed
+- Cost scaling: O(V^2 E log(V * K)) for the largest cost K, independent of the
+  capacities and the flow value, which suits large instances
+"""
+from collections import deque
+import importlib.util, pathlib
+
+_mod_path = pathlib.Path(__file__).parent / "21_max_flow.py"
+_spec = importlib.util.spec_from_file_location("max_flow", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dinic = _mod.dinic
+ResidualNetwork = _mod.ResidualNetwork
+CSRGraph = _mod.CSRGraph
+
+_mod_path = pathlib.Path(__file__).parent / "05_dijkstra.py"
+_spec = importlib.util.spec_from_file_location("dijkstra", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+dijkstra = _mod.dijkstra
+
+_mod_path = pathlib.Path(__file__).parent / "06_bellman_ford.py"
+_spec = importlib.util.spec_from_file_location("bellman_ford", _mod_path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+bellman_ford = _mod.bellman_ford
+NegativeCycleError = _mod.NegativeCycleError
+
+
+def min_cost_flow(graph, capacities, costs, source, sink, method="ssp"):
+    # Input:
+    # - graph: a simple, directed graph in adjacency list format, or a
+    #   CSRGraph whose edge weights are the capacities
+    # - capacities: dict of (u, v) -> capacity; pass None for a CSRGraph
+    # - costs: dict of (u, v) -> cost per unit of flow (may be negative, but
+    #   no cycle of edges may have negative total cost)
+    # - source: source vertex
+    # - sink: sink vertex
+    # - method: "ssp" (successive shortest paths) or "cost_scaling" (integer
+    #   costs only)
+    #
+    # Output:
+    # - flow: dict of (u, v) -> flow used on each original edge
+    # - C: the value of the maximum flow from source to sink
+    # - total_cost: the smallest total cost of a flow of value C
+    #   Raises NegativeCycleError (method="ssp") if the costs form a negative
+    #   cycle reachable from source.
+    residual = ResidualNetwork(graph, capacities)
+    labels, head = residual.labels, residual.head
+    cost = [0] * (2 * residual.num_edges)
+    for i in range(residual.num_edges):
+        c = costs[(labels[head[2 * i + 1]], labels[head[2 * i]])]
+        cost[2 * i] = c
+        cost[2 * i + 1] = -c
+    s, t = residual.index[source], residual.index[sink]
+    if method == "ssp":
+        C = _successive_shortest_paths(residual, cost, s, t)
+    elif method == "cost_scaling":
+        if any(c != int(c) for c in cost):
+            raise ValueError("cost scaling needs integer costs")
+        _, C = dinic(None, None, source, sink, residual)
+        _cost_scaling(residual, cost)
+    else:
+        raise ValueError(f"unknown method: {method!r}")
+    total_cost = sum((residual.original[i] - residual.cap[2 * i]) * cost[2 * i]
+                     for i in range(residual.num_edges))
+    return residual.flow(), C, total_cost
+
+
+def _successive_shortest_paths(residual, cost, s, t):
+    head, cap, edges, n = residual.head, residual.cap, residual.edges, residual.n
+    ids = list(range(n))
+    h = _initial_potentials(residual, cost, s)
+    inf = float('inf')
+    C = 0
+    while True:
+        # Residual edges with capacity left, weighted by reduced cost; the
+        # clamp only absorbs float round-off.
+        offsets, targets, weights = [0], [], []
+        for u in range(n):
+            for e in edges[u]:
+                if cap[e] > 0:
+                    targets.append(head[e])
+                    weights.append(max(0, cost[e] + h[u] - h[head[e]]))
+            offsets.append(len(targets))
+        dist, prev = dijkstra(CSRGraph(ids, offsets, targets, weights), s)
+        if dist[t] == inf:
+            return C
+
+        # dijkstra() reports vertices; take the cheapest edge between each pair.
+        path = []
+        v = t
+        while v != s:
+            u = prev[v]
+            path.append(min((e for e in edges[u] if head[e] == v and cap[e] > 0),
+                            key=lambda e: cost[e] + h[u] - h[v]))
+            v = u
+        path.reverse()
+        for v in range(n):
+            if dist[v] < inf:
+                h[v] += dist[v]
+        C += residual.augment(path)
+
+
+def _initial_potentials(residual, cost, s):
+    """Return zeros, or bellman_ford() distances when some cost is negative."""
+    n = residual.n
+    if all(c >= 0 for c in cost[0::2]):
+        return [0] * n
+    offsets, targets, weights = [0], [], []
+    for u in range(n):
+        for e in residual.edges[u]:
+            if residual.cap[e] > 0:
+                targets.append(residual.head[e])
+                weights.append(cost[e])
+        offsets.append(len(targets))
+    dist, _, _ = bellman_ford(CSRGraph(list(range(n)), offsets, targets, weights), s,
+                              method="queue")
+    # Vertices the source cannot reach never join a path, so any value works.
+    return [0 if dist[v] == float('inf') else dist[v] for v in range(n)]
+
+
+def _cost_scaling(residual, cost):
+    n = residual.n
+    scaled = [c * (n + 1) for c in cost]
+    price = [0] * n
+    eps = max((abs(c) for c in scaled), default=0)
+    while eps > 1:
+        eps = max(1, eps // 4)
+        _refine(residual, scaled, price, eps)
+
+
+def _refine(residual, cost, price, eps):
+    head, cap, edges, n = residual.head, residual.cap, residual.edges, residual.n
+    excess = [0] * n
+    for u in range(n):
+        for e in edges[u]:
+            v = head[e]
+            if cap[e] > 0 and cost[e] + price[u] - price[v] < 0:
+                excess[u] -= cap[e]
+                excess[v] += cap[e]
+                cap[e ^ 1] += cap[e]
+                cap[e] = 0
+
+    active = deque(v for v in range(n) if excess[v] > 0)
+    pointer = [0] * n
+    while active:
+        u = active.popleft()
+        # Discharge u.
+        out = edges[u]
+        while excess[u] > 0:
+            i = pointer[u]
+            if i == len(out):
+                # Relabel: the cheapest residual edge becomes admissible.
+                price[u] = max(price[head[e]] - cost[e] for e in out if cap[e] > 0) - eps
+                pointer[u] = 0
+                continue
+            e = out[i]
+            v = head[e]
+            if cap[e] > 0 and cost[e] + price[u] - price[v] < 0:
+                delta = min(excess[u], cap[e])
+                cap[e] -= delta
+                cap[e ^ 1] += delta
+                excess[u] -= delta
+                if excess[v] <= 0 < excess[v] + delta:
+                    active.append(v)
+                excess[v] += delta
+            else:
+                pointer[u] = i + 1
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_mf_path = pathlib.Path(__file__).parent / "21_max_flow.py"
+_mf_spec = importlib.util.spec_from_file_location("max_flow", _mf_path)
+_mf_mod = importlib.util.module_from_spec(_mf_spec)
+_mf_spec.loader.exec_module(_mf_mod)
+_is_valid_flow = _mf_mod._is_valid_flow
+_random_network = _mf_mod._random_network
+
+
+def _brute_force_cost(graph, capacities, costs, source, sink, C):
+    # Cancel negative cycles in the residual graph of any maximum flow with
+    # Bellman-Ford until none is left; slow but independent of both methods.
+    flow, value = dinic(graph, capacities, source, sink)
+    assert value == C
+    while True:
+        arcs = []
+        for (u, v), c in capacities.items():
+            if flow[(u, v)] < c:
+                arcs.append((u, v, costs[(u, v)], (u, v), 1))
+            if flow[(u, v)] > 0:
+                arcs.append((v, u, -costs[(u, v)], (u, v), -1))
+        vertices = set(graph) | {v for neighbors in graph.values() for v in neighbors}
+        dist = {v: 0 for v in vertices}
+        pred = {v: None for v in vertices}
+        last = None
+        for _ in range(len(vertices)):
+            last = None
+            for u, v, c, edge, sign in arcs:
+                if dist[u] + c < dist[v]:
+                    dist[v] = dist[u] + c
+                    pred[v] = (u, edge, sign, v)
+                    last = v
+        if last is None:
+            return sum(f * costs[e] for e, f in flow.items())
+        for _ in range(len(vertices)):
+            last = pred[last][0]
+        cycle, v = [], last
+        while True:
+            u, edge, sign, _ = pred[v]
+            cycle.append((edge, sign))
+            v = u
+            if v == last:
+                break
+        room = min(capacities[e] - flow[e] if sign > 0 else flow[e] for e, sign in cycle)
+        for e, sign in cycle:
+            flow[e] += sign * room
+
+
+def test_assignment_costs():
+    # Two workers, two jobs; the cheap pairing is w0-j1, w1-j0 (cost 1 + 2).
+    graph = {"s": ["w0", "w1"], "w0": ["j0", "j1"], "w1": ["j0", "j1"],
+             "j0": ["t"], "j1": ["t"], "t": []}
+    capacities = {(u, v): 1 for u in graph for v in graph[u]}
+    costs = {e: 0 for e in capacities}
+    costs.update({("w0", "j0"): 4, ("w0", "j1"): 1, ("w1", "j0"): 2, ("w1", "j1"): 6})
+    for method in ("ssp", "cost_scaling"):
+        flow, C, total_cost = min_cost_flow(graph, capacities, costs, "s", "t", method=method)
+        assert (C, total_cost) == (2, 3)
+        assert flow[("w0", "j1")] == 1 and flow[("w1", "j0")] == 1
+
+
+def test_matches_cycle_cancelling():
+    import random
+    rng = random.Random(4)
+    for seed in range(12):
+        graph, capacities = _random_network(9, 0.35, seed)
+        costs = {e: rng.randint(-3 if seed % 3 == 0 else 0, 9) for e in capacities}
+        if seed % 3 == 0:
+            # Every cycle uses an edge to a lower id, which costs more than
+            # any chain of negative edges can save: no negative cycle.
+            costs = {(u, v): c if u < v else c + 30 for (u, v), c in costs.items()}
+        _, C = dinic(graph, capacities, 0, 8)
+        expected = _brute_force_cost(graph, capacities, costs, 0, 8, C)
+        for method in ("ssp", "cost_scaling"):
+            flow, value, total_cost = min_cost_flow(graph, capacities, costs, 0, 8, method=method)
+            assert value == C and total_cost == expected, (seed, method, total_cost, expected)
+            assert _is_valid_flow(graph, capacities, flow, 0, 8, C)
+
+
+def test_csr_graph_and_errors():
+    graph, capacities = _random_network(8, 0.4, 2)
+    costs = {e: (e[0] * 7 + e[1]) % 5 for e in capacities}
+    csr = CSRGraph.from_adjacency(graph, capacities)
+    assert min_cost_flow(csr, None, costs, 0, 7) == min_cost_flow(graph, capacities, costs, 0, 7)
+    for method, bad_costs in (("cost_scaling", {e: 0.5 for e in capacities}), ("greedy", costs)):
+        try:
+            min_cost_flow(graph, capacities, bad_costs, 0, 7, method=method)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_assignment_costs()
+    test_matches_cycle_cancelling()
+    test_csr_graph_and_errors()
+    print("All tests passed.")
@@ -0,0 +1,170 @@
+"""
+Algorithm
+=====================
+Maximum matching in a bipartite graph with left side L and right side R:
+- Start with an empty matching
+- Repeat in phases until no augmenting path is left:
+    - BFS from every free left vertex at once, alternating between unmatched
+      edges (L to R) and matched edges (R back to L), to give each left vertex
+      its layer; stop at the first layer that reaches a free right vertex
+    - DFS from each free left vertex along edges into the next layer only,
+      finding a maximal set of shortest augmenting paths; flip each path as it
+      is found (its unmatched edges become matched and vice versa)
+    - A left vertex whose DFS dead-ends is dropped from the layers for the rest
+      of the phase, and each vertex keeps a pointer to its next untried edge
+
+Correctness
+=====================
+By Berge's theorem, a matching is maximum exactly when it has no augmenting
+path (a path between two free vertices whose edges alternate between unmatched
+and matched). Flipping an augmenting path grows the matching by one, and the
+algorithm only stops when the BFS finds no augmenting path at all.
+
+Runtime
+=====================
+O(E sqrt(V)): each phase is O(V + E) because every edge is tried at most once
+by the DFS pointers, and after sqrt(V) phases the shortest augmenting path is
+longer than sqrt(V), which leaves at most sqrt(V) more augmentations (hence
+phases). This compares with O(VE) phases of Edmonds-Karp on the equivalent
+unit-capacity flow network.
+"""
+from collections import deque
+import importlib.util, pathlib
+
+
+def hopcroft_karp(graph):
+    # Input:
+    # - graph: a bipartite graph as a dict {left vertex: [right vertex, ...]};
+    #   left and right vertices are kept apart, so their labels may overlap
+    #
+    # Output:
+    # - matching: dict {left vertex: right vertex} for every matched left
+    #   vertex, forming a maximum matching
+    left = list(graph)
+    right = []
+    right_index = {}
+    adj = []
+    for u in left:
+        neighbors = []
+        for v in graph[u]:
+            if v not in right_index:
+                right_index[v] = len(right)
+                right.append(v)
+            neighbors.append(right_index[v])
+        adj.append(neighbors)
+
+    match_left = _match(adj, len(right))
+    return {left[u]: right[v] for u, v in enumerate(match_left) if v != -1}
+
+
+def _match(adj, num_right):
+    """Return match_left for left ids 0..len(adj)-1 (-1 for unmatched)."""
+    num_left = len(adj)
+    match_left = [-1] * num_left
+    match_right = [-1] * num_right
+    while True:
+        # BFS layers from all free left vertices.
+        layer = [-1] * num_left
+        queue = deque()
+        for u in range(num_left):
+            if match_left[u] == -1:
+                layer[u] = 0
+                queue.append(u)
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adj[u]:
+                w = match_right[v]
+                if w == -1:
+                    found = True
+                elif layer[w] == -1:
+                    layer[w] = layer[u] + 1
+                    if not found:
+                        queue.append(w)
+        if not found:
+            return match_left
+
+        # Iterative DFS; stack holds the left vertices of the current path, and
+        # the right vertex each one chose is adj[x][pointer[x] - 1].
+        pointer = [0] * num_left
+        for root in range(num_left):
+            if match_left[root] != -1:
+                continue
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if pointer[u] == len(adj[u]):
+                    layer[u] = -1
+                    stack.pop()
+                    continue
+                v = adj[u][pointer[u]]
+                pointer[u] += 1
+                w = match_right[v]
+                if w == -1:
+                    for x in stack:
+                        y = adj[x][pointer[x] - 1]
+                        match_left[x] = y
+                        match_right[y] = x
+                    break
+                if layer[w] == layer[u] + 1:
+                    stack.append(w)
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_ek_path = pathlib.Path(__file__).parent / "11_edmonds_karp.py"
+_ek_spec = importlib.util.spec_from_file_location("edmonds_karp", _ek_path)
+_ek_mod = importlib.util.module_from_spec(_ek_spec)
+_ek_spec.loader.exec_module(_ek_mod)
+edmonds_karp = _ek_mod.edmonds_karp
+
+
+def _random_bipartite(left, right, p, seed):
+    import random
+    rng = random.Random(seed)
+    return {f"w{u}": [f"j{v}" for v in range(right) if rng.random() < p] for u in range(left)}
+
+
+def _is_matching(graph, matching):
+    return all(v in graph[u] for u, v in matching.items()) \
+        and len(set(matching.values())) == len(matching)
+
+
+def test_matches_edmonds_karp():
+    for seed in range(10):
+        graph = _random_bipartite(15, 12, 0.15, seed)
+        network = {"s": list(graph), "t": []}
+        for u, jobs in graph.items():
+            network[u] = list(jobs)
+            for v in jobs:
+                network.setdefault(v, ["t"])
+        capacities = {(u, v): 1 for u in network for v in network[u]}
+        _, C = edmonds_karp(network, capacities, "s", "t")
+        matching = hopcroft_karp(graph)
+        assert len(matching) == C and _is_matching(graph, matching)
+
+
+def test_needs_augmenting_path():
+    # Greedy a-x leaves b unmatched; the augmenting path b-x-a-y fixes it.
+    graph = {"a": ["x", "y"], "b": ["x"]}
+    assert hopcroft_karp(graph) == {"a": "y", "b": "x"}
+    assert hopcroft_karp({}) == {} and hopcroft_karp({"a": []}) == {}
+
+
+def test_long_augmenting_path():
+    # Left i connects to right i and i + 1; matching every left i to right i + 1
+    # first forces one augmenting path through the whole chain.
+    n = 100000
+    graph = {i: [i + 1, i] for i in range(n)}
+    graph[n] = [n]
+    matching = hopcroft_karp(graph)
+    assert len(matching) == n + 1 and _is_matching(graph, matching)
+
+
+if __name__ == "__main__":
+    test_matches_edmonds_karp()
+    test_needs_augmenting_path()
+    test_long_augmenting_path()
+    print("All tests passed.")
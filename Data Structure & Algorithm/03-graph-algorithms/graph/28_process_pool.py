@@ -0,0 +1,166 @@
+"""
+Representation
+=====================
+A process pool for the modules that fan independent work out to workers
+(johnson(), gomory_hu_tree(), run_dag()):
+- Workers are forked, so each one starts with a copy of the parent's memory:
+  the graph passed to the initializer is shared without pickling it
+- Tasks are submitted by reference (module name + function name). The children
+  look the function up in sys.modules, so before the pool starts, every task
+  and initializer function is made reachable there. A module loaded through
+  importlib.util.spec_from_file_location() is not in sys.modules; it gets a
+  stand-in module that holds just those function objects
+- fork_pool() returns such a pool for callers that schedule tasks themselves;
+  fork_map() runs one function over a stream of arguments on it
+- In fork_map(), at most 2 * workers tasks are in flight. The next argument tuple is taken
+  from the caller's iterable only after a result has been yielded, so it can
+  depend on the results the caller has already seen
+
+
+Correctness
+=====================
+The stand-in holds the very same function objects, so pickling finds the
+object it expects, and in a child every function still runs against the
+globals of the module that defined it (the ones its initializer wrote). The
+module is never executed a second time. Results are yielded in submission
+order, which is the order of the argument iterable.
+
+
+Runtime
+=====================
+Forking costs one page-table copy per worker. Each task pickles only its
+arguments and its result, and the bounded window keeps O(workers) results in
+memory no matter how many tasks there are.
+"""
+from collections import deque
+import concurrent.futures
+import multiprocessing
+import sys
+import types
+
+
+def fork_available():
+    """Return True if worker processes can be forked on this platform."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def fork_map(function, args, workers=None, initializer=None, initargs=()):
+    # Input:
+    # - function: a module-level function, called as function(*a) in a worker
+    # - args: an iterable of argument tuples, consumed lazily (see above)
+    # - workers: number of worker processes; None uses one per CPU
+    # - initializer: optional module-level function run once in each worker
+    #   as initializer(*initargs)
+    #
+    # Output:
+    # - an iterator of function(*a) for every a in args, in order
+    workers = workers or multiprocessing.cpu_count()
+    with fork_pool([function], workers, initializer, initargs) as pool:
+        pending = deque()
+        remaining = iter(args)
+        for a in remaining:
+            pending.append(pool.submit(function, *a))
+            if len(pending) == 2 * workers:
+                break
+        while pending:
+            yield pending.popleft().result()
+            a = next(remaining, None)
+            if a is not None:
+                pending.append(pool.submit(function, *a))
+
+
+def fork_pool(functions, workers=None, initializer=None, initargs=()):
+    # Input:
+    # - functions: the module-level functions that will be submitted
+    # - workers, initializer, initargs: as for fork_map()
+    #
+    # Output:
+    # - a concurrent.futures.ProcessPoolExecutor with forked workers (the
+    #   platform's default start method where fork is unavailable); the
+    #   caller shuts it down
+    for function in functions:
+        _register(function)
+    if initializer is not None:
+        _register(initializer)
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers or multiprocessing.cpu_count(),
+        mp_context=multiprocessing.get_context("fork") if fork_available() else None,
+        initializer=initializer,
+        initargs=initargs)
+
+
+def _register(function):
+    """Make function reachable as sys.modules[function.__module__].<name>."""
+    module = sys.modules.get(function.__module__)
+    if module is None:
+        module = types.ModuleType(function.__module__)
+        module.__fork_map_stand_in__ = True
+        sys.modules[function.__module__] = module
+    if getattr(module, function.__qualname__, None) is not function:
+        if not getattr(module, "__fork_map_stand_in__", False):
+            raise ValueError(f"{function.__module__}.{function.__qualname__} is a "
+                             "different object; load the module under another name")
+        setattr(module, function.__qualname__, function)
+
+
+# ---------------------------------------------------------------------------
+# Test cases
+# ---------------------------------------------------------------------------
+
+_worker_offset = 0
+
+
+def _init_worker(offset):
+    global _worker_offset
+    _worker_offset = offset
+
+
+def _worker_add(x, y):
+    return x + y + _worker_offset
+
+
+def test_results_in_order():
+    if not fork_available():
+        return
+    results = fork_map(_worker_add, ((x, x) for x in range(20)), 2, _init_worker, (100,))
+    assert list(results) == [100 + 2 * x for x in range(20)]
+    assert list(fork_map(_worker_add, [], 2)) == []
+
+
+def test_args_see_earlier_results():
+    # Each argument is read after the results before the window have been
+    # consumed, so it may depend on them.
+    if not fork_available():
+        return
+    seen = []
+
+    def args():
+        for x in range(10):
+            yield x, len(seen)
+
+    for result in fork_map(_worker_add, args(), 1):
+        seen.append(result)
+    assert seen == [x + max(0, x - 1) for x in range(10)]
+
+
+def test_module_loaded_through_importlib():
+    # Loaded the way sibling modules load each other: not in sys.modules and
+    # not executed again by fork_map().
+    if not fork_available():
+        return
+    import importlib.util, pathlib
+    spec = importlib.util.spec_from_file_location("process_pool_copy", pathlib.Path(__file__))
+    copy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(copy)
+    results = copy.fork_map(copy._worker_add, [(1, 2), (3, 4)], 2, copy._init_worker, (10,))
+    assert list(results) == [13, 17]
+    stand_in = sys.modules["process_pool_copy"]
+    assert stand_in is not copy and stand_in._worker_add is copy._worker_add
+    assert copy._worker_offset == 0
+
+
+if __name__ == "__main__":
+    test_results_in_order()
+    test_args_see_earlier_results()
+    test_module_loaded_through_importlib()
+    print("All tests passed.")